@@ -36,6 +36,7 @@ from .source.BirthEngine import BirthEngine
 from .source.BracketModel import BracketModel
 from .source.CauchyErrorDistribution import CauchyErrorDistribution
 from .source.CauchyPrior import CauchyPrior
+from .source.Checkpoint import Checkpoint
 from .source.CircularUniformPrior import CircularUniformPrior
 from .source.ChebyshevPolynomialModel import ChebyshevPolynomialModel
 from .source.ChordEngine import ChordEngine
@@ -110,6 +111,7 @@ from .source.PolynomialModel import PolynomialModel
 from .source.PowerLawModel import PowerLawModel
 from .source.PowerModel import PowerModel
 from .source.Prior import Prior
+from .source.PriorVector import PriorVector
 from .source.Problem import Problem
 from .source.ProductModel import ProductModel
 from .source.PseudoVoigtModel import PseudoVoigtModel
@@ -121,6 +123,7 @@ from .source.RobustShell import RobustShell
 from .source.Sample import Sample
 from .source.SampleList import SampleList
 from .source.SampleMovie import SampleMovie
+from .source.SampleSink import SampleSink
 from .source.ScaledErrorDistribution import ScaledErrorDistribution
 ## import all fitters inside ScipyFitter
 from .source.ScipyFitter import *
@@ -241,6 +241,57 @@ class BSplinesModel( LinearModel ):
 
         return partial
 
+    def baseBandedPartial( self, xdata, params ):
+        """
+        Returns the partials as a band of ( order + 1 ) nonzero values per xdata.
+
+        Parameters
+        ----------
+        xdata : array_like
+            value at which to calculate the partials
+        params : array_like
+            parameters to the model (ignored in LinearModels)
+
+        Returns
+        -------
+        band : 2-d array
+            nonzero partials, shape ( ndata, order + 1 )
+        first : int array
+            index of the parameter in band[:,0]
+
+        Raises
+        ------
+        ValueError when xdata < knots[0] or xdata > knots[1]
+        """
+        if numpy.any( xdata < self.knots[0] ) or numpy.any( xdata > self.knots[-1] ) :
+            print( "Min max data : ", numpy.min( xdata ), numpy.max( xdata ),
+                   "  knots : ", self.knots[0], self.knots[-1] )
+            raise ValueError( "Input data need to fall strictly in the domain spanned by knots" )
+
+        return self._bspline.band( xdata )
+
+    def baseResult( self, xdata, params ):
+        """
+        Returns the result of the model function.
+
+        Only the ( order + 1 ) nonzero partials at each xdata are used.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like
+            values for the parameters.
+
+        Raises
+        ------
+        ValueError when xdata < knots[0] or xdata > knots[1]
+        """
+        band, first = self.baseBandedPartial( xdata, params )
+        params = numpy.asarray( params, dtype=float )
+        return numpy.sum( band * params[first[:,numpy.newaxis] + numpy.arange( band.shape[1] )],
+                          axis=1 )
+
     def baseDerivative( self, xdata, params ) :
         """
         Return the derivative df/dx at each xdata (=x).
@@ -255,9 +306,10 @@ class BSplinesModel( LinearModel ):
         """
         xd = numpy.where( xdata == self.knots[-1], ( 1.0 - self.eps ) * self.knots[-1], xdata )
 
-        partial = Tools.toArray( self._bspline.collmat( xd, deriv_order=1 ), ndim=2 )
-
-        return numpy.inner( params, partial )
+        band, first = self._bspline.band( xd, deriv_order=1 )
+        params = numpy.asarray( params, dtype=float )
+        return numpy.sum( band * params[first[:,numpy.newaxis] + numpy.arange( band.shape[1] )],
+                          axis=1 )
 
     def baseName( self ):
         """ Returns a string representation of the model. """
@@ -1,6 +1,7 @@
 import numpy as numpy
 import math
 from astropy.table import Table
+from scipy.linalg import cholesky_banded, cho_solve_banded, cho_factor, cho_solve
 
 from .ImageAssistant import ImageAssistant
 from .MonteCarlo import MonteCarlo
@@ -50,6 +51,10 @@ class BaseFitter( object ):
     covariance matrix ). All these calculations are in this Fitter class.
     Other Fitter classes relegate their calculation in these issues to this one.
 
+    When the model provides its partials as a band (splines models, see
+    Model.bandedPartial()), the design matrix is never made in full. The hessian
+    is then also kept in banded form and banded solvers are used.
+
     Examples
     --------
     It is not possible to use this class. Use Fitter, CurveFitter etc. in stead
@@ -91,6 +96,12 @@ class BaseFitter( object ):
     design : matrix (read only)
         the design matrix (partial of model to parameters)
         returns self.getDesign()
+    cacheFactors : bool
+        keep the design, the hessian and its Cholesky decomposition for repeated
+        fits. Only for linear fitters; it is True in Fitter and QRFitter.
+    factors : None or dict (read only)
+        the cached design, hessian and Cholesky decomposition. See getFactors().
+        Set to None when the model has been changed in place.
 
     Attributes (available after a call to fit())
     ----------
@@ -107,6 +118,8 @@ class BaseFitter( object ):
         returns self.getStandardDeviations()
     hessian : matrix (read only)
         the hessian matrix
+    bandedHessian : None or 2-d array (read only)
+        the hessian matrix in upper banded form, when the design is banded.
     covariance : matrix (read only)
         the covariance matrix
         returns self.getCovarianceMatrix()
@@ -192,6 +205,8 @@ class BaseFitter( object ):
         self.keep = keep
         self.fitIndex = self.keepFixed( keep )
         self.fixedScale = fixedScale
+        self.cacheFactors = False
+        self.factors = None
 
         if self.ndim != model.ndim:
             raise ValueError( "Model (%d) and xdata (%d) must be of the same dimensionality."
@@ -507,6 +522,8 @@ class BaseFitter( object ):
             return None
         elif name == 'fitWgts' :            ## not present return None
             return None
+        elif name == 'bandedHessian' :      ## not present return None
+            return None
         elif name == 'sumwgt' :             ## not present return nxdata
             return self.nxdata
         elif name == 'yfit' :
@@ -552,10 +569,38 @@ class BaseFitter( object ):
         """
         if self.model.isNullModel() :
             return numpy.asarray( 0 )
-        design = self.getDesign( index=index )
+
+        factors = self.getFactors( index=index )
+        if factors is not None :
+            banded, design = factors["banded"], factors["design"]
+        else :
+            banded = self.getBandedDesign( index=index )
+            design = None if banded is not None else self.getDesign( index=index )
+
+        if banded is not None :
+            return self.bandedVector( banded, ydata )
 
         return numpy.inner( design.transpose(), ydata )
 
+    def bandedVector( self, banded, ydata ):
+        """
+        Return the &beta;-vector from a banded design.
+
+        Parameters
+        ----------
+        banded : tuple of ( 2-d array, int array )
+            the band and the indices of its first parameters, see Model.bandedPartial()
+        ydata : array_like
+            the (weighted) data vector to be fitted.
+
+        """
+        band, first = banded
+        np = self.model.npchain
+        vector = numpy.zeros( np, dtype=float )
+        for k in range( band.shape[1] ) :
+            vector += numpy.bincount( first + k, weights=band[:,k] * ydata, minlength=np )
+        return vector
+
     #  *****HESSIAN**************************************************************
     def getHessian( self, params=None, weights=None, index=None ):
         """
@@ -581,7 +626,36 @@ class BaseFitter( object ):
         if self.model.isNullModel() :
             return
 
-        design = self.getDesign( xdata=self.xdata, params=params, index=index )
+        factors = self.getFactors( weights=weights, index=index )
+        if factors is not None :
+            self.bandedHessian = factors["bandedHessian"]
+            self.hessian = factors["hessian"]
+            return self.hessian
+
+        banded = self.getBandedDesign( params=params, index=index )
+        design = None if banded is not None else self.getDesign( params=params, index=index )
+        return self.designToHessian( banded, design, weights )
+
+    def designToHessian( self, banded, design, weights=None ):
+        """
+        Return the hessian matrix from the (banded) design.
+
+        Parameters
+        ----------
+        banded : None or tuple of ( 2-d array, int array )
+            the design as a band, see Model.bandedPartial()
+        design : matrix
+            the design matrix; only used when banded is None
+        weights : None or float or array_like
+            weights to be used
+
+        """
+        if banded is not None :
+            self.bandedHessian = self.makeBandedHessian( banded, weights )
+            self.hessian = self.bandToMatrix( self.bandedHessian )
+            return self.hessian
+
+        self.bandedHessian = None
 
         if hasattr( self, "normweight" ) :
             if weights is None :
@@ -599,6 +673,194 @@ class BaseFitter( object ):
 
         return self.hessian
 
+    def makeBandedHessian( self, banded, weights=None ):
+        """
+        Return the hessian matrix in upper banded form, from a banded design.
+
+        The banded form is the one used by scipy.linalg.solveh_banded():
+            bh[nb-1+i-j,j] = H[i,j]     for max( 0, j-nb+1 ) <= i <= j
+        where nb is the width of the band.
+
+        Parameters
+        ----------
+        banded : tuple of ( 2-d array, int array )
+            the band and the indices of its first parameters, see Model.bandedPartial()
+        weights : None or float or array_like
+            weights to be used
+
+        """
+        band, first = banded
+        nb = band.shape[1]
+        np = self.model.npchain
+        if weights is not None :
+            weights = numpy.broadcast_to( weights, first.shape )[:,numpy.newaxis]
+
+        bh = numpy.zeros( ( nb, np ), dtype=float )
+        for d in range( nb ) :
+            prod = band[:,:nb-d] * band[:,d:]
+            if weights is not None :
+                prod *= weights
+            index = first[:,numpy.newaxis] + numpy.arange( d, nb )
+            bh[nb-1-d] = numpy.bincount( index.ravel(), weights=prod.ravel(), minlength=np )[:np]
+
+        return bh
+
+    def bandToMatrix( self, bh ):
+        """
+        Return the full symmetric matrix from its upper banded form.
+
+        Parameters
+        ----------
+        bh : 2-d array
+            matrix in upper banded form, see makeBandedHessian()
+        """
+        nb, np = bh.shape
+        hessian = numpy.zeros( ( np, np ), dtype=float )
+        for d in range( min( nb, np ) ) :
+            k = numpy.arange( np - d )
+            hessian[k,k+d] = bh[nb-1-d,d:]
+            hessian[k+d,k] = bh[nb-1-d,d:]
+        return hessian
+
+    def getFactors( self, weights=None, index=None ):
+        """
+        Return the design, the hessian and its Cholesky decomposition, for
+        repeated fits of a linear model.
+
+        They are kept in the dict `factors` and reused as long as the xdata,
+        the model, the weights, the index and the normalizations are the same.
+        Changes of the model in place (e.g. new knots) are not noticed;
+        set `factors` to None then.
+
+        The cached hessian and its decomposition are read-only.
+
+        Returns None when cacheFactors is False or when the model is not linear
+        in all its parameters.
+
+        Parameters
+        ----------
+        weights : None or float or array_like
+            weights to be used
+        index : list of int
+            index of parameters to be fixed
+
+        """
+        if not self.cacheFactors or self.model.isNullModel() :
+            return None
+        if weights is None : weights = self.fitWgts
+
+        npchain = self.model.npchain
+        if index is not None and len( index ) == npchain :
+            index = None
+        nnorm = len( self.normdata ) if hasattr( self, "normdata" ) else 0
+
+        fc = self.factors
+        if ( fc is not None and fc["xdata"] is self.xdata and fc["model"] is self.model and
+             fc["npchain"] == npchain and fc["nnorm"] == nnorm and
+             numpy.array_equal( fc["index"], -1 if index is None else index ) and
+             numpy.array_equal( fc["weights"], -1 if weights is None else weights ) ) :
+            return fc
+
+        lindex = self.model.getLinearIndex()
+        if lindex is None or len( lindex ) < npchain :
+            return None
+
+        banded = self.getBandedDesign( index=index )
+        design = None if banded is not None else self.getDesign( index=index )
+        hessian = self.designToHessian( banded, design, weights )
+        try :
+            if self.bandedHessian is not None :
+                cholesky = cholesky_banded( self.bandedHessian )
+            else :
+                cholesky = cho_factor( hessian )[0]
+        except numpy.linalg.LinAlgError :
+            cholesky = None
+
+        # result of the model at zero parameters; nonzero for fixed parameters.
+        offset = None
+        if index is None and nnorm == 0 :
+            offset = self.model.result( self.xdata, numpy.zeros( npchain, dtype=float ) )
+
+        fc = {"xdata" : self.xdata, "model" : self.model, "npchain" : npchain,
+              "nnorm" : nnorm, "index" : -1 if index is None else numpy.array( index ),
+              "weights" : -1 if weights is None else numpy.array( weights ),
+              "banded" : banded, "design" : design, "offset" : offset, "hessian" : hessian,
+              "bandedHessian" : self.bandedHessian, "cholesky" : cholesky}
+        for a in [hessian, self.bandedHessian, cholesky] :
+            if a is not None :
+                a.flags.writeable = False
+
+        self.factors = fc
+        return fc
+
+    def modelResult( self, params=None ):
+        """
+        Return the result of the model at the xdata.
+
+        When the factors of the full model are cached, it is obtained from the design.
+        See getFactors().
+
+        Parameters
+        ----------
+        params : array_like
+            parameters of the model
+        """
+        if params is None : params = self.model.parameters
+
+        fc = self.factors
+        if ( fc is None or fc["offset"] is None or fc["xdata"] is not self.xdata or
+             fc["model"] is not self.model or fc["npchain"] != self.model.npchain ) :
+            return self.model.result( self.xdata, params )
+
+        params = numpy.asarray( params, dtype=float )
+        if fc["banded"] is not None :
+            band, first = fc["banded"]
+            return fc["offset"] + numpy.sum( band *
+                        params[first[:,numpy.newaxis] + numpy.arange( band.shape[1] )], axis=1 )
+        return fc["offset"] + numpy.inner( fc["design"], params )
+
+    def getCholesky( self, hessian ):
+        """
+        Return the cached Cholesky decomposition of the hessian or None when not present.
+
+        Parameters
+        ----------
+        hessian : matrix
+            the hessian matrix
+        """
+        fc = self.factors
+        if fc is not None and hessian is fc["hessian"] :
+            return fc["cholesky"]
+        return None
+
+    def solveHessian( self, hessian, vector ):
+        """
+        Return the solution, p, of the equation H * p = vector.
+
+        When a banded hessian is present, a banded Cholesky decomposition is used.
+        A cached Cholesky decomposition of the hessian is reused, see getFactors().
+
+        Parameters
+        ----------
+        hessian : matrix
+            the hessian matrix
+        vector : array_like
+            the &beta;-vector
+        """
+        cholesky = self.getCholesky( hessian )
+        if cholesky is not None :
+            if self.factors["bandedHessian"] is not None :
+                return cho_solve_banded( ( cholesky, False ), vector )
+            return cho_solve( ( cholesky, False ), vector )
+
+        if self.bandedHessian is not None :
+            try :
+                return cho_solve_banded( ( cholesky_banded( self.bandedHessian ), False ),
+                                         vector )
+            except numpy.linalg.LinAlgError :
+                pass
+        return numpy.linalg.solve( hessian, vector )
+
 #      * TBD Condition number see Wikipedia: Condition Number and Matrix Norm
 
     #  *************************************************************************
@@ -617,6 +879,8 @@ class BaseFitter( object ):
 
         """
         hes = self.getHessian( params, weights, index )
+        if self.bandedHessian is not None or self.getCholesky( hes ) is not None :
+            return self.solveHessian( hes, numpy.identity( len( hes ) ) )
         inh = numpy.linalg.inv( hes )
         return inh
 
@@ -687,6 +951,28 @@ class BaseFitter( object ):
 
 
     #  *****DESIGN**************************************************************
+    def getBandedDesign( self, params=None, index=None ):
+        """
+        Return the design matrix as a band, if the model provides one. Otherwise None.
+
+        The band is not used for maps, with normalized data, or when
+        parameters are kept fixed. See Model.bandedPartial().
+
+        Parameters
+        ----------
+        params : array_like
+            parameters of the model
+        index : list of int
+            index of parameters to be fixed
+
+        """
+        if ( self.imageAssistant is not None or hasattr( self, "normdfdp" ) or
+             ( index is not None and Tools.length( index ) < self.model.npchain ) ) :
+            return None
+
+        if params is None : params = self.model.parameters
+        return self.model.bandedPartial( self.xdata, params )
+
     def getDesign( self, params=None, xdata=None, index=None ):
         """
         Return the design matrix, D.
@@ -735,7 +1021,7 @@ class BaseFitter( object ):
         ValueError when chisq <= 0.
 
         """
-        res2 = numpy.square( ydata - self.model.result( self.xdata, params ) )
+        res2 = numpy.square( ydata - self.modelResult( params ) )
         if weights is not None:         ## for weight and accuracy
             res2 *= weights
 
@@ -953,7 +1239,7 @@ class BaseFitter( object ):
         if priorlength < self.npfit :                          # add enough times the last one
             spr += ( self.npfit - priorlength ) * prirange[-1]
 
-        lidet = math.log( numpy.linalg.det( self.hessian ) )
+        lidet = self.logDetHessian()
 
         # implementing eq 18 (Kester 2002) term by term
         self.logOccam += -spr + 0.5 * ( self.npfit *
@@ -961,6 +1247,27 @@ class BaseFitter( object ):
 
         return self.logLikelihood + self.logOccam
 
+    def logDetHessian( self ):
+        """
+        Return the log of the determinant of the hessian matrix.
+
+        For a banded hessian or a cached one, it is obtained from the diagonal
+        of its Cholesky decomposition.
+        """
+        hessian = self.hessian
+        cholesky = self.getCholesky( hessian )
+        if cholesky is not None :
+            diag = cholesky[-1] if self.factors["bandedHessian"] is not None else cholesky.diagonal()
+            return 2 * numpy.sum( numpy.log( diag ) )
+
+        if self.bandedHessian is not None :
+            try :
+                chol = cholesky_banded( self.bandedHessian )
+                return 2 * numpy.sum( numpy.log( chol[-1] ) )
+            except numpy.linalg.LinAlgError :
+                pass
+        return math.log( numpy.linalg.det( hessian ) )
+
     def __str__( self ):
         """ Return name of the fitter.  """
         return "BaseFitter"
@@ -141,6 +141,7 @@ class BaseModel( object ):
         """
         if name == "priors" :
             setatt( self, name, value, type=Prior, isnone=True, islist=True )
+            Prior.version += 1
             return
         if name == "parNames" :
             setatt( self, name, value, type=str, islist=True )
@@ -197,6 +198,39 @@ class BaseModel( object ):
         self.checkParameter( param )
         return self.baseResult( xdata, param )
 
+    def resultBatch( self, xdata, params2d ):
+        """
+        Returns the results calculated at the xdatas for a batch of parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params2d : 2d array_like
+            values for the parameters, one set per row.
+
+        """
+        for param in params2d :
+            self.checkParameter( param )
+        return self.baseResultBatch( xdata, params2d )
+
+    def baseResultBatch( self, xdata, params2d ):
+        """
+        Returns the results of the model function for a batch of parameter sets.
+
+        This default loops over the parameter sets. Models that can do better,
+        override this method with a vectorized version.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params2d : 2d array_like
+            values for the parameters, one set per row.
+
+        """
+        return numpy.asarray( [self.baseResult( xdata, param ) for param in params2d] )
+
     #  *****PARTIAL*************************************************************
     def partial( self, xdata, param, parlist=None ):
         """
@@ -215,6 +249,23 @@ class BaseModel( object ):
         self.checkParameter( param )
         return self.basePartial( xdata, param, parlist=parlist )
 
+    def baseBandedPartial( self, xdata, param ):
+        """
+        Returns the partials as a band of nonzero values, or None.
+
+        Models whose partials are nonzero only for a small, contiguous set of
+        parameters at each xdata, can override this method. See Model.bandedPartial().
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the partials
+        param : array_like
+            values for the parameters.
+
+        """
+        return None
+
     def checkParameter( self, param ) :
         """
         Return parameters corrected for positivity and Non-zero.
@@ -340,6 +391,7 @@ class BaseModel( object ):
             return
 
         self.priors[kpar] = prior
+        Prior.version += 1
 
         return
 
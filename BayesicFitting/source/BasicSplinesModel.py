@@ -499,13 +499,7 @@ class BasicSplinesModel( SplinesModel ):
         x2k = self.makeKnotIndices( xdata )
 
         pa = numpy.inner( self.basis, params )
-        res = numpy.zeros_like( xdata )
-        for k, kn in enumerate( self.knots[:-1] ) :
-            q = numpy.where( x2k == k )
-            xc = xdata[q] - kn
-            res[q] = self.poly.result( xc, pa[k,:] )
-
-        return res
+        return self.basicBlob( xdata, pa, x2k, self.poly )
 
 
     def basePartial( self, xdata, params, parlist=None ):
@@ -539,6 +533,101 @@ class BasicSplinesModel( SplinesModel ):
 
         return partial
 
+    def baseBandedPartial( self, xdata, params ):
+        """
+        Returns the partials as a band of ( order + 1 ) nonzero values per xdata.
+
+        The polynomial piece between knots k and k+1 belongs to the spline blobs
+        (parameters) k upto k + order. Periodic models (border=1) have no band;
+        see segmentBand.
+
+        Parameters
+        ----------
+        xdata : array_like
+            value at which to calculate the partials
+        params : array_like
+            parameters to the model (ignored in LinearModels)
+
+        Returns
+        -------
+        band : 2-d array
+            nonzero partials, shape ( ndata, order + 1 )
+        first : int array
+            index of the parameter in band[:,0]
+
+        """
+        if self.border == 1 :
+            return None
+
+        band, index = self.segmentBand( xdata )
+        return ( band, index[:,0] )
+
+    def segmentBand( self, xdata ) :
+        """
+        Returns the ( order + 1 ) nonzero partials at each xdata and the indices
+        of the parameters they belong to.
+
+        Contrary to baseBandedPartial, it also works for periodic models (border=1),
+        where the indices wrap around.
+
+        Parameters
+        ----------
+        xdata : array_like
+            value at which to calculate the partials
+
+        Returns
+        -------
+        band : 2-d array
+            nonzero partials, shape ( ndata, order + 1 )
+        index : 2-d int array
+            indices of the parameters in band, shape ( ndata, order + 1 )
+
+        """
+        nb = self.order + 1
+        xdata = self._fold( xdata )
+        x2k = self.makeKnotIndices( xdata )
+        xc = ( xdata - self.knots[x2k] )[:,numpy.newaxis]
+
+        bpar, pix = self.segmentBasis()
+
+        ## same summation as in basicBlob
+        xp = numpy.ones_like( xc )
+        band = numpy.zeros( ( len( xdata ), nb ), dtype=float )
+        for k in range( nb ) :
+            band += bpar[x2k,:,k] * xp
+            xp *= xc
+
+        return ( band, pix[x2k] )
+
+    def segmentBasis( self ) :
+        """
+        Returns the polynomial parameters of the ( order + 1 ) nonzero spline blobs
+        between each pair of knots, and the indices of the parameters they belong to.
+
+        Between knots k and k+1, the blob of parameter pix[k,i] is
+
+            sum_m bpar[k,i,m] * ( x - knots[k] )^m
+
+        Returns
+        -------
+        bpar : 3-d array
+            polynomial parameters, shape ( nrknots - 1, order + 1, order + 1 )
+        pix : 2-d int array
+            indices of the parameters, shape ( nrknots - 1, order + 1 )
+
+        """
+        nb = self.order + 1
+
+        ## the blobs of periodic splines start one knot further down
+        ks = numpy.arange( len( self.knots ) - 1 )[:,numpy.newaxis]
+        kb = 1 if ( self.border == 1 and self.order > 0 ) else 0
+        pix = ( ks + kb + numpy.arange( nb ) ) % self.npmax
+
+        ## poly parameters of the blobs at each knot: bpar[k,i,:] = basis[k,:,pix[k,i]]
+        bpar = self.basis[ks[:,:,numpy.newaxis], numpy.arange( nb ), pix[:,:,numpy.newaxis]]
+
+        return ( bpar, pix )
+
     def makeKnotIndices( self, xdata ) :
         """
         Return a list of indices of the knots immediately preceeding the xdata.
@@ -548,17 +637,17 @@ class BasicSplinesModel( SplinesModel ):
         xdata : array_like
             values at which to calculate the indices
         """
-        ix = numpy.zeros( len( xdata ), dtype=int )
-        for kn in self.knots[1:-1] :
-            ix = numpy.where( xdata >= kn, ix + 1, ix )
-
-        return ix
+        return numpy.searchsorted( self.knots[1:-1], xdata, side="right" )
 
 
     def basicBlob( self, xdata, basis, x2k, poly ) :
         """
         Calculates a spline blob for all of xdata
 
+        The polynomial parameters are gathered for each xdata from the knot
+        preceeding it. The polynomials are evaluated in one pass over xdata,
+        summing the powers in the same order as the PolynomialModel does.
+
         Parameters
         ----------
         xdata : array_like
@@ -570,14 +659,12 @@ class BasicSplinesModel( SplinesModel ):
         poly : PolynomialModel
             model to calculate the splines
         """
-        blob = numpy.zeros_like( xdata )
-
-        kn = self.knots[:-1]
-        for k, kn in enumerate( self.knots[:-1] ) :
-            if all( basis[k,:] == 0 ) : continue
-            q = numpy.where( x2k == k )
-            xc = xdata[q] - kn
-            blob[q] = poly.result( xc, basis[k,:] )
+        xc = xdata - self.knots[x2k]
+        xp = numpy.ones_like( xc )
+        blob = numpy.zeros_like( xc )
+        for k in range( poly.npmax ) :
+            blob += basis[x2k,k] * xp
+            xp *= xc
 
         return blob
 
@@ -602,12 +689,8 @@ class BasicSplinesModel( SplinesModel ):
         x2k = self.makeKnotIndices( xdata )
 
         fp = numpy.arange( self.order + 1 )
-        for n in range( self.npmax ) :
-            dbs = self.basis[:,:,n] * fp
-            dbs = dbs[:,1:]
-            dfdx += self.basicBlob( xdata, dbs, x2k, polym1 ) * params[n]
-
-        return dfdx
+        dpa = numpy.inner( self.basis, params ) * fp
+        return self.basicBlob( xdata, dpa[:,1:], x2k, polym1 )
 
     def baseName( self ):
         """ Returns a string representation of the model. """
@@ -0,0 +1,352 @@
+import numpy as numpy
+import os
+import pickle
+import time
+
+from .Walker import Walker
+from .WalkerList import WalkerList
+from .Sample import Sample
+
+__author__ = "Do Kester"
+__year__ = 2026
+__license__ = "GPL3"
+__version__ = "3.3.0"
+__url__ = "https://www.bayesicfitting.nl"
+__status__ = "Perpetual Beta"
+
+#  * This file is part of the BayesicFitting package.
+#  *
+#  * BayesicFitting is free software: you can redistribute it and/or modify
+#  * it under the terms of the GNU Lesser General Public License as
+#  * published by the Free Software Foundation, either version 3 of
+#  * the License, or ( at your option ) any later version.
+#  *
+#  * BayesicFitting is distributed in the hope that it will be useful,
+#  * but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  * GNU Lesser General Public License for more details.
+#  *
+#  * The GPL3 license can be found at <http://www.gnu.org/licenses/>.
+#  *
+#  *    2026 Do Kester
+
+
+class Checkpoint( object ):
+    """
+    Checkpoint saves the state of a NestedSampler run into a file, from which
+    the run can be resumed.
+
+    The file is a numpy .npz file. It contains the walkers, the phantoms, the
+    samples, the random states of the sampler and of the engines, the state of
+    the engines and the running values of the evidence calculation.
+
+    The checkpoint is written at the end of an iteration, every so many
+    iterations or every so many seconds, whichever comes first. The file is
+    first written to a temporary file, which then replaces the checkpoint file.
+
+    A resumed run continues exactly as the original run would have done,
+    provided the NestedSampler is set up in the same way (same problem,
+    distribution, engines and seed). Runs with threads or processes are
+    not reproducible anyway; they are resumed from the same state.
+
+    For dynamic and modifiable models the models of the walkers and samples
+    are stored as pickles. Only resume from checkpoints you trust.
+
+    Examples
+    --------
+    >>> ns = NestedSampler( xdata, model, ydata, seed=1234 )
+    >>> evid = ns.sample( checkpoint="run.npz" )
+    ## after an interruption, set up the same NestedSampler and
+    >>> evid = ns.sample( checkpoint="run.npz", resume="run.npz" )
+
+    Attributes
+    ----------
+    path : str
+        name of the checkpoint file
+    iterations : None or int
+        save every so many iterations
+    seconds : None or float
+        save every so many seconds
+    lastSave : float
+        time of the last save
+
+    Author       Do Kester.
+
+    """
+    VERSION = 1
+
+    def __init__( self, path, iterations=1000, seconds=None ):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        path : str
+            name of the checkpoint file
+        iterations : None or int
+            save every so many iterations. None : never.
+        seconds : None or float
+            save every so many seconds. None : never.
+        """
+        self.path = path
+        self.iterations = iterations
+        self.seconds = seconds
+        self.lastSave = time.time()
+
+    def __str__( self ) :
+        return "Checkpoint at %s" % self.path
+
+    def wantSave( self, iteration ) :
+        """
+        Return True when a checkpoint needs to be written.
+
+        Parameters
+        ----------
+        iteration : int
+            present iteration number
+        """
+        return ( ( self.iterations is not None and iteration % self.iterations == 0 ) or
+                 ( self.seconds is not None and time.time() - self.lastSave >= self.seconds ) )
+
+    def wantRestore( self ) :
+        """ Return True when the checkpoint file exists.  """
+        return os.path.isfile( self.path )
+
+    #  *********SAVE***************************************************
+    def save( self, ns ) :
+        """
+        Save the state of the NestedSampler into the checkpoint file.
+
+        Parameters
+        ----------
+        ns : NestedSampler
+            the sampler to save
+        """
+        pickled = self.hasPickledModels( ns )
+
+        state = {"version" : numpy.asarray( self.VERSION )}
+        for name in ["iteration", "logZ", "logdZ", "info", "logWidth", "sumWidth",
+                     "logUnitDomain", "lowLhood"] :
+            state[name] = numpy.asarray( getattr( ns, name ) )
+        state["histinsert"] = numpy.asarray( ns.histinsert, dtype=int )
+        state["ncalls"] = numpy.asarray( [ns.distribution.ncalls, ns.distribution.nparts] )
+
+        self.putRandomState( state, "rng", ns.rng )
+        for k, eng in enumerate( ns.engines ) :
+            self.putRandomState( state, "engine%d.rng" % k, eng.rng )
+            for key, value in eng.getState().items() :
+                state["engine%d.%s" % ( k, key )] = value
+
+        self.putWalkers( state, "walkers", ns.walkers, pickled )
+
+        phancol = ns.phancol
+        self.putWalkers( state, "phantoms", phancol.phantoms, pickled )
+        state["phantoms.counted"] = phancol.counted
+        state["phantoms.limits"] = numpy.asarray( [phancol.ncalls, phancol.lowLhood,
+                                                   phancol.npars] )
+        if getattr( phancol, "paramMin", None ) is not None :
+            state["phantoms.paramMin"] = phancol.paramMin
+            state["phantoms.paramMax"] = phancol.paramMax
+
+        self.putSamples( state, "samples", ns.samples, pickled )
+
+        tmpfile = self.path + ".tmp"
+        with open( tmpfile, "wb" ) as fp :
+            numpy.savez( fp, **state )
+        os.replace( tmpfile, self.path )
+
+        self.lastSave = time.time()
+
+    def hasPickledModels( self, ns ) :
+        """
+        Return True when the models need to be stored (dynamic or modifiable).
+        """
+        model = ns.problem.model
+        return model is not None and ( model.isDynamic() or model.isModifiable() )
+
+    def putRandomState( self, state, name, rng ) :
+        ( _, keys, pos, hasGauss, cached ) = rng.get_state()
+        state[name + ".keys"] = keys
+        state[name + ".rest"] = numpy.asarray( [pos, hasGauss, cached], dtype=float )
+
+    def putRagged( self, state, name, arrays ) :
+        """
+        Store a list of 1-d arrays (or None) as values and lengths. None has length -1.
+        """
+        lengths = [-1 if a is None else len( a ) for a in arrays]
+        values = [a for a in arrays if a is not None]
+        state[name + ".len"] = numpy.asarray( lengths, dtype=int )
+        state[name] = numpy.concatenate( values ) if len( values ) > 0 else numpy.zeros( 0 )
+
+    def putModels( self, state, name, models ) :
+        self.putRagged( state, name, [numpy.frombuffer( pickle.dumps( m ), dtype=numpy.uint8 )
+                                        for m in models] )
+
+    def putWalkers( self, state, name, walkers, pickled ) :
+        state[name + ".count"] = numpy.asarray( walkers._count )
+        for key in ["id", "parent", "start"] :
+            state[name + "." + key] = numpy.asarray( [getattr( w, key ) for w in walkers],
+                                                     dtype=int )
+        for key in ["logL", "logPrior"] :
+            state[name + "." + key] = numpy.asarray( [getattr( w, key ) for w in walkers],
+                                                     dtype=float )
+        self.putRagged( state, name + ".allpars", [w.allpars for w in walkers] )
+        self.putRagged( state, name + ".fitIndex", [w.fitIndex for w in walkers] )
+        if pickled :
+            self.putModels( state, name + ".model", [w.problem.model for w in walkers] )
+
+    def putSamples( self, state, name, samples, pickled ) :
+        state[name + ".count"] = numpy.asarray( samples._count )
+        state[name + ".values"] = numpy.asarray( [samples.iteration, samples.logZ, samples.info] )
+        for key in ["id", "parent", "start"] :
+            state[name + "." + key] = numpy.asarray( [getattr( s, key ) for s in samples],
+                                                     dtype=int )
+        for key in ["logL", "logW"] :
+            state[name + "." + key] = numpy.asarray( [getattr( s, key ) for s in samples],
+                                                     dtype=float )
+        self.putRagged( state, name + ".parameters", [s.parameters for s in samples] )
+        self.putRagged( state, name + ".fitIndex", [s.fitIndex for s in samples] )
+        for key in ["hyper", "nuisance"] :
+            self.putRagged( state, name + "." + key,
+                            [getattr( s, key, None ) for s in samples] )
+        if pickled :
+            self.putModels( state, name + ".model", [s.model for s in samples] )
+
+    #  *********RESTORE***************************************************
+    def restore( self, ns ) :
+        """
+        Restore the state of the NestedSampler from the checkpoint file.
+
+        The NestedSampler should be constructed in the same way as the one
+        that wrote the checkpoint.
+
+        Parameters
+        ----------
+        ns : NestedSampler
+            the sampler to restore
+
+        Raises
+        ------
+        ValueError when the checkpoint does not fit the sampler.
+        """
+        with numpy.load( self.path ) as npz :
+            state = {key : npz[key] for key in npz.files}
+
+        if int( state["version"] ) != self.VERSION :
+            raise ValueError( "Checkpoint version %d not supported" % int( state["version"] ) )
+
+        neng = len( [k for k in state if k.endswith( ".rng.keys" ) and k.startswith( "engine" )] )
+        if neng != len( ns.engines ) :
+            raise ValueError( "Checkpoint has %d engines; the sampler %d" %
+                              ( neng, len( ns.engines ) ) )
+
+        pickled = self.hasPickledModels( ns )
+
+        for name in ["iteration", "logZ", "logdZ", "info", "logWidth", "sumWidth",
+                     "logUnitDomain", "lowLhood"] :
+            setattr( ns, name, state[name].item() )
+        ns.histinsert = [int( h ) for h in state["histinsert"]]
+        ns.distribution.ncalls = int( state["ncalls"][0] )
+        ns.distribution.nparts = int( state["ncalls"][1] )
+
+        self.getRandomState( state, "rng", ns.rng )
+        for k, eng in enumerate( ns.engines ) :
+            self.getRandomState( state, "engine%d.rng" % k, eng.rng )
+            prefix = "engine%d." % k
+            eng.setState( {key[len( prefix ):] : value for key, value in state.items()
+                            if key.startswith( prefix ) and not key.startswith( prefix + "rng" )} )
+
+        ns.walkers = self.getWalkers( state, "walkers", ns.problem, pickled )
+
+        phancol = ns.phancol
+        phancol.clear()
+        for walker in self.getWalkers( state, "phantoms", ns.problem, pickled ) :
+            phancol.storeItems( walker )
+        phancol.merge()
+        phancol.counted = state["phantoms.counted"]
+        phancol.count = int( state["phantoms.count"] )
+        ncalls, lowLhood, npars = state["phantoms.limits"]
+        phancol.ncalls = int( ncalls )
+        phancol.lowLhood = float( lowLhood )
+        phancol.npars = int( npars )
+        if "phantoms.paramMin" in state :
+            phancol.paramMin = state["phantoms.paramMin"]
+            phancol.paramMax = state["phantoms.paramMax"]
+        else :
+            phancol.paramMin = None
+            phancol.paramMax = None
+
+        self.getSamples( state, "samples", ns.samples, ns.problem.model, pickled )
+
+    def getRandomState( self, state, name, rng ) :
+        pos, hasGauss, cached = state[name + ".rest"]
+        rng.set_state( ( "MT19937", state[name + ".keys"], int( pos ), int( hasGauss ),
+                         float( cached ) ) )
+
+    def getRagged( self, state, name, dtype=None ) :
+        """
+        Return a list of arrays (or None) as stored by putRagged.
+        """
+        values = state[name]
+        if dtype is not None :
+            values = values.astype( dtype )
+        arrays = []
+        k = 0
+        for n in state[name + ".len"] :
+            if n < 0 :
+                arrays += [None]
+            else :
+                arrays += [values[k:k+n].copy()]
+                k += n
+        return arrays
+
+    def getModels( self, state, name ) :
+        return [pickle.loads( m.tobytes() ) for m in self.getRagged( state, name )]
+
+    def getWalkers( self, state, name, problem, pickled ) :
+        allpars = self.getRagged( state, name + ".allpars" )
+        fitIndex = self.getRagged( state, name + ".fitIndex", dtype=int )
+        models = ( self.getModels( state, name + ".model" ) if pickled
+                   else [None] * len( allpars ) )
+
+        wlist = []
+        for k, ( ap, fi, model ) in enumerate( zip( allpars, fitIndex, models ) ) :
+            walker = Walker( int( state[name + ".id"][k] ), problem.copy(), ap, fi,
+                             logL=float( state[name + ".logL"][k] ),
+                             parent=int( state[name + ".parent"][k] ),
+                             start=int( state[name + ".start"][k] ) )
+            walker.logPrior = float( state[name + ".logPrior"][k] )
+            if model is not None :
+                walker.problem.model = model
+            wlist.append( walker )
+
+        walkers = WalkerList( walkerlist=wlist )
+        walkers._count = int( state[name + ".count"] )
+        return walkers
+
+    def getSamples( self, state, name, samples, model, pickled ) :
+        parameters = self.getRagged( state, name + ".parameters" )
+        fitIndex = self.getRagged( state, name + ".fitIndex", dtype=int )
+        hyper = self.getRagged( state, name + ".hyper" )
+        nuisance = self.getRagged( state, name + ".nuisance" )
+        models = ( self.getModels( state, name + ".model" ) if pickled
+                   else [model] * len( parameters ) )
+
+        del samples[:]
+        for k, ( par, fi, hyp, nuis, mdl ) in enumerate( zip( parameters, fitIndex, hyper,
+                                                            nuisance, models ) ) :
+            sample = Sample( int( state[name + ".id"][k] ), int( state[name + ".parent"][k] ),
+                             int( state[name + ".start"][k] ), mdl,
+                             parameters=par, fitIndex=fi )
+            if hyp is not None :
+                sample.hyper = hyp
+            if nuis is not None :
+                sample.nuisance = nuis
+            sample.logL = float( state[name + ".logL"][k] )
+            sample.logW = float( state[name + ".logW"][k] )
+            samples.append( sample )
+
+        samples._count = int( state[name + ".count"] )
+        samples.iteration, samples.logZ, samples.info = state[name + ".values"]
+        samples.iteration = int( samples.iteration )
+        samples.normalized = False
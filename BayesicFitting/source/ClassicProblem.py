@@ -94,6 +94,18 @@ class ClassicProblem( Problem ):
         """
         return self.model.result( self.xdata, param )
 
+    def resultBatch( self, params2d ):
+        """
+        Returns the results calculated at the xdatas for a batch of parameter sets.
+
+        Parameters
+        ----------
+        params2d : 2d array_like
+            values for the parameters, one set per row.
+
+        """
+        return self.model.resultBatch( self.xdata, params2d )
+
 
     def partial( self, param ) :
         """
@@ -293,6 +293,21 @@ class CombiModel( BracketModel ):
         exppar = self.expandParameters( params )
         return super( CombiModel, self ).baseResult( xdata, exppar )
 
+    def baseResultBatch( self, xdata, params2d ) :
+        """
+        Returns the results calculated at the xdatas for a batch of parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params2d : 2d array_like
+            values for the parameters, one set per row.
+
+        """
+        exppar = numpy.asarray( [self.expandParameters( p ) for p in params2d] )
+        return super( CombiModel, self ).baseResultBatch( xdata, exppar )
+
     def basePartial( self, xdata, params, parlist=None ) :
         """
         Returns the partial derivatives calculated at the xdatas.
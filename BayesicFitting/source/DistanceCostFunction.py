@@ -105,6 +105,31 @@ class DistanceCostFunction( ErrorDistribution ):
         """
         return -problem.result( allpars )
 
+    def deltaLogL( self, problem, allpars, ptry, olegs, nlegs ):
+        """
+        Return the change in logL from the few legs that are changed.
+
+        Returns None when the problem cannot provide the change.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            present parameters of the problem
+        ptry : array_like
+            trial parameters of the problem
+        olegs : array_like of int
+            legs in allpars which are changed
+        nlegs : array_like of int
+            legs in ptry which are changed
+        """
+        if self.constrain is not None or not hasattr( problem, "costChange" ) :
+            return None
+
+        self.ncalls += 1
+        return -problem.costChange( allpars, ptry, olegs, nlegs )
+
     def partialLogL( self, model, param, fitIndex ):
         """
         Does not work for this class
@@ -4,6 +4,8 @@ from . import Tools
 
 from .LevenbergMarquardtFitter import LevenbergMarquardtFitter
 from .Walker import Walker
+from .Prior import Prior
+from .PriorVector import PriorVector
 from .Tools import setAttribute as setatt
 
 __author__ = "Do Kester"
@@ -63,6 +65,9 @@ class Engine( object ):
         present max size of the parameter cloud (in unitspace: [0,1])
     unitMin : array_like (read only)
         present minimum values of the parameter cloud (in unitspace: [0,1])
+    priorVectors : dict of {tuple : tuple}
+        PriorVectors for the models and fitIndices in use. Shared between copies.
+        See getPriorVector.
 
     Author       Do Kester.
 
@@ -113,15 +118,13 @@ class Engine( object ):
         self.report = [0]*5
 
         if copy is None :
+            self.priorVectors = {}
             self.maxtrials = self.MAXTRIALS
             self.rng = numpy.random.RandomState( seed )
 # Must be replaced by a Generator. TBD: check all self.rng calls
 #            self.rng = numpy.random.default_rng( seed )
 
-            if nstep is None :
-                self.nstep = ( lambda : 2 + int( self.NSTEP * ( 1 + self.rng.rand() ) ) )
-            else : 
-                self.nstep = ( lambda : nstep )
+            self._nstep = nstep
             self.verbose = verbose
             if slow is not None : 
                 self.slow = slow
@@ -129,8 +132,9 @@ class Engine( object ):
                 self.phancol = phancol
         else :
             self.maxtrials = copy.maxtrials
-            self.nstep = copy.nstep
+            self._nstep = copy._nstep
             self.rng = copy.rng
+            self.priorVectors = copy.priorVectors
             self.verbose   = copy.verbose
             if hasattr( copy, "slow" ) : self.slow = copy.slow
             self.phancol = copy.phancol
@@ -139,7 +143,37 @@ class Engine( object ):
         """ Return a copy of this engine.  """
         return Engine( self.walkers, self.errdis, copy=self )
 
+    def nstep( self ) :
+        """
+        Return the number of steps to take.
+
+        When no nstep was given at construction, it is a random number
+        between 2 + NSTEP and 2 + 2 * NSTEP.
+        """
+        if self._nstep is None :
+            return 2 + int( self.NSTEP * ( 1 + self.rng.rand() ) )
+        return self._nstep
+
     #  *********SET & GET***************************************************
+    def getState( self ) :
+        """
+        Return the adaptable state of the engine as a dict of arrays.
+
+        The random number generator is not included.
+        """
+        return {"report" : numpy.asarray( self.report, dtype=int )}
+
+    def setState( self, state ) :
+        """
+        Set the adaptable state of the engine, as obtained from getState.
+
+        Parameters
+        ----------
+        state : dict of {str : array_like}
+            the state to be set.
+        """
+        self.report = [int( r ) for r in state["report"]]
+
     def setWalker( self, kw, problem, allpars, logL, walker=None, fitIndex=None ) :
         """
         Update the walker with problem, allpars, LogL and logW.
@@ -169,13 +203,56 @@ class Engine( object ):
         wlkr.logL = logL
 
         if self.verbose > 4 :
-            wlkr.check( self.errdis )
+            wlkr.check( self.errdis,
+                        priorVector=self.getPriorVector( problem, wlkr.fitIndex ) )
 
         self.walkers.setWalker( wlkr, kw )
         self.phancol.storeItems( wlkr )
 
 ######## domain <> unit ###########################################
 
+    def getPriorVector( self, problem, kpar ) :
+        """
+        Return a PriorVector for the selected parameters or None if not applicable.
+
+        The PriorVector is made once per model and set of indices and kept in
+        priorVectors, which is shared with the copies of this engine. It is
+        remade when Prior.version has changed, i.e. after setPrior, setLimits
+        or any other change in the priors.
+        It is only made for static models without nuisance parameters
+        where all selected parameters have a prior.
+
+        Parameters
+        ----------
+        problem : Problem
+            the problem involved
+        kpar : array_like
+            selected parameter indices, where kp is index in [parameters, hyperparams]
+        """
+        model = problem.model
+        if ( kpar is None or model is None or model.isDynamic() or
+                model.isModifiable() or problem.nuispars > 0 ) :
+            return None
+
+        ## the entry holds on to the model, so its id is not reused
+        key = ( id( model ), kpar.tobytes() if isinstance( kpar, numpy.ndarray ) else tuple( kpar ) )
+        entry = self.priorVectors.get( key )
+        if ( entry is not None and entry[0] is model and entry[1] is self.errdis and
+                entry[2] == Prior.version ) :
+            return entry[3]
+
+        version = Prior.version
+        try :
+            priors = [model.getPrior( kp ) if kp >= 0 else self.errdis.hyperpar[kp].prior
+                        for kp in kpar]
+            pvec = None if None in priors else PriorVector( priors )
+        except Exception :
+            if self.DEBUG : raise
+            pvec = None
+
+        self.priorVectors[key] = ( model, self.errdis, version, pvec )
+        return pvec
+
     def domain2Unit( self, problem, dval, kpar=None ) :
         """
         Return value in [0,1] for the selected parameter.
@@ -184,20 +261,28 @@ class Engine( object ):
         ----------
         problem : Problem
             the problem involved
-        dval : float
-            domain value for the selected parameter
+        dval : float or array_like
+            domain value for the selected parameter.
+            A 2-d array is a batch of values, one set per row.
         kpar : None or array_like
             selected parameter index, where kp is index in [parameters, hyperparams]
             None means all
         """
         np = problem.npars
         if kpar is None :
-            kpar = self.makeIndex( np, dval )
+            kpar = self.makeIndex( np, dval[-1] if numpy.ndim( dval ) > 1 else dval )
 
         elif Tools.isInstance( kpar, int ) :
             return ( problem.domain2Unit( dval, kpar ) if kpar >= 0 else
                      self.errdis.domain2Unit( dval, kpar ) )
 
+        pvec = self.getPriorVector( problem, kpar )
+        if pvec is not None :
+            return pvec.domain2Unit( dval )
+
+        if numpy.ndim( dval ) > 1 :
+            return numpy.asarray( [self.domain2Unit( problem, dv, kpar=kpar ) for dv in dval] )
+
         uval = numpy.ndarray( len( kpar ), dtype=float )
 
         for i,kp in enumerate( kpar ) :
@@ -215,8 +300,9 @@ class Engine( object ):
         ----------
         problem : Problem
             the problem involved
-        uval : array_like
-            unit value for the selected parameter
+        uval : float or array_like
+            unit value for the selected parameter.
+            A 2-d array is a batch of values, one set per row.
         kpar : None or array_like
             selected parameter indices, where kp is index in [parameters, hyperparams]
             None means all.
@@ -224,11 +310,18 @@ class Engine( object ):
         np = problem.npars
 
         if kpar is None :
-            kpar = self.makeIndex( np, uval )
+            kpar = self.makeIndex( np, uval[-1] if numpy.ndim( uval ) > 1 else uval )
         elif Tools.isInstance( kpar, int ) :
             return ( problem.unit2Domain( uval, kpar ) if kpar >= 0 else
                      self.errdis.unit2Domain( uval, kpar ) )
 
+        pvec = self.getPriorVector( problem, kpar )
+        if pvec is not None :
+            return pvec.unit2Domain( uval )
+
+        if numpy.ndim( uval ) > 1 :
+            return numpy.asarray( [self.unit2Domain( problem, uv, kpar=kpar ) for uv in uval] )
+
         dval = numpy.ndarray( len( kpar ), dtype=float )
         for i,kp in enumerate( kpar ) :
             if kp >= 0 :
@@ -354,6 +354,32 @@ class ErrorDistribution( object ):
             if self.DEBUG : raise
             return 0.0
 
+    def dataTerm( self, problem, name, function, arg=None ) :
+        """
+        Return a term of the likelihood that only depends on the data (and arg).
+
+        The term is calculated once and kept in the datacache of the problem,
+        until the ydata, weights or accuracy of the problem are reassigned.
+        Only the term for the last value of arg is kept.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        name : str
+            name of the term in the cache
+        function : callable
+            to calculate the term as function( problem, arg )
+        arg : None or float
+            argument of the term, e.g. a fixed scale
+        """
+        cache = problem.datacache
+        item = cache.get( name )
+        if item is None or not item[0] == arg :
+            item = ( arg, function( problem, arg ) )
+            cache[name] = item
+        return item[1]
+
     #  *********LIKELIHOODS***************************************************
 
     def logCLhood( self, problem, allpars ):
@@ -391,6 +417,27 @@ class ErrorDistribution( object ):
 
         return numpy.sum( self.logLdata( problem, allpars ) )
 
+    def logLikelihoodBatch( self, problem, allpars2d ):
+        """
+        Return the log( likelihood ) for a batch of parameter sets.
+
+        This default calls logLikelihood for each set. Distributions
+        which can do better, override this method.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars2d : 2d array_like
+            parameters of the problem, one set per row
+
+        Returns
+        -------
+        array of logL, one for each set.
+        """
+        return numpy.asarray( [self.logLikelihood( problem, allpars )
+                               for allpars in allpars2d], dtype=float )
+
 
     def partialLogL( self, problem, allpars, fitIndex ) :
         """
@@ -508,6 +555,29 @@ class ErrorDistribution( object ):
         """
         return self.logLikelihood( problem, allpars )
 
+    def deltaLogL( self, problem, allpars, ptry, olegs, nlegs ) :
+        """
+        Return the change in log( likelihood ) when going from allpars to ptry,
+        where only a few legs (items in the result) have changed.
+
+        For order problems, which are changed by moving some nodes around.
+        Here it is not available; it returns None.
+
+        Parameters
+        ----------
+        problem : OrderProblem
+            to be solved
+        allpars : array_like
+            present parameters of the problem
+        ptry : array_like
+            trial parameters of the problem
+        olegs : array_like of int
+            legs in allpars which are changed
+        nlegs : array_like of int
+            legs in ptry which are changed
+        """
+        return None
+
     def __str__( self ) :
         """
         Return a string representation of this class.
@@ -1,7 +1,10 @@
 import numpy as numpy
-from threading import Thread
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
 
 from .Engine import Engine
+from .PhantomCollection import PhantomCollection
 from .Formatter import formatter as fmt
 from .Formatter import formatter as gmt
 
@@ -34,14 +37,24 @@ __status__ = "Perpetual Beta"
 #  *    2017 - 2026 Do Kester
 
 
-threadErrors = []
-
 class Explorer( object ):
     """
     Explorer is a helper class of NestedSampler, which contains and runs the
     diffusion engines.
 
-    It uses Threads to parallelise the diffusion engines.
+    It uses a pool of Threads or a pool of Processes to parallelise the diffusion engines.
+
+    The pools are persistent: they are started at the first call to explore
+    and live until close() is called.
+
+    Each thread has its own set of engines and its own random number generator,
+    which are reused in all iterations. The reports of the thread engines are
+    merged into those of the engines after each call to explore, so they are
+    up to date for checkpoints and progress reports.
+
+    Each process keeps its own copies of the problem, the error distribution and
+    the engines. Per walker it receives the walker's parameters and a seed and it
+    returns the updated walker, the engine reports and the new phantoms.
 
     Attributes
     ----------
@@ -59,6 +72,10 @@ class Explorer( object ):
         number of trials
     verbose : int (0)
         level of blabbering
+    threads : bool (False)
+        use threads
+    processes : None or int
+        number of processes in the pool (None or < 2 : no pool)
     lowLhood : float
         present low likelihood level
     iteration : int
@@ -69,7 +86,7 @@ class Explorer( object ):
     """
     TWOP32 = 2 ** 32
 
-    def __init__( self, ns, threads=False ):
+    def __init__( self, ns, threads=False, processes=None ):
         """
         Construct Explorer from a NestedSampler object.
 
@@ -77,6 +94,10 @@ class Explorer( object ):
         ----------
         ns : NestedSampler
             the calling NestedSampler. It provides the attributes.
+        threads : bool (False)
+            use threads
+        processes : None or int
+            use a pool of this many processes. Takes precedence over threads.
 
         """
         self.walkers = ns.walkers
@@ -87,7 +108,11 @@ class Explorer( object ):
         self.maxtrials = ns.maxtrials
         self.verbose = ns.verbose
         self.threads = threads
+        self.processes = processes if processes is not None and processes > 1 else None
+        self.pool = None
+        self.threadEngines = []
         self.usePhantoms = ns.usePhantoms
+        self.phancol = ns.phancol
 
         self.unitSize = ns.unitDomain
 
@@ -99,7 +124,7 @@ class Explorer( object ):
 
     def explore( self, worst, lowLhood, iteration ):
         """
-        Explore the likelihood function, using threads.
+        Explore the likelihood function, using threads or processes.
 
         Parameters
         ----------
@@ -112,6 +137,10 @@ class Explorer( object ):
         self.iteration = iteration
         engines = self.selectEngines( iteration )
 
+        if self.processes is not None :
+            self.exploreProcesses( worst, lowLhood, engines )
+            return
+
         if not self.threads :
             for kw in worst :
                 self.exploreWalker( kw, lowLhood, engines, self.rng )
@@ -119,30 +148,157 @@ class Explorer( object ):
             return
 
         ## We have Threads
-        explorerThreads = []
-        self.lowLhood = lowLhood
+        if self.pool is None :
+            self.startThreadPool()
+
+        esel = [self.engines.index( eng ) for eng in engines]
+
+        futures = [self.pool.submit( self.exploreInThread, kw, lowLhood, esel )
+                        for kw in worst]
+
+        ## wait for all; reraise exceptions from the threads
+        for future in futures :
+            future.result()
+
+        ## all threads are idle now
+        self.mergeReports()
+
+    def startThreadPool( self ) :
+        """
+        Start the pool of threads.
+        """
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.threadRng = numpy.random.RandomState( self.rng.randint( self.TWOP32 ) )
+        self.threadEngines = []
+        self.pool = ThreadPoolExecutor( thread_name_prefix="explorer" )
+
+    def exploreInThread( self, kw, lowLhood, esel ) :
+        """
+        Explore one walker with the engines and the rng of this thread.
+
+        Parameters
+        ----------
+        kw : int
+            index in walkerlist, of the walker to be explored
+        lowLhood : float
+            minimum value for the log likelihood
+        esel : list of int
+            indices of the selected engines
+        """
+        local = self.local
+        if not hasattr( local, "engines" ) :
+            ## first call in this thread: make its engines and rng.
+            with self.lock :
+                local.rng = numpy.random.RandomState( self.threadRng.randint( self.TWOP32 ) )
+                local.engines = [eng.copy() for eng in self.engines]
+                self.threadEngines += [local.engines]
+            for eng in local.engines :
+                eng.rng = local.rng
+
+        engines = [local.engines[k] for k in esel]
+        self.exploreWalker( kw, lowLhood, engines, local.rng )
+
+    def mergeReports( self ) :
+        """
+        Add the reports of the thread engines to those of the engines.
+        """
+        for tengines in self.threadEngines :
+            for engine, teng in zip( self.engines, tengines ) :
+                for i in range( len( teng.report ) ) :
+                    engine.report[i] += teng.report[i]
+                teng.report = [0] * len( teng.report )
+
+    def exploreProcesses( self, worst, lowLhood, engines ):
+        """
+        Explore the walkers in the pool of processes.
 
-        nrep = Engine.NCALLS
+        Parameters
+        ----------
+        worst : [int]
+            list of walkers to be explored/updated
+        lowLhood : float
+            level of the low likelihood
+        engines : list of Engine
+            to be used
+        """
+        if self.pool is None :
+            self.startPool()
+
+        esel = [self.engines.index( eng ) for eng in engines]
+
+        futures = []
         for kw in worst :
             seed = self.rng.randint( self.TWOP32 )
-            exThread = ExplorerThread( "explorer_%d"%kw, kw, self, engines, seed )
-            exThread.start( )
-            explorerThreads += [exThread]
+            walker = self.walkers[kw]
+            pmin, pmax = self.phancol.getParamMinmax( lowLhood, np=walker.nap )
+            model = walker.problem.model if self.transferModel else None
+            task = ( kw, walker.allpars, walker.logL, walker.fitIndex, model,
+                     lowLhood, self.iteration, esel, seed, pmin, pmax )
+            futures += [self.pool.submit( exploreTask, task )]
 
-        for thread in explorerThreads :
-            thread.join( )
+        for kw, future in zip( worst, futures ) :
+            ( allpars, logL, fitIndex, model, reports, ( ncalls, nparts ),
+                    phantoms ) = future.result()
 
-            for k,engine in enumerate( engines ) :
-                nc = 0
-                for i in range( nrep ) :
-                    nc += thread.engines[k].report[i]
-                    engine.report[i] += thread.engines[k].report[i]
-                engine.report[nrep] += nc
+            walker = self.walkers[kw]
+            self.walkers.setWalker( self.makeWalker( walker, allpars, logL, fitIndex, model ), kw )
 
-        if len( threadErrors ) > 0: #check if there are any errors
-            for e in threadErrors:
-                print( e )
-            raise Exception( "Thread Error" )
+            for ( pap, pL, pfi, pmd ) in phantoms :
+                self.phancol.storeItems( self.makeWalker( walker, pap, pL, pfi, pmd ) )
+
+            for engine, report in zip( engines, reports ) :
+                for i in range( len( report ) ) :
+                    engine.report[i] += report[i]
+
+            self.errdis.ncalls += ncalls
+            self.errdis.nparts += nparts
+
+    def makeWalker( self, walker, allpars, logL, fitIndex, model ) :
+        """
+        Return a copy of walker with the items returned by a process.
+
+        Parameters
+        ----------
+        walker : Walker
+            to be copied
+        allpars : array_like
+            (new) parameters
+        logL : float
+            (new) log likelihood
+        fitIndex : array_like
+            (new) fitIndex
+        model : Model or None
+            (new) model for dynamic or modifiable problems
+        """
+        wlkr = walker.copy()
+        wlkr.allpars = allpars
+        wlkr.logL = logL
+        wlkr.fitIndex = fitIndex
+        if model is not None :
+            wlkr.problem.model = model
+        return wlkr
+
+    def startPool( self ) :
+        """
+        Start the pool of processes, each with its own copy of the explorer.
+        """
+        model = self.walkers[0].problem.model
+        self.transferModel = model is not None and ( model.isDynamic() or model.isModifiable() )
+
+        worker = ExplorerWorker( self )
+        self.pool = ProcessPoolExecutor( max_workers=self.processes,
+                        initializer=initWorker, initargs=( worker, ) )
+
+    def close( self ) :
+        """
+        Shut down the pool of threads or processes (if any).
+        """
+        if self.pool is not None :
+            self.pool.shutdown()
+            self.pool = None
+        if self.processes is None and self.threads :
+            self.mergeReports()
 
     def exploreWalker( self, kw, lowLhood, engines, rng ):
         """
@@ -195,12 +351,12 @@ class Explorer( object ):
                     oldlogL = wlkr.logL
 
                     ## check walker for consistency
-                    walker.check( self.errdis )
+                    self.checkWalker( walker )
 
             trials += 1
 
         if moves == 0 :
-            self.walkers[kw].check( self.errdis )
+            self.checkWalker( self.walkers[kw] )
 
         if self.walkers[kw].logL < lowLhood :
             raise Exception( "%#10.3g < %#10.3g" % ( self.walkers[kw].logL, lowLhood )  )
@@ -238,43 +394,131 @@ class Explorer( object ):
     def checkWalkers( self ) :
         """ Perform sanity check on all walkers. """
         for w in self.walkers :
-            w.check( self.errdis )
+            self.checkWalker( w )
 
+    def checkWalker( self, walker ) :
+        """
+        Perform sanity check on the walker, with the PriorVector of the engines.
+
+        Parameters
+        ----------
+        walker : Walker
+            to be checked
+        """
+        pvec = self.engines[0].getPriorVector( walker.problem, walker.fitIndex )
+        walker.check( self.errdis, priorVector=pvec )
 
 
-class ExplorerThread( Thread ):
+
+class ExplorerWorker( Explorer ):
     """
-    One thread for the Explorer. It updates one walker.
+    The explorer as it lives in one of the processes of the pool.
+
+    It holds its own copies of the walkers, the error distribution and the engines.
+    The engines store their phantoms into a private PhantomCollection, which is
+    emptied for every walker and sent back to the main process.
 
     Attributes
     ----------
-    id : int
-        identity for thread
-    walkers : WalkerList
-        list of walkers
-    rng : numpy.random.RandomState
-        random number generator
-    engines : [Engine]
-        copy of the list of Engines of Explorer
+    transferModel : bool
+        whether the model needs to be sent with the walker (dynamic or modifiable)
     """
 
-    global threadErrors
+    def __init__( self, explorer ) :
+        """
+        Construct an ExplorerWorker from an Explorer.
 
-    def __init__( self, name, id, explorer, engines, seed ):
-        super( ExplorerThread, self ).__init__( name=name )
-        self.id = id
-        self.explorer = explorer
-        self.engines = [eng.copy() for eng in engines]
-        self.rng = numpy.random.RandomState( seed )
+        Parameters
+        ----------
+        explorer : Explorer
+            the explorer in the main process
+        """
+        self.walkers = explorer.walkers
+        self.errdis = explorer.errdis
+        self.rate = explorer.rate
+        self.maxtrials = explorer.maxtrials
+        self.verbose = explorer.verbose
+        self.transferModel = explorer.transferModel
+        self.iteration = 0
+
+        self.phancol = PhantomCollection()
+        self.engines = [eng.copy() for eng in explorer.engines]
+        for eng in self.engines :
+            eng.walkers = self.walkers
+            eng.errdis = self.errdis
+            eng.phancol = self.phancol
+
+    def exploreTask( self, task ) :
+        """
+        Explore one walker and return the results.
+
+        Parameters
+        ----------
+        task : tuple
+            ( kw, allpars, logL, fitIndex, model, lowLhood, iteration, esel, seed,
+              paramMin, paramMax )
+
+        Returns
+        -------
+        tuple of ( allpars, logL, fitIndex, model, reports, ( ncalls, nparts ), phantoms )
+        """
+        ( kw, allpars, logL, fitIndex, model, lowLhood, iteration, esel, seed,
+                pmin, pmax ) = task
+
+        walker = self.walkers[kw].copy()
+        walker.allpars = allpars
+        walker.logL = logL
+        walker.fitIndex = fitIndex
+        if model is not None :
+            walker.problem.model = model
+        self.walkers.setWalker( walker, kw )
+
+        ## present the phantom boundaries of the main process
+        self.phancol.clear()
+        self.phancol.lowLhood = lowLhood
+        self.phancol.npars = walker.nap
+        self.phancol.paramMin = pmin
+        self.phancol.paramMax = pmax
+
+        rng = numpy.random.RandomState( seed )
+        engines = [self.engines[k] for k in esel]
+        for eng in engines :
+            eng.rng = rng
+            eng.report = [0] * len( eng.report )
+        self.errdis.ncalls = 0
+        self.errdis.nparts = 0
+        self.iteration = iteration
+
+        self.exploreWalker( kw, lowLhood, engines, rng )
+
+        walker = self.walkers[kw]
+        model = walker.problem.model if self.transferModel else None
+        phantoms = [( ph.allpars, ph.logL, ph.fitIndex,
+                      ph.problem.model if self.transferModel else None )
+                        for ph in self.phancol.phantoms]
+
+        return ( walker.allpars, walker.logL, walker.fitIndex, model,
+                 [eng.report for eng in engines], ( self.errdis.ncalls, self.errdis.nparts ),
+                 phantoms )
 
 
-    def run( self ):
-        try :
-            self.explorer.exploreWalker( self.id, self.explorer.lowLhood,
-                                         self.engines, self.rng )
-        except Exception as e :
-            threadErrors.append( [repr(e) + " occurred in walker %d" % self.id] )
-            raise
+## the ExplorerWorker of this process (only present in the processes of the pool)
+worker = None
 
+def initWorker( explorer ) :
+    """
+    Initialize a process in the pool.
 
+    Parameters
+    ----------
+    explorer : ExplorerWorker
+        to be used in this process
+    """
+    global worker
+    worker = explorer
 
+def exploreTask( task ) :
+    """
+    Explore one walker in this process. See ExplorerWorker.exploreTask.
+    """
+    return worker.exploreTask( task )
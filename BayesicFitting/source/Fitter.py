@@ -54,6 +54,12 @@ class Fitter( BaseFitter ):
     >>> yband = fitter.monteCarloError( )        # 1 sigma confidence region
 
 
+    Repeated fits to the same xdata, model, weights and keep reuse the design
+    and the Cholesky decomposition of the hessian. See BaseFitter.getFactors().
+
+    >>> for y in ylist :
+    >>>     param = fitter.fit( y )             # one triangular solve per fit
+
     Limitations
     -----------
     1. The Fitter does not work with limits.
@@ -91,6 +97,7 @@ class Fitter( BaseFitter ):
 
         """
         super( Fitter, self ).__init__( xdata, model, map=map, keep=keep, fixedScale=fixedScale )
+        self.cacheFactors = True
 
     def fit( self, ydata, weights=None, accuracy=None, keep=None, plot=False ):
         """
@@ -132,10 +139,13 @@ class Fitter( BaseFitter ):
             self.chiSquared( ydata, fitWgts )
             return numpy.asarray( 0 )
 
+        factors = self.getFactors( weights=fitWgts, index=fitIndex )
         hessian = self.getHessian( weights=fitWgts, index=fitIndex )
         ydatacopy = ydata.copy( )
         # subtract influence of fixed parameters on the data
-        if fitIndex is not None :
+        if factors is not None and factors["offset"] is not None :
+            ydatacopy = numpy.subtract( ydatacopy, factors["offset"] )
+        elif fitIndex is not None :
             fxpar = numpy.copy( self.model.parameters )
             fxpar[fitIndex] = 0.0
             ydatacopy = numpy.subtract( ydatacopy, self.model.result( self.xdata, fxpar) )
@@ -147,7 +157,7 @@ class Fitter( BaseFitter ):
 
         vector = self.getVector( ydatacopy, index=fitIndex )
 #        print( fmt( hessian ) )
-        params = numpy.linalg.solve( hessian, vector )
+        params = self.solveHessian( hessian, vector )
 
         params = self.insertParameters( params, index=fitIndex )
         self.model.parameters = params
@@ -239,6 +239,28 @@ class FixedModel( BaseModel ):
         expparam = self.expand( xdata, param )[:self.npmax]
         return super( FixedModel, self ).result( xdata, expparam )
 
+    def resultBatch( self, xdata, params2d ):
+        """
+        Returns the results calculated at the xdatas for a batch of parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params2d : 2d array_like
+            values for the parameters, one set per row.
+
+        """
+        if self.fixed is None :
+            return super( FixedModel, self ).resultBatch( xdata, params2d )
+
+        ## expanded parameters might be heterogeneous; do them one by one
+        res = []
+        for param in params2d :
+            expparam = self.expand( xdata, param )[:self.npmax]
+            res += [super( FixedModel, self ).result( xdata, expparam )]
+        return numpy.asarray( res )
+
     def expand( self, xdata, param ) :
         """
         Returns a complete list of parameters, where the fixed parameters
@@ -114,6 +114,17 @@ class GalileanEngine( Engine ):
         """ Return the name of this engine.  """
         return str( "GalileanEngine" )
 
+    def getState( self ) :
+        """ Return the adaptable state of the engine, including its size.  """
+        state = super().getState()
+        state["size"] = numpy.asarray( self.size )
+        return state
+
+    def setState( self, state ) :
+        """ Set the adaptable state of the engine, including its size.  """
+        super().setState( state )
+        self.size = float( state["size"] )
+
     #  *********EXECUTE***************************************************
     def execute( self, kw, lowLhood, iteration=0 ):
         """
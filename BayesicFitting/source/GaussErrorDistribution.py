@@ -1,7 +1,10 @@
 import numpy as numpy
 import math
+from scipy import special
 
 from .ScaledErrorDistribution import ScaledErrorDistribution
+from .ClassicProblem import ClassicProblem
+from .Tools import setAttribute as setatt
 
 __author__ = "Do Kester"
 __year__ = 2026
@@ -54,6 +57,16 @@ class GaussErrorDistribution( ScaledErrorDistribution ):
 
      logL = log( &sum;( w ) / ( &radic;( 2 &pi; ) s )  ) - 0.5 &sum;( w ( x / s )^2 )
 
+    When the attribute linear is set, the likelihood is marginalised over the
+    parameters at those indices. They should enter the model linearly.
+    See Model.getLinearIndex(). At each call they are solved by weighted least
+    squares, given the other parameters, and the Gaussian integral over them is
+    added to logL, together with the log of their priors at the solution.
+
+    Attributes
+    ----------
+    linear : None or array_like of int
+        indices of the linear parameters to be marginalised. (None : none)
 
     Author       Do Kester.
 
@@ -81,11 +94,22 @@ class GaussErrorDistribution( ScaledErrorDistribution ):
 
         """
         super( GaussErrorDistribution, self ).__init__(  scale=scale, limits=limits, copy=copy )
+        self.linear = None if copy is None else copy.linear
 
     def copy( self ):
         """ Return copy of this.  """
         return GaussErrorDistribution( copy=self )
 
+    def __setattr__( self, name, value ):
+        """
+        Set attributes.
+
+        """
+        if name == "linear" :
+            setatt( self, name, None if value is None else numpy.asarray( value, dtype=int ) )
+        else :
+            super( GaussErrorDistribution, self ).__setattr__( name, value )
+
     def acceptWeight( self ):
         """
         True if the distribution accepts weights.
@@ -108,6 +132,238 @@ class GaussErrorDistribution( ScaledErrorDistribution ):
         return self.getGaussianScale( problem, allpars=allpars )
 
     #  *********LIKELIHOODS***************************************************
+    def logLhood( self, problem, allpars ) :
+        """
+        Return the log( likelihood ) for a Gaussian distribution.
+
+        For ClassicProblems with a single output, the chisq and the normalization
+        are calculated as scalars. The residuals are kept in scratch space
+        of the problem. For a scalar variance, nothing of the size of the data
+        is allocated. Otherwise, the weighted inverse variances and the summed
+        normalization are kept in the datacache when the scale is fixed; for a
+        free scale they are calculated in scratch space.
+        Otherwise it is the sum of logLdata.
+
+        The result equals the sum of logLdata up to rounding.
+
+        When linear parameters are set, it is the marginal likelihood. See logMLhood.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            list of all parameters in the problem
+
+        """
+        if self.linear is not None :
+            return self.logMLhood( problem, allpars )
+
+        if not isinstance( problem, ClassicProblem ) or numpy.ndim( problem.ydata ) != 1 :
+            return super( ).logLhood( problem, allpars )
+
+        self.ncalls += 1
+
+        shape = problem.ydata.shape
+        res = problem.workspace( "residuals", shape )
+        numpy.subtract( problem.ydata, problem.result( allpars[:problem.npars] ), out=res )
+        res = problem.cyclicCorrection( res )
+        wres = problem.workspace( "wresiduals", shape )
+
+        scale = allpars[-1]
+        if numpy.ndim( problem.varyy ) == 0 :
+            if problem.weights is None :
+                chisq = numpy.dot( res, res )
+            else :
+                chisq = numpy.dot( numpy.multiply( res, problem.weights, out=wres ), res )
+            s2 = scale * scale + problem.varyy
+            chisq /= s2
+            norm = problem.sumweight * ( self.LOG2PI + math.log( s2 ) )
+
+        elif self.hyperpar[0].isFixed :
+            chisq = numpy.dot( numpy.multiply( res, self.dataTerm( problem, "gaussInvVar",
+                            self.invVar, arg=scale ), out=wres ), res )
+            norm = self.dataTerm( problem, "gaussNormSum", self.logNormSum, arg=scale )
+
+        else :
+            s2 = numpy.add( problem.varyy, scale * scale, out=problem.workspace( "variance", shape ) )
+            numpy.divide( res, s2, out=wres )
+            if problem.weights is not None :
+                wres *= problem.weights
+            chisq = numpy.dot( wres, res )
+            logs2 = numpy.log( s2, out=s2 )
+            norm = problem.sumweight * self.LOG2PI + ( numpy.sum( logs2 ) 
+                        if problem.weights is None else numpy.dot( problem.weights, logs2 ) )
+
+        return -0.5 * ( chisq + norm )
+
+    def logMLhood( self, problem, allpars ) :
+        """
+        Return the log( likelihood ) marginalised over the linear parameters.
+
+        With A the (weighted) hessian of the linear parameters, a their 
+        least squares solution and P the diagonal matrix of their priors at a, 
+        it is
+
+            logL( a ) + 0.5 * k * log( 2 pi ) - 0.5 * log( det( A ) ) + log( det( P ) )
+                      + log( M )
+
+        where k is the number of linear parameters. M is the mass of the 
+        Gaussian ( a, inv( A ) ) within the limits of the priors. It is the
+        product of the masses of the marginals, which is exact for one linear
+        parameter or uncorrelated ones.
+        The sum of the terms after logL( a ) is kept <= 0, as the integral over
+        the likelihood times a (normalized) prior cannot exceed its maximum.
+
+        The priors are evaluated at the solution, moved into their limits when needed.
+        allpars is not changed; the solution is obtained with solveLinear().
+        It returns -inf when A is singular.
+
+        Parameters
+        ----------
+        problem : ClassicProblem
+            to be solved
+        allpars : array_like
+            list of all parameters in the problem
+
+        """
+        self.ncalls += 1
+
+        try :
+            amp, hessian, res, ivar = self.solveLinear( problem, allpars )
+
+            priors = [problem.model.getPrior( k ) for k in self.linear]
+            logpr = numpy.asarray( [pr.logResult( pr.stayInLimits( a ) )
+                                    for pr, a in zip( priors, amp )], dtype=float )
+
+            pscale = numpy.exp( -logpr )
+            lam, vec = numpy.linalg.eigh( hessian * numpy.outer( pscale, pscale ) )
+        except numpy.linalg.LinAlgError :
+            return -math.inf
+
+        ## (numerically) singular: the linear parameters are not determined
+        if not lam[0] > numpy.finfo( float ).eps * lam[-1] :
+            return -math.inf
+
+        ## standard deviations of the linear parameters: sqrt of diagonal of inv( A )
+        stdev = pscale * numpy.sqrt( numpy.sum( vec * vec / lam, axis=1 ) )
+        logmass = self.logMass( priors, amp, stdev )
+
+        scale = allpars[-1]
+        chisq = numpy.dot( res * ivar, res )
+        if numpy.ndim( problem.varyy ) > 0 :
+            norm = self.dataTerm( problem, "gaussNormSum", self.logNormSum, arg=scale )
+        else :
+            norm = problem.sumweight * ( self.LOG2PI + math.log( scale * scale + problem.varyy ) )
+
+        logfac = numpy.sum( 0.5 * ( self.LOG2PI - numpy.log( lam ) ) ) + logmass
+
+        return -0.5 * ( chisq + norm ) + min( logfac, 0.0 )
+
+    def logMass( self, priors, center, stdev ) :
+        """
+        Return the sum of the log of the masses of Gaussians within the limits
+        of their priors.
+
+        Both tails are computed with erfc, to keep the precision when a
+        Gaussian is far from the limits.
+
+        Parameters
+        ----------
+        priors : list of Prior
+            with the limits
+        center : array_like
+            of the Gaussians
+        stdev : array_like
+            of the Gaussians
+        """
+        wid = math.sqrt( 2 ) * stdev
+        zlo = ( numpy.fromiter( ( pr.lowLimit for pr in priors ), float ) - center ) / wid
+        zhi = ( numpy.fromiter( ( pr.highLimit for pr in priors ), float ) - center ) / wid
+        mass = 0.5 * numpy.where( zlo > 0, special.erfc( zlo ) - special.erfc( zhi ),
+                                  special.erfc( -zhi ) - special.erfc( -zlo ) )
+        return numpy.sum( numpy.log( mass ) ) if numpy.all( mass > 0 ) else -math.inf
+
+    def solveLinear( self, problem, allpars ) :
+        """
+        Return the least squares solution of the linear parameters, given the others.
+
+        Parameters
+        ----------
+        problem : ClassicProblem
+            to be solved
+        allpars : array_like
+            list of all parameters in the problem
+
+        Returns
+        -------
+        amp : array
+            solution of the linear parameters
+        hessian : 2d array
+            (weighted) hessian of the linear parameters
+        res : array
+            residuals at the solution
+        ivar : float or array
+            the (weighted) inverse variance of the data
+
+        Raises
+        ------
+        LinAlgError when the hessian is singular
+        """
+        ## the partials of linear parameters do not depend on their values
+        params = numpy.array( allpars[:problem.npars], dtype=float )
+        design = problem.partial( params )[:,self.linear]
+
+        ## residuals at the linear parameters set to 0
+        res = problem.ydata - problem.result( params )
+        res += numpy.inner( design, params[self.linear] )
+
+        ivar = self.invVar( problem, allpars[-1] )
+        wdesign = design.transpose() * ivar
+        hessian = numpy.inner( wdesign, design.transpose() )
+        amp = numpy.linalg.solve( hessian, numpy.inner( wdesign, res ) )
+        res -= numpy.inner( design, amp )
+
+        return ( amp, hessian, res, ivar )
+
+    def drawLinear( self, problem, allpars, rng, maxtry=100 ) :
+        """
+        Return a copy of allpars with the linear parameters drawn from their
+        conditional posterior, given the other parameters.
+
+        It is a Gaussian around the least squares solution with the inverse 
+        of the hessian as covariance, truncated by the limits of the priors.
+        When no draw falls within the limits after maxtry trials, the last
+        one is moved into the limits.
+
+        Parameters
+        ----------
+        problem : ClassicProblem
+            to be solved
+        allpars : array_like
+            list of all parameters in the problem
+        rng : RandomState
+            random number generator
+        maxtry : int
+            maximum number of draws
+        """
+        allpars = numpy.array( allpars, dtype=float )
+        try :
+            amp, hessian, res, ivar = self.solveLinear( problem, allpars )
+            chol = numpy.linalg.cholesky( hessian )
+        except numpy.linalg.LinAlgError :
+            return allpars
+
+        priors = [problem.model.getPrior( k ) for k in self.linear]
+        for t in range( maxtry ) :
+            draw = amp + numpy.linalg.solve( chol.transpose(), 
+                                             rng.standard_normal( len( amp ) ) )
+            if not any( pr.isOutOfLimits( d ) for pr, d in zip( priors, draw ) ) :
+                break
+
+        allpars[self.linear] = [pr.stayInLimits( d ) for pr, d in zip( priors, draw )]
+        return allpars
+
     def logLikelihood_alt( self, problem, allpars ) :
         """
         Return the log( likelihood ) for a Gaussian distribution.
@@ -129,16 +385,53 @@ class GaussErrorDistribution( ScaledErrorDistribution ):
 
         if isinstance( s2, float ) :
             norm = problem.sumweight * ( self.LOG2PI + numpy.log( s2 ) )
-        elif problem.hasWeights() :
-            norm = numpy.sum( problem.weights * ( self.LOG2PI + numpy.log( s2 ) ) )
         else :
-            norm = numpy.sum( self.LOG2PI + numpy.log( s2 ) )
+            norm = numpy.sum( self.dataTerm( problem, "gaussNorm", self.logNorm,
+                                             arg=allpars[-1] ) )
 
         return -0.5 * ( chisq + norm )
 
 #        return ( - problem.sumweight * ( 0.5 * ( self.LOG2PI + numpy.log( s2 ) ) ) -
 #                       0.5 * chisq )
 
+    def logLikelihoodBatch( self, problem, allpars2d ) :
+        """
+        Return the log( likelihood ) for a batch of parameter sets.
+
+        Unconstrained ClassicProblems with a single output are calculated
+        for all sets at once. Otherwise it falls back to one set at a time.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars2d : 2d array_like
+            parameters of the problem, one set per row
+
+        Returns
+        -------
+        array of logL, one for each set.
+        """
+        if ( self.constrain is not None or self.linear is not None or 
+                not isinstance( problem, ClassicProblem ) or numpy.ndim( problem.ydata ) != 1 ) :
+            return super( ).logLikelihoodBatch( problem, allpars2d )
+
+        allpars2d = numpy.array( allpars2d, dtype=float, ndmin=2 )
+        self.ncalls += len( allpars2d )
+
+        mock = problem.resultBatch( allpars2d[:,:problem.npars] )
+        res = problem.cyclicCorrection( problem.ydata - mock )
+        res2 = res * res
+
+        scale = allpars2d[:,-1:]
+        s2 = scale * scale + problem.varyy
+        norm = self.LOG2PI + numpy.log( s2 )
+        if problem.weights is not None :
+            res2 *= problem.weights
+            norm = norm * problem.weights
+
+        return -0.5 * numpy.sum( res2 / s2 + norm, axis=1 )
+
     def logLdata( self, problem, allpars, mockdata=None ) :
         """
         Return the log( likelihood ) for each residual
@@ -162,13 +455,50 @@ class GaussErrorDistribution( ScaledErrorDistribution ):
         s2 = scale * scale + problem.varyy 
         res2 /= s2
 
-        if problem.weights is None :
-            res2 -= ( 0.5 * ( self.LOG2PI + numpy.log( s2 ) ) )
-        else :
-            res2 -= ( 0.5 * ( self.LOG2PI + numpy.log( s2 ) ) ) * problem.weights
+        res2 -= 0.5 * self.dataTerm( problem, "gaussNorm", self.logNorm, arg=scale )
 
         return res2
 
+    def invVar( self, problem, scale ) :
+        """
+        Return the (weighted) inverse variance for each data point.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        scale : float
+            the noise scale
+        """
+        ivar = 1.0 / ( scale * scale + problem.varyy )
+        if problem.weights is not None :
+            ivar = ivar * problem.weights
+        return ivar
+
+    def logNormSum( self, problem, scale ) :
+        """
+        Return the sum of the log normalizations. See logNorm.
+        """
+        return numpy.sum( self.logNorm( problem, scale ) )
+
+    def logNorm( self, problem, scale ) :
+        """
+        Return the log of the (weighted) normalization for each data point.
+
+        For a fixed scale it is kept in the datacache of the problem.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        scale : float
+            the noise scale
+        """
+        norm = self.LOG2PI + numpy.log( scale * scale + problem.varyy )
+        if problem.weights is not None :
+            norm = norm * problem.weights
+        return norm
+
 
     def partialLogL_alt( self, problem, allpars, fitIndex ) :
         """
@@ -125,6 +125,23 @@ class GaussModel( NonLinearModel ):
         res = params[0] * numpy.exp( -0.5 * x * x )
         return res
 
+    def baseResultBatch( self, xdata, params2d ):
+        """
+        Returns the results of the model function for a batch of parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params2d : 2d array_like
+            values for the parameters, one set per row.
+
+        """
+        s = 1.0 / params2d[:,2:3]
+        x = ( xdata - params2d[:,1:2] ) * s
+        res = params2d[:,0:1] * numpy.exp( -0.5 * x * x )
+        return res
+
     def basePartial( self, xdata, params, parlist=None ):
         """
         Returns the partials at the input value.
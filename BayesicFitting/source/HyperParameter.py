@@ -1,4 +1,5 @@
 import numpy as numpy
+from .Prior import Prior
 from .JeffreysPrior import JeffreysPrior
 
 __author__ = "Do Kester"
@@ -106,6 +107,14 @@ class HyperParameter( object ):
         """ Return a copy.  """
         return HyperParameter( copy=self )
 
+    def __setattr__( self, name, value ) :
+        """
+        Set attributes. A new prior is counted in Prior.version.
+        """
+        object.__setattr__( self, name, value )
+        if name == "prior" :
+            Prior.version += 1
+
     def checkPrior( self ) :
         """
         Raises
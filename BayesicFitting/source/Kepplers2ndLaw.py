@@ -1,5 +1,6 @@
 import numpy as numpy
 import math
+import threading
 
 from .Tools import setAttribute as setatt
 
@@ -51,14 +52,22 @@ class Kepplers2ndLaw( object ):
         By default Halleys method is used.
         It converges in a few iterations for e <= 0.999999999
     sinE : array (read only)
-        sin of eccentricAnomaly 
+        sin of eccentricAnomaly, as set by eccentricAnomaly and radiusAndTrueAnomaly.
     cosE : array (read only)
-        cos of eccentricAnomaly 
+        cos of eccentricAnomaly, as set by eccentricAnomaly and radiusAndTrueAnomaly.
+    iter : int (read only)
+        number of iterations needed in the last solution of eccentricAnomaly
+    warmstart : bool
+        start from the previous solution where the parameters changed only little
+    threadlocal : threading.local
+        holds the previous solution of each thread, for the warm start.
+        It is not copied or pickled.
     """
     TWOPI = 2 * math.pi
     MAXITER = 100
+    TOLERANCE = 1e-8
 
-    def __init__( self, eccentricAnomaly="halley" ) :
+    def __init__( self, eccentricAnomaly="halley", warmstart=True ) :
         """
         Use Keppler's 2nd Law to derive the radius and true anomaly.
 
@@ -66,19 +75,41 @@ class Kepplers2ndLaw( object ):
         ----------
         eccentricAnomaly : ["standard", "newton", "halley"]
             method to use in the calculation
+        warmstart : bool
+            start from the previous solution where the parameters changed only little
 
         """
+        self.warmstart = warmstart
+        self.threadlocal = threading.local()
         eccentricAnomaly = eccentricAnomaly.lower()
         if eccentricAnomaly == "halley" :
             self.eccentricAnomaly = self.eccentricAnomaly2
+            self.method = 2
         elif eccentricAnomaly == "newton" :
             self.eccentricAnomaly = self.eccentricAnomaly1
+            self.method = 1
         elif eccentricAnomaly == "standard" :
             self.eccentricAnomaly = self.eccentricAnomaly0
+            self.method = 0
         else :
             raise ValueError( "Unknown method for eccentricAnomaly : %s" % 
                         eccentricAnomaly )
 
+    def __getstate__( self ) :
+        """
+        Return the state for pickling and copying, without the previous solutions.
+        """
+        state = self.__dict__.copy()
+        state.pop( "threadlocal", None )
+        return state
+
+    def __setstate__( self, state ) :
+        """
+        Restore the state with a new (empty) threadlocal.
+        """
+        self.__dict__.update( state )
+        self.threadlocal = threading.local()
+
     def meanAnomaly( self, xdata, params ) :
         """
         Return the mean anomaly.
@@ -154,26 +185,7 @@ class Kepplers2ndLaw( object ):
         Estart : array_like
             starting values for E
         """
-        M = self.meanAnomaly( xdata, params )
-        eccen = params[0]
-
-        Ep = M[:]
-        iter = 0
-        ## calculate the eccentric anomaly E
-        while iter < self.MAXITER :
-            sinE = numpy.sin( Ep )
-            E = M - eccen * sinE
-            iter += 1
-            if all( numpy.abs( E - Ep ) < 1e-8 ) : break
-            Ep = E
-        else :
-            print( "EA0: No convergence at iter %d for eccentricity %8.4f" % ( iter, eccen ) )
-
-        setatt( self, "iter", iter )
-        setatt( self, "sinE", sinE )
-        setatt( self, "cosE", numpy.cos( Ep ) )
-
-        return E
+        return self.legacyAnomaly( xdata, params, Estart, 0 )
 
     def eccentricAnomaly1( self, xdata, params, Estart=None ) :
         """
@@ -195,26 +207,7 @@ class Kepplers2ndLaw( object ):
         Estart : array_like
             starting values for E
         """
-        M = self.meanAnomaly( xdata, params )
-        eccen = params[0]
-
-        Ep = M[:]
-        iter = 0
-        ## calculate the eccentric anomaly E
-        while iter < self.MAXITER :
-            sinE = numpy.sin( Ep )
-            cosE = numpy.cos( Ep )
-            E = Ep - ( M + eccen * sinE - Ep ) / ( eccen * cosE - 1 )
-            iter += 1
-            if all( numpy.abs( E - Ep ) < 1e-8 ) : break
-            Ep = E
-        else :
-            print( "EA1: No convergence at iter %d for eccentricity %8.4f" % ( iter, eccen ) )
-
-        setatt( self, "iter", iter )
-        setatt( self, "sinE", sinE )
-        setatt( self, "cosE", cosE )
-        return E
+        return self.legacyAnomaly( xdata, params, Estart, 1 )
 
     def eccentricAnomaly2( self, xdata, params, Estart=None ) :
         """
@@ -236,43 +229,167 @@ class Kepplers2ndLaw( object ):
         Estart : array_like
             starting values for E
         """
-        M = self.meanAnomaly( xdata, params )
+        return self.legacyAnomaly( xdata, params, Estart, 2 )
+
+    def legacyAnomaly( self, xdata, params, Estart, method ) :
+        """
+        Return the eccentric anomaly and store sinE, cosE and iter as attributes.
+        """
+        ( E, sinE, cosE, iter ) = self.solveKepler( xdata, params, Estart=Estart, method=method )
+        setatt( self, "sinE", sinE )
+        setatt( self, "cosE", cosE )
+        setatt( self, "iter", iter )
+        return E
+
+    def solveKepler( self, xdata, params, Estart=None, method=None ) :
+        """
+        Return the eccentric anomaly, E, and its sine and cosine.
+
+        Only the points that are not yet converged, are iterated. The iterations
+        start from Estart when given. Otherwise they start from the previous
+        solution, corrected for the changes in the parameters, where that is close
+        enough, and from Markleys starter elsewhere.
+        The previous solution is kept per thread; nothing else is stored in
+        this object.
+
+        Parameters
+        ----------
+        xdata : array_like
+            times in the orbit
+        params : array_like
+            parameters: eccentr, semimajor, period, phase
+        Estart : array_like
+            starting values for E
+        method : None or 0 or 1 or 2
+            None : the method chosen at construction
+            0 : standard, 1 : newton, 2 : halley
+
+        Returns
+        -------
+        ( E, sinE, cosE, iter ) : tuple of 3 arrays and an int
+            the eccentric anomaly, its sine and cosine, and the number of
+            iterations needed
+
+        Raises
+        ------
+        RuntimeError when halleys method does not converge.
+        """
+        if method is None :
+            method = self.method
         eccen = params[0]
+        M = numpy.asarray( self.meanAnomaly( xdata, params ), dtype=float )
+        shape = M.shape
+        M = M.ravel()
 
+        if Estart is not None :
+            E = numpy.array( Estart, dtype=float ).ravel()
+        else :
+            E = self.startAnomaly( M, eccen )
 
-        E = M[:] if Estart is None else Estart
+        sinE = numpy.empty_like( E )
+        cosE = numpy.empty_like( E )
 
+        todo = numpy.arange( len( M ) )
         iter = 0
-        ## calculate the eccentric anomaly E
-        while iter < self.MAXITER :
-            Ep = E
-            sinE = numpy.sin( Ep )
-            cosE = numpy.cos( Ep )
-            es = eccen * sinE
-            fx = M + es - Ep
-            fp = eccen * cosE - 1
-
-            E = Ep - 2 * fx * fp / ( 2 * fp * fp + fx * es )
+        ## iterate only the points that did not yet converge
+        while iter < self.MAXITER and len( todo ) > 0 :
+            Ep = E[todo]
+            sp = numpy.sin( Ep )
+            cp = numpy.cos( Ep )
+            es = eccen * sp
+            if method == 0 :
+                dE = M[todo] + es - Ep
+            else :
+                fx = M[todo] + es - Ep
+                fp = eccen * cp - 1
+                if method == 1 :
+                    dE = - fx / fp
+                else :
+                    dE = - 2 * fx * fp / ( 2 * fp * fp + fx * es )
+            E[todo] = Ep + dE
             iter += 1
-            if all( numpy.abs( E - Ep ) < 1e-8 ) : break
-        else :
-#            # uncomment for more diagnostics
-#            from .Formatter import formatter as fmt
-#            q = numpy.where( numpy.abs( E - Ep ) > 1e-8 )
-#            print( "\n" )
-#            print( "params  ", fmt( params, max=None ) )
-#            print( "Ep      ", fmt( Ep[q] ) )
-#            print( "E       ", fmt( E[q] ) )
-#            print( "sinE    ", fmt( sinE[q] ) )
-#            print( "cosE    ", fmt( cosE[q] ) )
-            raise RuntimeError( "EA2: No convergence at iter %d for eccentricity %8.4f" % ( iter, eccen ) )
 
-        setatt( self, "iter", iter )
-        setatt( self, "sinE", sinE )
-        setatt( self, "cosE", cosE )
+            ## the trig values follow the (very small) last step
+            conv = numpy.abs( dE ) < self.TOLERANCE
+            kc = todo[conv]
+            dc = dE[conv]
+            sinE[kc] = sp[conv] + cp[conv] * dc
+            cosE[kc] = cp[conv] - sp[conv] * dc
+            todo = todo[~conv]
+
+        if len( todo ) > 0 :
+            sinE[todo] = numpy.sin( E[todo] )
+            cosE[todo] = numpy.cos( E[todo] )
+            if method == 2 :
+                raise RuntimeError( "EA2: No convergence at iter %d for eccentricity %8.4f" %
+                                ( iter, eccen ) )
+            print( "EA%d: No convergence at iter %d for eccentricity %8.4f" %
+                                ( method, iter, eccen ) )
+
+        if self.warmstart :
+            self.threadlocal.previous = ( eccen, M, E, sinE, cosE )
+
+        return ( E.reshape( shape ), sinE.reshape( shape ), cosE.reshape( shape ), iter )
+
+    def startAnomaly( self, M, eccen ) :
+        """
+        Return starting values for the eccentric anomaly.
+
+        Where the parameters changed only little since the previous solution
+        in this thread, it is updated with a Newton step in the mean anomaly
+        and the eccentricity.
+        Elsewhere the starter of Markley (1995) is used, which is better than
+        1.0e-3 everywhere.
 
+        Parameters
+        ----------
+        M : array_like
+            mean anomaly
+        eccen : float
+            eccentricity
+        """
+        E = None
+        todo = None
+        prev = getattr( self.threadlocal, "previous", None )
+        if prev is not None and prev[1].shape == M.shape :
+            ( e0, M0, E0, sinE0, cosE0 ) = prev
+            fp = 1 - eccen * cosE0
+            step = ( M - M0 + ( eccen - e0 ) * sinE0 ) / fp
+            E = E0 + step
+            ## where the quadratic error of the Newton step is too large
+            todo = numpy.where( eccen * step * step > 2.0e-3 * fp )[0]
+            if len( todo ) == 0 :
+                return E
+
+        Mt = M if todo is None else M[todo]
+        Es = self.markley( Mt, eccen )
+        if todo is None :
+            return Es
+        E[todo] = Es
         return E
 
+    def markley( self, M, eccen ) :
+        """
+        Return Markleys (1995) starting values for the eccentric anomaly.
+
+        Parameters
+        ----------
+        M : array_like
+            mean anomaly
+        eccen : float
+            eccentricity
+        """
+        ## reduce M to [-pi,pi]
+        Mw = self.TWOPI * numpy.round( M / self.TWOPI )
+        Mr = M - Mw
+        pi = math.pi
+        alpha = ( 3 * pi * pi + 1.6 * pi * ( pi - numpy.abs( Mr ) ) / ( 1 + eccen ) ) / ( pi * pi - 6 )
+        d = 3 * ( 1 - eccen ) + alpha * eccen
+        q = 2 * alpha * d * ( 1 - eccen ) - Mr * Mr
+        r = 3 * alpha * d * ( d - 1 + eccen ) * Mr + Mr * Mr * Mr
+        w = numpy.power( numpy.abs( r ) + numpy.sqrt( q * q * q + r * r ), 2.0 / 3.0 )
+        return Mw + ( 2 * r * w / ( w * w + w * q + q * q ) + Mr ) / d
+
     def dEdM( self, xdata, params, cosE ) :
         """
         Return derivatives of E (eccentric anomaly) to mean anomaly
@@ -353,24 +470,48 @@ class Kepplers2ndLaw( object ):
             true anomaly
 
         """
-        E = self.eccentricAnomaly( xdata, params )
+        ( r, v, E, sinE, cosE ) = self.orbit( xdata, params )
+
+        setatt( self, "sinE", sinE )
+        setatt( self, "cosE", cosE )
+        setatt( self, "eccAnomaly", E )
+        ## return radius and true anomaly
+        return ( r, v )
+
+    def orbit( self, xdata, params ) :
+        """
+        Return the radius, the true anomaly and the eccentric anomaly with its sine
+        and cosine.
+
+        Contrary to radiusAndTrueAnomaly, nothing is stored in this object.
+
+        Parameters
+        ----------
+        xdata : array_like
+            times in the orbit
+        params : array_like
+            parameters: eccentr, semimajor, period, ppass
+
+        Returns
+        -------
+        ( r, v, E, sinE, cosE ) : tuple of arrays
+            radius, true anomaly, eccentric anomaly, sin( E ), cos( E )
+
+        """
+        ( E, sinE, cosE, iter ) = self.solveKepler( xdata, params )
 
         eccen = params[0]
         semimaj = params[1]
 
         ## r = radius
-        cosE = self.cosE
         r = semimaj * ( 1 - eccen * cosE )
 
         ## v = true anomaly
-        #print( "eccen   ", eccen )
         ef = math.sqrt( ( 1 + eccen ) / ( 1 - eccen ) )
 
-        v = 2 * numpy.arctan2( ef * self.sinE, 1 + cosE )
+        v = 2 * numpy.arctan2( ef * sinE, 1 + cosE )
 
-        setatt( self, "eccAnomaly", E )
-        ## return radius and true anomaly
-        return ( r, v )
+        return ( r, v, E, sinE, cosE )
 
     def drvdE( self, xdata, params, cosE, sinE ) :
         """
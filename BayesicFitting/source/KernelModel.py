@@ -140,6 +140,23 @@ class KernelModel( NonLinearModel ):
         x = ( xdata - params[1] ) / params[2]
         return params[0] * self.kernel.result( x )
 
+    def baseResultBatch( self, xdata, params2d ):
+        """
+        Returns the results of the model function for a batch of parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params2d : 2d array_like
+            values for the parameters, one set per row.
+
+        """
+        x = ( xdata - params2d[:,1:2] ) / params2d[:,2:3]
+        ## some kernels only handle 1-d input
+        kx = self.kernel.result( x.ravel() ).reshape( x.shape )
+        return params2d[:,0:1] * kx
+
     def basePartial( self, xdata, params, parlist=None ):
         """
         Returns the partials at the xdata value.
@@ -166,14 +166,23 @@ class LaplaceErrorDistribution( ScaledErrorDistribution ):
         sumres = self.getSumRes( problem, allpars, scale=scale )
         if isinstance( scale, float ) :
             norm = problem.sumweight * ( self.LOG2 + math.log( scale ) ) 
-        elif problem.hasWeights() :
-            norm = numpy.sum( problem.weights * ( self.LOG2 + numpy.log( scale ) ) )
         else :
-            norm = numpy.sum( self.LOG2 + numpy.log( scale ) )
+            ## scale is the accuracy of the problem
+            norm = self.dataTerm( problem, "laplaceNorm", self.logNorm )
 
         return -( norm + sumres )
 
 
+    def logNorm( self, problem, arg=None ) :
+        """
+        Return the log of the (weighted) normalization, using the accuracy as scale.
+        It is kept in the datacache of the problem.
+        """
+        norm = self.LOG2 + numpy.log( problem.accuracy )
+        if problem.hasWeights() :
+            norm = problem.weights * norm
+        return numpy.sum( norm )
+
     def logLdata( self, problem, allpars, mockdata=None ) :
         """
         Return the log( likelihood ) for each residual
@@ -95,10 +95,14 @@ class LevenbergMarquardtFitter( IterativeFitter ):
         the model to be fitted
     lamda : float
         to balance the curvature matrix (see Numerical Recipes)
+    varpro : bool
+        use variable projection for mixed models. See Model.isMixed().
+        The linear parameters are solved exactly in each step; the iterations
+        only search the non-linear parameters.
 
     """
     #  *************************************************************************
-    def __init__( self, xdata, model, **kwargs ):
+    def __init__( self, xdata, model, varpro=False, **kwargs ):
         """
         Create a class, providing xdata and model.
 
@@ -108,6 +112,8 @@ class LevenbergMarquardtFitter( IterativeFitter ):
             vector of independent input values
         model : Model
             a model function to be fitted
+        varpro : bool
+            use variable projection for the linear parameters of a mixed model.
 
         kwargs : dict
             Possibly includes keywords from
@@ -122,6 +128,7 @@ class LevenbergMarquardtFitter( IterativeFitter ):
         self.lamda = 0.001
         self.converged = False
         self.first = True
+        self.varpro = varpro
 
     #  *************************************************************************
     def fit( self, data, weights=None, par0=None, keep=None, limits=None,
@@ -186,6 +193,10 @@ class LevenbergMarquardtFitter( IterativeFitter ):
 #        if fitIndex is not None and len( fitIndex ) < len( par0 ) :
 #            par0 = par0[fitIndex]
 
+        linIndex = self.projectIndex( fitIndex )
+        if linIndex is not None :
+            trypar = self.solveLinear( trypar, linIndex, data, fitWgts )
+
         self.chi = self.chiSquaredExtra( data, trypar, weights=fitWgts ) + 1
 
         self.lamda = 0.001
@@ -196,8 +207,12 @@ class LevenbergMarquardtFitter( IterativeFitter ):
 
         while self.iter < maxiter :
 
-            trypar, trychi = self.trialfit( trypar, fitIndex, data, fitWgts, verbose, 
-                                            maxiter )
+            if linIndex is None :
+                trypar, trychi = self.trialfit( trypar, fitIndex, data, fitWgts, verbose, 
+                                                maxiter )
+            else :
+                trypar, trychi = self.projectedTrialfit( trypar, fitIndex, linIndex, 
+                                                data, fitWgts, verbose, maxiter )
             self.model.parameters = trypar
 
             tol = tolerance if self.chi < 1 else tolerance * self.chi
@@ -290,6 +305,130 @@ class LevenbergMarquardtFitter( IterativeFitter ):
         raise ConvergenceError( "LevenbergMarquardtFitter. Too many iterations: ", self.iter )
 
 
+    #  *************************************************************************
+    def projectIndex( self, fitIndex ):
+        """
+        Return the indices of the fitted parameters that are solved by projection.
+
+        Returns None when variable projection is not requested or not applicable.
+
+        Parameters
+        ----------
+        fitIndex : array of int
+            indices of the parameters to be fitted
+        """
+        if not self.varpro or hasattr( self, "normdfdp" ) :
+            return None
+
+        lindex = self.model.getLinearIndex()
+        if lindex is None :
+            return None
+
+        lindex = numpy.intersect1d( fitIndex, lindex )
+        return lindex if len( lindex ) > 0 else None
+
+    def solveLinear( self, params, lindex, data, weights ):
+        """
+        Return the parameters with the linear ones replaced by their least squares solution.
+
+        The other parameters are kept as they are.
+
+        Parameters
+        ----------
+        params : array_like
+            parameters of the model
+        lindex : array of int
+            indices of the linear parameters
+        data : array_like
+            the data vector to be fitted
+        weights : float or array_like
+            weights pertaining to the data
+        """
+        params = numpy.array( params, dtype=float )
+        params[lindex] = 0.0
+
+        design = self.getDesign( params=params, index=lindex )
+        residu = data - self.model.result( self.xdata, params )
+
+        wdesign = design.transpose() * weights
+        params[lindex] = numpy.linalg.solve( numpy.inner( wdesign, design.transpose() ),
+                                             numpy.inner( wdesign, residu ) )
+        return params
+
+    def projectedTrialfit( self, params, fi, lindex, data, weights, verbose, maxiter ):
+        """
+        Return a successful Levenberg-Marquardt step in the non-linear parameters only.
+
+        The linear parameters are eliminated from the hessian (Schur complement).
+        After each step they are solved exactly by solveLinear.
+
+        Parameters
+        ----------
+        params : array_like
+            parameters of the model, with the linear ones solved.
+        fi : array of int
+            indices of the parameters to be fitted
+        lindex : array of int
+            indices of the linear parameters within fi
+        data : array_like
+            the data vector to be fitted
+        weights : float or array_like
+            weights pertaining to the data
+        verbose : int
+            verbosity
+        maxiter : int
+            maximum number of iterations
+        """
+        kl = numpy.isin( fi, lindex )
+        nindex = fi[~kl]
+
+        if len( nindex ) == 0 :
+            self.ntrans += 1
+            self.iter += 1
+            trychi = self.chiSquared( data, params, weights=weights )
+            return ( params, trychi )
+
+        hessian = self.getHessian( params=params, weights=weights, index=fi )
+        hll = hessian[numpy.ix_( kl, kl )]
+        hln = hessian[numpy.ix_( kl, ~kl )]
+        hessian = hessian[numpy.ix_( ~kl, ~kl )] - numpy.inner( hln.transpose(), 
+                        numpy.linalg.solve( hll, hln ).transpose() )
+
+        residu = ( data - self.model.result( self.xdata, params ) ) * weights
+        vector = self.getVector( residu, index=nindex )
+
+        nfit = len( nindex )
+        fitpar = params[nindex]
+
+        while self.iter < maxiter :
+
+            for k in range( nfit ) :
+                hessian[k,k] *= ( 1 + self.lamda )
+
+            newpar = fitpar + 0.5 * numpy.linalg.solve( hessian, vector )
+
+            trypar = params.copy()
+            trypar[nindex] = newpar
+            trypar = self.solveLinear( trypar, lindex, data, weights )
+
+            trychi = self.chiSquared( data, trypar, weights=weights )
+
+            self.ntrans += 1
+            self.iter += 1
+
+            self.report( verbose, data, trypar, trychi, more=math.log10( self.lamda ),
+                         force=(verbose >= 3) )
+
+            if trychi <= self.chi:
+                return ( trypar, trychi )          #  succesfull step
+
+            if self.lamda < 1e20 :
+                self.lamda *= 10
+            self.fitpar = trypar                   #  keep to report back
+
+        raise ConvergenceError( "LevenbergMarquardtFitter. Too many iterations: ", self.iter )
+
+
     ### TBD to __getattr__  ???
     def getParameters( self ):
         """
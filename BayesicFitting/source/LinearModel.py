@@ -110,3 +110,25 @@ class LinearModel( Model ):
             res += params[k] * part[:,k]
 
         return res
+
+    def baseLinearIndex( self ):
+        """ Returns the indices of the linear parameters: all of them.  """
+        return list( range( self.npbase ) )
+
+    def baseResultBatch( self, xdata, params2d ):
+        """
+        Returns the base results of linear models for a batch of parameter sets.
+
+        The partials do not depend on the parameters; they are calculated once
+        and multiplied with all parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params2d : 2d array_like
+            values for the parameters, one set per row.
+
+        """
+        part = self.basePartial( xdata, params2d[0] )
+        return numpy.inner( params2d, part )
@@ -153,7 +153,8 @@ class LoopEngine( OrderEngine ):
 
         ptry = numpy.roll( ptry, -ks )
 
-        Ltry = self.errdis.logLikelihood( problem, ptry )
+        legs = self.reversedLegs( problem, -ks, t )
+        Ltry = self.trialLogL( walker, ptry, legs, legs, lowLhood )
 
         if self.verbose > 4 :
             print( "Loop     ", ks, t, fmt( lowLhood ), fmt( Ltry ) )
@@ -165,6 +165,7 @@ class Model( FixedModel ):
 
         setatt( self, "_next", None )
         setatt( self, "_head", self )
+        setatt( self, "_plan", None )
 
         if params is None :
             params = numpy.zeros( nparams, dtype=float )
@@ -301,6 +302,7 @@ class Model( FixedModel ):
                 mdl = last.copy()               #  copy
                 setatt( last, "_next", next )   #  restore
                 setatt( last, "_head", head )
+                setatt( last, "_plan", None )
                 setatt( mdl, "_operation", self.NOP )
 
                 n2 = np + last.npbase
@@ -427,13 +429,17 @@ class Model( FixedModel ):
             model = Brackets( model )     # provide brackets if model is a chain
 
         last = self
+        setatt( last, "_plan", None )
         while last._next is not None:
             last = last._next
+            setatt( last, "_plan", None )
         setatt( last, "_next",  model )
         setatt( model, "_operation", operation )
         while last._next is not None:
             last = last._next
             setatt( last, "_head", self._head )
+            setatt( last, "_plan", None )
+        setatt( self._head, "_plan", None )
 
         setatt( self, "_npchain", len( self.parameters ) + len( model.parameters ) )
 
@@ -495,7 +501,50 @@ class Model( FixedModel ):
 
         res = None
         xdata = Tools.toArray( xdata )
-        return self._recursiveResult( xdata, param, res )
+
+        plan = self.chainPlan()
+        if plan is None :
+            return self._recursiveResult( xdata, param, res )
+
+        owned = False                       ## whether res can be overwritten
+        at = 0
+        for link in plan :
+            np = link.npbase
+            nextres = super( Model, link ).result( xdata, param[at:at+np] )
+            at += np
+            if res is None :
+                res = nextres
+            elif owned and res.shape == numpy.shape( nextres ) :
+                link.operate( res, None, nextres, out=res )
+            else :
+                res = link.operate( res, None, nextres )
+                owned = isinstance( res, numpy.ndarray ) and res.dtype == float
+        return res
+
+    def chainPlan( self ) :
+        """
+        Return the models in the chain (from this one onward) as a flat tuple.
+
+        The tuple is made on first use and kept until a model is appended
+        to the chain. It is the plan for the evaluation of result, partial and
+        derivative in a simple loop.
+        None is returned when the chain contains a pipe or a model with more
+        than one output; those chains are evaluated recursively.
+        """
+        plan = getattr( self, "_plan", None )
+        if plan is None :
+            plan = []
+            last = self
+            while last is not None :
+                if ( last is not self and last._operation == self.PIP ) or last.ndout != 1 :
+                    plan = []
+                    break
+                plan += [last]
+                last = last._next
+            plan = tuple( plan )
+            setatt( self, "_plan", plan )
+
+        return plan if len( plan ) > 0 else None
 
     def _recursiveResult( self, xdata, param, res ) :
 
@@ -513,7 +562,50 @@ class Model( FixedModel ):
         res = model._recursiveResult( xdata, param[np:], res )
         return res
 
-    def operate( self, res, pars, next ):
+    def resultBatch( self, xdata, params2d ):
+        """
+        Return the results of the model for a batch of parameter sets.
+
+        Each model in the chain evaluates all sets at once when it has a
+        vectorized baseResultBatch; otherwise it loops over them.
+        Chains containing a pipe are evaluated set by set.
+
+        Parameters
+        ----------
+        xdata : array_like
+            input data
+        params2d : 2d array_like
+            parameters for the model, one set per row.
+
+        Returns
+        -------
+        array of shape ( nbatch, ndata ) ( or ( nbatch, ndata, ndout ) )
+
+        """
+        xdata = Tools.toArray( xdata )
+        params2d = numpy.array( params2d, dtype=float, ndmin=2 )
+
+        last = self._next
+        while last is not None :
+            if last._operation == self.PIP :
+                return numpy.asarray( [self.result( xdata, p ) for p in params2d] )
+            last = last._next
+
+        return self._recursiveResultBatch( xdata, params2d, None )
+
+    def _recursiveResultBatch( self, xdata, params2d, res ) :
+
+        np = self.npbase
+
+        nextres = super( Model, self ).resultBatch( xdata, params2d[:,:np] )
+        res = self.operate( res, None, nextres )
+        model = self._next
+        if model is None :
+            return res
+
+        return model._recursiveResultBatch( xdata, params2d[:,np:], res )
+
+    def operate( self, res, pars, next, out=None ):
         """
         Apply the operation present in self.
 
@@ -525,17 +617,19 @@ class Model( FixedModel ):
             parameters for the next result (in case of pipe)
         next :
             result of next model in chain.
+        out : None or array
+            array to put the result in (not for pipes)
         """
         if res is None or self._operation == self.NOP: # first one
             res = next
         elif self._operation == self.ADD:                 # NOP & ADD
-            res = numpy.add( res, next )
+            res = numpy.add( res, next, out=out )
         elif self._operation == self.SUB:
-            res = numpy.subtract( res, next )
+            res = numpy.subtract( res, next, out=out )
         elif self._operation == self.MUL:
-            res = numpy.multiply( res, next )
+            res = numpy.multiply( res, next, out=out )
         elif self._operation == self.DIV:
-            res = numpy.divide( res, next )
+            res = numpy.divide( res, next, out=out )
         elif self._operation == self.PIP:
             res = super( Model, self ).result( res, pars )
 
@@ -559,8 +653,40 @@ class Model( FixedModel ):
         result = None
         xdata = Tools.toArray( xdata )
 
-        df = self._recursiveDerivative( xdata, param, result, 0,
-                    useNum=useNum )
+        plan = self.chainPlan()
+        if plan is None :
+            return self._recursiveDerivative( xdata, param, result, 0, useNum=useNum )
+
+        df = 0
+        at = 0
+        for k, link in enumerate( plan ) :
+            np = link.npbase
+            par = param[at:at+np]
+            at += np
+            operation = link._operation if k > 0 else self.NOP
+
+            nextdf = ( super( Model, link ).numDerivative( xdata, par ) if useNum else
+                       super( Model, link ).derivative( xdata, par ) )
+
+            nextres = None
+            if operation == self.NOP :
+                df = nextdf
+            elif operation == self.ADD :
+                df = df + nextdf
+            elif operation == self.SUB :
+                df = df - nextdf
+            elif operation == self.MUL :
+                nextres = super( Model, link ).result( xdata, par )
+                df = df * nextres + nextdf * result
+            elif operation == self.DIV :
+                nextres = super( Model, link ).result( xdata, par )
+                df = ( df * nextres - nextdf * result ) / ( nextres * nextres )
+
+            if k < len( plan ) - 1 :
+                if nextres is None :
+                    nextres = super( Model, link ).result( xdata, par )
+                result = link.operate( result, par, nextres )
+
         return df
 
     def _recursiveDerivative( self, xdata, param, result, df, useNum=False ):
@@ -633,10 +759,79 @@ class Model( FixedModel ):
         result = None
         partial = None
         xdata = Tools.toArray( xdata )
-        partial = self._recursivePartial( xdata, param, 0, result,
-                            partial, useNum=useNum )
+
+        plan = self.chainPlan()
+        if plan is None or len( plan ) == 1 :
+            return self._recursivePartial( xdata, param, 0, result, partial, useNum=useNum )
+
+        ## the partials of all models are written into one array
+        nps = [link.npbase for link in plan]
+        at = 0
+        for k, link in enumerate( plan ) :
+            np = nps[k]
+            par = param[at:at+np]
+            operation = link._operation if k > 0 else self.NOP
+
+            nextpartial = ( super( Model, link ).numPartial( xdata, par ) if useNum else
+                            super( Model, link ).partial( xdata, par ) )
+            if partial is None :
+                partial = numpy.empty( ( len( nextpartial ), sum( nps ) ), dtype=float )
+            cols = partial[:,at:at+np].transpose()
+            prev = partial[:,:at].transpose()
+
+            nextres = None
+            if operation == self.SUB :
+                numpy.negative( nextpartial.transpose(), out=cols )
+            elif operation == self.MUL :
+                nextres = super( Model, link ).result( xdata, par )
+                numpy.multiply( prev, nextres, out=prev )
+                numpy.multiply( nextpartial.transpose(), result, out=cols )
+            elif operation == self.DIV :
+                nextres = super( Model, link ).result( xdata, par )
+                numpy.divide( prev, nextres, out=prev )
+                invres = - result / ( nextres * nextres )
+                numpy.multiply( nextpartial.transpose(), invres, out=cols )
+            else :
+                cols[...] = nextpartial.transpose()
+
+            at += np
+            if k < len( plan ) - 1 :
+                if nextres is None :
+                    nextres = super( Model, link ).result( xdata, par )
+                result = link.operate( result, par, nextres )
+
         return partial
 
+    def bandedPartial( self, xdata, param ):
+        """
+        Return the partials as a band, or None if the model does not provide one.
+
+        In splines models at each xdata only a few contiguous parameters have
+        nonzero partials. The band contains those partials, together with the
+        index of the first parameter in the band, for each xdata.
+        For a (ndata,npars) design the band takes (ndata,nband) numbers only.
+
+        Only a single model without fixed parameters can provide a band.
+
+        Parameters
+        ----------
+        xdata : array_like
+            an input vector
+        param : array_like
+            parameters for the model
+
+        Returns
+        -------
+        band : 2-d array or None
+            nonzero partials, shape ( ndata, nband )
+        first : int array
+            index of the parameter in band[:,0]
+
+        """
+        if self._next is not None or self.fixed is not None :
+            return None
+        return self.baseBandedPartial( Tools.toArray( xdata ), param )
+
     def _recursivePartial( self, xdata, param, at, result, partial, useNum=False ):
         """
         Workhorse for partial.
@@ -1330,14 +1525,42 @@ class Model( FixedModel ):
                 k = 0
 
 
-    #  *****SOME DUMMY METHODS TO ALLOW LINEAR MODELS IN NONLIN FITTERS********
+    #  *****LINEAR AND NON-LINEAR PARAMETERS IN THE CHAIN*********************
     def isMixed( self ):
-        """ Return false.  """
-        return False
+        """ Return True when the model has both linear and non-linear parameters.  """
+        lindex = self.getLinearIndex()
+        return lindex is not None and len( lindex ) < self.npchain
 
     def getLinearIndex( self ):
-        """ Return null.  """
-        return None
+        """
+        Return the indices of the parameters that enter the model linearly.
+
+        These are the linear parameters of the models in the chain that are
+        added to (or subtracted from) the chain after its last multiplication
+        or division. The linear parameters of the last multiplying model are
+        included too.
+
+        Returns None when there are no linear parameters or when the chain
+        contains a pipe.
+        """
+        plan = self.chainPlan()
+        if plan is None :
+            return None
+
+        lindex = []
+        at = 0
+        for link in plan :
+            if link is not self and link._operation in [self.MUL, self.DIV] :
+                lindex = []
+            if link is self or link._operation != self.DIV :
+                lindex += [at + k for k in link.baseLinearIndex()]
+            at += link.npbase
+
+        return numpy.asarray( lindex, dtype=int ) if len( lindex ) > 0 else None
+
+    def baseLinearIndex( self ):
+        """ Return the indices of the linear parameters of this model itself: none.  """
+        return []
 
     #  ***** PYTHON INTERFACES ****************************************************
     def __getitem__( self, i ):
@@ -1791,6 +2014,20 @@ class Brackets( Model ):
         """
         return self.model.result( xdata, param )
 
+    def baseResultBatch( self, xdata, params2d ):
+        """
+        Returns the results calculated at the xdatas for a batch of parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params2d : 2d array_like
+            values for the parameters, one set per row.
+
+        """
+        return self.model.resultBatch( xdata, params2d )
+
     #  *****Brackets PARTIAL*************************************************************
     def basePartial( self, xdata, param, parlist=None ):
         """
@@ -101,7 +101,10 @@ class MoveEngine( OrderEngine ):
                 ptry = numpy.append( ptry, param[src:kln] )
                 ptry = numpy.append( ptry, param[des:src] )
 
-            Ltry = self.errdis.logLikelihood( problem, ptry )
+            ## ptry starts at kln; the moved stretch starts at L1
+            L1 = ( des - kln ) % problem.npars
+            Ltry = self.trialLogL( walker, ptry, [src - 1, kln - 1, des - 1],
+                                   [L1 - 1, L1 + t - 1, -1], lowLhood )
 
             if self.verbose > 4 :
                 print( "Order    ", src, kln, t, des, fmt( lowLhood ), fmt( Ltry ) )
@@ -64,13 +64,6 @@ class NearEngine( OrderEngine ):
         """
         super( ).__init__( walkers, errdis, copy=copy, **kwargs )
 
-#        if copy is None :
-#            ## initialize nearest at -1
-#            self.nearest = numpy.zeros_like( walkers[0].problem.parameters ) - 1
-#        else :
-#            self.nearest = copy.nearest
-
-
 
     def copy( self ):
         """ Return copy of this.  """
@@ -84,7 +77,7 @@ class NearEngine( OrderEngine ):
         """
         Execute the NearEngine one time.
 
-        TBC: This engine seems to take a lot of CPU.
+        The nearest neighbour is taken from the neighbour index in the problem.
 
         Parameters
         ----------
@@ -101,36 +94,15 @@ class NearEngine( OrderEngine ):
         np = problem.npars
         param = walker.allpars
 
-        if not hasattr( self, "nearest" ) :
-            self.nearest = numpy.zeros_like( param ) - 1
-
-
         ks = self.rng.randint( np )
         ptry = numpy.roll( param, ks )
 
-        xd = problem.xdata
         # k* are indices in the ptry list
         # n* are indices in the xdata list (eg. nearest)
 
         n0 = ptry[0]
-        nsel = [n0,ptry[1]]
-        if self.nearest[n0] < 0 :                                   # not yet calculated
-            dmin = problem.distance( xd[nsel,:], [0,1] )[0]         # need only one distance
-#            print( 0, fmt( nsel ), fmt( dmin ), fmt( dmin ) )
-        
-            kmin = 1
-            for k in range( 2, np ) :                               # find nearest
-                nsel[1] = ptry[k]
-                d = problem.distance( xd[nsel,:], [0,1] )[0]
-#                print( k, fmt( nsel ), fmt( d ), fmt( dmin ) )
-                if d < dmin :
-                    dmin = d
-                    kmin = k
-            self.nearest[n0] = ptry[kmin]                           # store for later use
-
-        else :                                                      # it is stored
-            np = self.nearest[n0]                                   # get the nearest
-            kmin = numpy.where( ptry == np )[0][0]                  # find where NN is in ptry
+        nn = problem.nearestNodes( n0 )[0]                          # get the nearest
+        kmin = numpy.where( ptry == nn )[0][0]                      # find where NN is in ptry
 
         if kmin == 1 :                                              # it is already the NN 
             self.reportFailed()
@@ -143,13 +115,13 @@ class NearEngine( OrderEngine ):
 
         ptry = numpy.roll( ptry, -ks )
 
-        Ltry = self.errdis.logLikelihood( problem, ptry )
+        Ltry = self.trialLogL( walker, ptry, numpy.asarray( [kmin - 1, kmin, -1] ) - ks,
+                               numpy.asarray( [kmin - 1, -2, -1] ) - ks, lowLhood )
 
         if self.verbose > 4 :
             print( "Near     ", ks, n0, kmin, fmt( lowLhood ), fmt( Ltry ) )
             print( fmt( param, max=None, format='%3d' ) )
             print( fmt( ptry, max=None, format='%3d' ) )
-            print( fmt( self.nearest, max=None, format='%3d' ) )
 
         if Ltry >= lowLhood:
             self.reportSuccess( )
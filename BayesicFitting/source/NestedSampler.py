@@ -18,6 +18,7 @@ from .ErrorsInXandYProblem import ErrorsInXandYProblem
 from .MultipleOutputProblem import MultipleOutputProblem
 from .EvidenceProblem import EvidenceProblem
 from .PhantomCollection import PhantomCollection
+from .Checkpoint import Checkpoint
 
 from .ErrorDistribution import ErrorDistribution
 from .ScaledErrorDistribution import ScaledErrorDistribution
@@ -196,6 +197,10 @@ class NestedSampler( object ):
         maximum size of the resulting sample list (None : no limit)
     threads : bool ( False)
         Use threads (only when discard > 1)
+    processes : None or int
+        Use a pool of processes (only when discard > 1)
+    marginalize : bool (False)
+        Marginalise the likelihood over the linear parameters of the model.
     verbose : int
         level of blabbering
     repiter : int (100)
@@ -214,8 +219,8 @@ class NestedSampler( object ):
         Samples resulting from the exploration
     initialEngine : Engine
         Engine that distributes the walkers over the available space
-    restart : StopStart (TBW)
-        write intermediate results to (optionally) start from.
+    restart : None or Checkpoint
+        write intermediate results to (optionally) resume from.
 
     Author       Do Kester.
 
@@ -233,7 +238,8 @@ class NestedSampler( object ):
                 accuracy=None, problem=None, distribution=None, limits=None, 
                 keep=None, ensemble=ENSEMBLE, discard=1, seed=80409, rate=RATE,
                 bestBoost=False, usePhantoms=True, 
-                engines=None, maxsize=None, threads=False, verbose=1 ) :
+                engines=None, maxsize=None, threads=False, processes=None, 
+                marginalize=False, verbose=1 ) :
         """
         Create a new class, providing inputs and model.
 
@@ -316,6 +322,15 @@ class NestedSampler( object ):
             maximum size of the resulting sample list (None : no limit)
         threads : bool (False)
             Use Threads to distribute the diffusion of discarded samples over the available cores.
+        processes : None or int
+            Number of processes to distribute the diffusion of discarded samples over.
+            The processes are not hindered by the GIL. None or < 2 : no processes.
+        marginalize : bool (False)
+            Only explore the non-linear parameters of the model. The likelihood is
+            integrated analytically over the linear ones (see Model.getLinearIndex()).
+            The posterior samples of the linear parameters are drawn from their 
+            conditional posterior, given the others. 
+            Only for a ClassicProblem with a GaussErrorDistribution.
         verbose : int (1)
             0   silent
             1   basic information
@@ -353,7 +368,7 @@ class NestedSampler( object ):
         self.maxsize = maxsize
         object.__setattr__( self, "verbose", verbose )
         self.rate = rate
-        self.restart = None                     ## TBD
+        self.restart = None
 
         self.usePhantoms = usePhantoms
         self.avoid = 0.1 if usePhantoms else 0.0
@@ -366,6 +381,8 @@ class NestedSampler( object ):
         self.end = self.END
         self.maxtrials = 5
         self.threads = threads
+        self.processes = processes
+        self.marginalize = marginalize
 
         self.iteration = 0
 
@@ -399,7 +416,8 @@ class NestedSampler( object ):
 ###################################################################
     
     #  *******SAMPLE************************************************************
-    def sample( self, keep=None, plot=False, **kwargs ):
+    def sample( self, keep=None, plot=False, checkpoint=None, resume=None, sink=None,
+                **kwargs ):
         """
         Sample the posterior and return the 10log( evidence )
 
@@ -419,92 +437,106 @@ class NestedSampler( object ):
             "all"  	show iterations and final result
             "last" 	show final result
             "test"      plot iterations but dont show (for testing)
+        checkpoint : None or str or Checkpoint
+            None    no checkpoints
+            str     name of a file to write a checkpoint into every 1000 iterations
+            Checkpoint  write checkpoints as defined therein
+        resume : None or str
+            name of a checkpoint file to resume the run from.
+            The sampler needs to be constructed as the one that wrote the checkpoint.
+        sink : None or str or SampleSink
+            stream the posterior samples into this sink (or directory), instead of
+            keeping them in memory. See SampleList.openSink().
+            It can not be combined with resume.
         kwargs : dict
             to be fed to the plot
 
         """
-        keep = self.initSample( keep=keep )
+        ## the marginalisation is set in the distribution for this run only
+        marginal = self.marginalize and isinstance( self.distribution, GaussErrorDistribution )
+        linear = self.distribution.linear if marginal else None
 
-        if ( self.problem.hasAccuracy and self.walkers[0].fitIndex[-1] < 0 and 
-                not isinstance( self.distribution, GaussErrorDistribution ) ) :
-            raise AttributeError( "%s cannot be combined with accuracies and variable scale" %
-                                    self.distribution ) 
+        try :
+            self.restart = ( Checkpoint( checkpoint ) if isinstance( checkpoint, str )
+                             else checkpoint )
 
-        self.setPlotters( plot )
+            if sink is not None :
+                if resume is not None :
+                    raise ValueError( "A sink can not be combined with resume" )
+                self.samples.openSink( sink )
 
-        self.logUnitDomain = 0
-        if self.usePhantoms :
-            self.copyWalker = self.copyWalkerFromPhantoms
+            if resume is None :
+                keep = self.initSample( keep=keep )
+            else :
+                keep = self.initResume( resume, keep=keep )
 
-        tail = self.initReport( keep=keep )
+            if ( self.problem.hasAccuracy and self.walkers[0].fitIndex[-1] < 0 and 
+                    not isinstance( self.distribution, GaussErrorDistribution ) ) :
+                raise AttributeError( "%s cannot be combined with accuracies and variable scale" %
+                                        self.distribution ) 
 
-        explorer = Explorer( self, threads=self.threads )
+            self.setPlotters( plot )
 
-        ## move all walkers around for initial exploration of the complete space.
-        if not isinstance( self.problem.model, LinearModel ) or self.usePhantoms :
-#            print( "BURNIN PHASE STARTS =================================" )
-            self.lowLhood = -sys.float_info.max
-            # Explore all walker(s)
-            explorer.explore( range( self.ensemble ), self.lowLhood, self.iteration )
-            self.iteration = 0                  # reset iteration number
-#            print( "BURNIN PHASE ENDS ===================================" )
+            if self.usePhantoms :
+                self.copyWalker = self.copyWalkerFromPhantoms
 
+            tail = self.initReport( keep=keep )
 
-        self.walkers.sort( key=self.walkerLogL )    # sort the walker list on logL
+            explorer = Explorer( self, threads=self.threads, processes=self.processes )
 
-        self.logZ = -sys.float_info.max
-        self.logdZ = 0
-        self.info = 0
-        self.logWidth = math.log( 1.0 - math.exp( -1.0 / self.livepointcount ) )
-
-#        TBD put self.logWidth in the saved file too
-#        if self.optionalRestart() :
-#            self.logWidth -= self.iteration * ( 1.0 * self.discard ) / self.ensemble
+            if resume is None :
+                self.initExplore( explorer )
 
-        self.histinsert = []        ### TBC   what is this
-        self.sumWidth = 0.0
+            ## iterate until done
+            while self.nextIteration() :
 
-        ## iterate until done
-        while self.nextIteration() :
+                worst = self.worst                      # the worst are low in the sorted ensemble
+                self.lowLhood = self.walkers[worst-1].logL
 
-            worst = self.worst                      # the worst are low in the sorted ensemble
-            self.lowLhood = self.walkers[worst-1].logL
+                self.updateEvidence( worst )            # Update Z and H and store posterior samples
 
-            self.updateEvidence( worst )            # Update Z and H and store posterior samples
+                self.iterReport( worst - 1, tail )      # some output when needed
 
-            self.iterReport( worst - 1, tail )      # some output when needed
+                self.samples.weed( self.maxsize )       # remove overflow in samplelist
 
-            self.samples.weed( self.maxsize )       # remove overflow in samplelist
+                self.iteration += 1
 
-            self.iteration += 1
+                self.updateWalkers( explorer, worst )
 
-            self.updateWalkers( explorer, worst )
+                newL = self.walkers[worst-1].logL
 
-            newL = self.walkers[worst-1].logL
-            self.histinsert += [self.walkers.firstIndex( newL )]
+                self.walkers.sortOnLogL( worst )        # only the worst are out of order
 
-            self.optionalSave( )
+                self.histinsert += [self.walkers.firstIndex( newL )]
 
-            self.walkers.sort( key=self.walkerLogL )    # sort the walker list on logL
+                self.optionalSave( )
 
+            explorer.close()                            # stop the processes (if any)
 
+            # End of Sampling: Update and store the remaining walkers
+            self.updateEvidence( self.ensemble )        # Update Evidence Z and Information H
 
-        # End of Sampling: Update and store the remaining walkers
-        self.updateEvidence( self.ensemble )        # Update Evidence Z and Information H
+            self.samples.flush()                        # write samples into the sink (if any)
 
-        # Calculate weighted average and stdevs for the parameters;
-        self.samples.LogZ = self.logZ
-        self.samples.info = self.info
-        self.samples.normalize( )
+            # Calculate weighted average and stdevs for the parameters;
+            self.samples.LogZ = self.logZ
+            self.samples.info = self.info
+            self.samples.normalize( )
+            if self.samples.streaming :
+                self.samples.sink.putValues( logZ=self.logZ, info=self.info,
+                                             iteration=self.iteration, normalized=True )
 
-        # put the info into the model
-        if self.problem.model and not self.problem.isDynamic() :
-            self.problem.model.parameters = self.samples.parameters
-            self.problem.model.stdevs = self.samples.stdevs
+            # put the info into the model
+            if self.problem.model and not self.problem.isDynamic() :
+                self.problem.model.parameters = self.samples.parameters
+                self.problem.model.stdevs = self.samples.stdevs
 
-        self.lastReport( -1, **kwargs )
+            self.lastReport( -1, **kwargs )
 
-        return self.evidence
+            return self.evidence
+        finally :
+            if marginal :
+                self.distribution.linear = linear
 
     def initSample( self, ensemble=None, keep=None ) :
         """
@@ -524,6 +556,10 @@ class NestedSampler( object ):
             keep = self.keep
         fitIndex, allpars = self.makeFitlist( keep=keep )
 
+        if self.marginalize :
+            lindex = self.initMarginal( keep=keep )
+            fitIndex = [k for k in fitIndex if k not in lindex]
+
         if ensemble is None :
             ensemble = self.ensemble
         self.initWalkers( ensemble, allpars, fitIndex )
@@ -538,6 +574,113 @@ class NestedSampler( object ):
 
         return keep
 
+    def initResume( self, resume, keep=None ) :
+        """
+        Prolog for the sample method when resuming from a checkpoint.
+
+        Parameters
+        ----------
+        resume : str
+            name of the checkpoint file
+        keep : None or dict of {int:float}
+            Only used for reporting; the fitted parameters are taken from the checkpoint.
+        """
+        if keep is None :
+            keep = self.keep
+
+        self.optionalRestart( resume )
+
+        if self.marginalize :
+            self.initMarginal( keep=keep )
+
+        for eng in self.engines :
+            eng.walkers = self.walkers
+            eng.lastWalkerId = len( self.walkers )
+
+        return keep
+
+    def initMarginal( self, keep=None ) :
+        """
+        Set the linear parameters of the model to be marginalised in the distribution.
+
+        They are set for the duration of sample() only.
+
+        Parameters
+        ----------
+        keep : None or dict of {int:float}
+            Parameters kept fixed are not marginalised.
+
+        Returns
+        -------
+        list of indices of the parameters to be marginalised
+
+        Raises
+        ------
+        AttributeError when the problem, model or distribution is not suitable.
+        """
+        if not isinstance( self.distribution, GaussErrorDistribution ) :
+            raise AttributeError( "%s cannot be marginalised" % self.distribution )
+        if not isinstance( self.problem, ClassicProblem ) or self.problem.isDynamic() :
+            raise AttributeError( "Marginalisation only works with a static ClassicProblem" )
+
+        lindex = self.problem.model.getLinearIndex()
+        if lindex is None :
+            raise AttributeError( "The model has no linear parameters to marginalise" )
+
+        lindex = [k for k in lindex if keep is None or k not in keep]
+        self.distribution.linear = lindex
+        return lindex
+
+    def drawLinear( self, walkers ) :
+        """
+        Return new walkers with the linear parameters drawn from their conditional posterior.
+
+        See GaussErrorDistribution.drawLinear().
+
+        Parameters
+        ----------
+        walkers : list of Walker
+            the walkers to be stored as samples
+        """
+        drawn = []
+        for w in walkers :
+            allpars = self.distribution.drawLinear( w.problem, w.allpars, self.rng )
+            wd = Walker( w.id, w.problem, allpars, w.fitIndex, logL=w.logL, 
+                         parent=w.parent, start=w.start )
+            wd.logPrior = w.logPrior
+            drawn += [wd]
+        return drawn
+
+    def initExplore( self, explorer ) :
+        """
+        Explore the initial walkers and reset the evidence calculation.
+
+        Parameters
+        ----------
+        explorer : Explorer
+            to move the walkers around
+        """
+        self.logUnitDomain = 0
+
+        ## move all walkers around for initial exploration of the complete space.
+        if not isinstance( self.problem.model, LinearModel ) or self.usePhantoms :
+#            print( "BURNIN PHASE STARTS =================================" )
+            self.lowLhood = -sys.float_info.max
+            # Explore all walker(s)
+            explorer.explore( range( self.ensemble ), self.lowLhood, self.iteration )
+            self.iteration = 0                  # reset iteration number
+#            print( "BURNIN PHASE ENDS ===================================" )
+
+        self.walkers.sortOnLogL()                   # sort the walker list on logL
+
+        self.logZ = -sys.float_info.max
+        self.logdZ = 0
+        self.info = 0
+        self.logWidth = math.log( 1.0 - math.exp( -1.0 / self.livepointcount ) )
+
+        self.histinsert = []        ### TBC   what is this
+        self.sumWidth = 0.0
+
     def walkerLogL( self, w ) :
         """ 
         Return the logL of the walker (needed for sort())
@@ -623,7 +766,9 @@ class NestedSampler( object ):
             for eng in self.engines :
                 print( " ", eng, end="" )
             print( "" )
-            if self.threads :
+            if self.processes is not None and self.processes > 1 :
+                print( "Using %d processes." % self.processes )
+            elif self.threads :
                 print( "Using threads." )
 
         tail = 0
@@ -811,27 +956,26 @@ class NestedSampler( object ):
 
 
 #  ===================================================================================
-    def optionalRestart( self ):
+    def optionalRestart( self, resume ):
         """
-        Restart the session from a file. (not yet operational)
+        Restore the session from a checkpoint file.
+
+        Parameters
+        ----------
+        resume : str
+            name of the checkpoint file
         """
-        if self.restart is not None and self.restart.wantRestore( ):
-            self.walkers, self.samples = self.restart.restore( self.walkers, self.samples )
-            self.logZ = self.walkers.logZ
-            self.info = self.walkers.info
-            self.iteration = self.walkers.iteration
-            return True
-        return False
+        checkpoint = Checkpoint( resume )
+        if not checkpoint.wantRestore() :
+            raise FileNotFoundError( "Checkpoint file %s not found" % resume )
+        checkpoint.restore( self )
 
     def optionalSave( self ):
         """
-        Save the session to a file. (not yet operational)
+        Save the session to a checkpoint file, when needed.
         """
-        if self.restart is not None and self.restart.wantSave( ) and self.iteration % 100 == 0:
-            self.walkers.logZ = self.logZ
-            self.walkers.info = self.info
-            self.walkers.iteration = self.iteration
-            self.restart.save( self.walkers, self.samples )
+        if self.restart is not None and self.restart.wantSave( self.iteration ) :
+            self.restart.save( self )
 
 
     def updateEvidence( self, worst ) :
@@ -845,34 +989,59 @@ class NestedSampler( object ):
         worst : int
             Number of walkers used in the update
         """
-        for kw in range( worst ) :
-            logWeight = self.logWidth + self.walkers[kw].logL + self.walkers[kw].logPrior
+        walkers = [self.walkers[kw] for kw in range( worst )]
+        logL = numpy.asarray( [w.logL for w in walkers] )
+        logPrior = numpy.asarray( [w.logPrior for w in walkers] )
 
-            # update evidence, logZ
-            logZnew = numpy.logaddexp( self.logZ, logWeight )
+        ## the widths shrink by 1 / ensemble per walker
+#        logWidth -= 1.0 / ( self.ensemble - kw )
+        logWidth = numpy.cumsum( [self.logWidth] + [-1.0 / self.ensemble] * worst )
+        logWeight = logWidth[:-1] + logL + logPrior
 
-            # update Information, H
-            self.info = ( math.exp( logWeight - logZnew ) * self.lowLhood +
-                    math.exp( self.logZ - logZnew ) * ( self.info + self.logZ ) - logZnew )
+        self.accumulateEvidence( logWeight )
 
-            if math.isnan( self.info ) :
-                self.info = 0.0
-            self.logZ = logZnew
+        # store posterior samples
+        if self.marginalize :
+            walkers = self.drawLinear( walkers )
+        self.samples.addWalkers( walkers, logWeight )
 
-            # store posterior samples
-            smpl = self.walkers[kw].toSample( logWeight )
-            self.samples.add( smpl )
+        self.sumWidth += numpy.sum( numpy.exp( logWidth[:-1] ) )
+        self.logWidth = float( logWidth[-1] )
 
-            self.sumWidth += math.exp( self.logWidth )
-
-#            self.logWidth -= 1.0 / ( self.ensemble - kw )
-            self.logWidth -= 1.0 / self.ensemble
-
-        self.logdZ = logWeight - self.logZ
+        self.logdZ = logWeight[-1] - self.logZ
         self.logUnitDomain += self.logDomainFraction 
 
         return
 
+    def accumulateEvidence( self, logWeight ) :
+        """
+        Update the evidence (logZ) and the information (H) with a number of samples.
+
+        It is the closed form of the one-by-one recursion
+
+            logZ_new = log( exp( logZ ) + exp( logW ) )
+            H_new = exp( logW - logZ_new ) * lowLhood +
+                    exp( logZ - logZ_new ) * ( H + logZ ) - logZ_new
+
+        as exp( logZ ) * ( H + logZ ) only accumulates exp( logW ) * lowLhood.
+
+        Parameters
+        ----------
+        logWeight : array_like
+            log of the weights ( width * likelihood * prior ) of the samples
+        """
+        if len( logWeight ) == 0 :
+            return
+
+        logZ = numpy.logaddexp.accumulate( numpy.append( self.logZ, logWeight ) )
+        logZnew = logZ[-1]
+
+        info = ( math.exp( self.logZ - logZnew ) * ( self.info + self.logZ ) +
+                 numpy.sum( numpy.exp( logWeight - logZnew ) ) * self.lowLhood - logZnew )
+
+        self.info = 0.0 if math.isnan( info ) else float( info )
+        self.logZ = float( logZnew )
+
     def unitDomain( self ) :
         """
         Return the size of the remaining domain
@@ -904,17 +1073,18 @@ class NestedSampler( object ):
         """
         pst  = 0
         plen = self.phancol.length()
+        phlogL = self.phancol.logL
         logLconstraint = ( self.lowLhood * ( 1 - self.avoid ) + 
-                           self.phancol.phantoms[-1].logL * self.avoid )
+                           phlogL[-1] * self.avoid )
 
+        phantoms = self.phancol.phantoms
         for k in range( worst ) :
             while True :
                 kcp = self.rng.randint( pst, plen )
-                if self.phancol.phantoms[kcp].logL > logLconstraint :
+                if phlogL[kcp] > logLconstraint :
                     break
                 pst = kcp + 1
-            self.walkers.copy( kcp, k, wlist=self.phancol.phantoms,
-                               start=self.iteration )
+            self.walkers.copy( kcp, k, wlist=phantoms, start=self.iteration )
 
 
     def updateWalkers( self, explorer, worst ) :
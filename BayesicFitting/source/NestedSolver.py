@@ -101,8 +101,8 @@ class NestedSolver( NestedSampler ):
         Engine that move the walkers around within the given constraint: logL > lowLogL
     initialEngine : Engine
         Engine that distributes the walkers over the available space
-    restart : StopStart (TBW)
-        write intermediate results to (optionally) start from.
+    restart : None or Checkpoint
+        write intermediate results to (optionally) resume from.
 
 
     Author       Do Kester.
@@ -113,7 +113,7 @@ class NestedSolver( NestedSampler ):
     #  *********CONSTRUCTORS***************************************************
     def __init__( self, problem, distribution=None, keep=None,
                 ensemble=100, discard=1, seed=80409, rate=1.0, engines=None,
-                maxsize=None, threads=False, verbose=1 ) :
+                maxsize=None, threads=False, processes=None, verbose=1 ) :
 
         """
         Create a new class, providing inputs and model.
@@ -163,6 +163,8 @@ class NestedSolver( NestedSampler ):
             maximum size of the resulting sample list (None : no limit)
         threads : bool (False)
             Use Threads to distribute the diffusion of discarded samples over the available cores.
+        processes : None or int
+            Number of processes to distribute the diffusion of discarded samples over.
         verbose : int (1)
             0 : silent
             1 : basic information
@@ -176,7 +178,8 @@ class NestedSolver( NestedSampler ):
 
         super().__init__( problem=problem, distribution=distribution, keep=keep,
                 ensemble=ensemble, discard=discard, seed=seed, rate=rate,
-                engines=engines, maxsize=maxsize, threads=threads, verbose=verbose )
+                engines=engines, maxsize=maxsize, threads=threads, processes=processes,
+                verbose=verbose )
 
         self.setEngines( engines )
 
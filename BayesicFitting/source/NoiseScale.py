@@ -109,7 +109,7 @@ class NoiseScale( HyperParameter ):
         elif name == "stdevScale" :
             self.stdev = value
         else :
-            object.__setattr__( self, name, value )
+            super( NoiseScale, self ).__setattr__( name, value )
 
 
     def __getattr__( self, name ) :
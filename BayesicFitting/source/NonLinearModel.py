@@ -98,9 +98,9 @@ class NonLinearModel( Model ):
         else:
             setatt( self, "_linear", set( lindex ) )
 
-    def isMixed( self ):
-        """ Returns true when linear indices have been set  """
-        return len( self._linear ) > 0
+    def baseLinearIndex( self ):
+        """ Returns the indices of the linear parameters, as set by setMixedModel.  """
+        return sorted( self._linear )
 
     def getNonLinearIndex( self ):
         """ Returns the index of the non-linear parameters.  """
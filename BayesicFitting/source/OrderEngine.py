@@ -29,6 +29,13 @@ class OrderEngine( Engine ):
     """
     The OrderEngine is the base engine for all order problems
 
+    A move changes only a few legs in the order. When the error distribution
+    and the problem provide it, the logL of the trial order is found from the
+    change in those legs only. At every CHECKPOINT-th succesfull move, logL is
+    recalculated in full, to avoid the accumulation of rounding errors.
+    When verbose > 4, the walkers are checked for exact logL values, so then
+    logL is always recalculated in full.
+
     Attributes from Engine
     ----------------------
     walkers, errdis, maxtrials, nstep, slow, rng, report, phantoms, verbose
@@ -36,6 +43,8 @@ class OrderEngine( Engine ):
     Author       Do Kester.
 
     """
+    CHECKPOINT = 100        # full recalculation of logL
+
     #  *********CONSTRUCTORS***************************************************
     def __init__( self, walkers, errdis, copy=None, **kwargs ):
         """
@@ -89,6 +98,56 @@ class OrderEngine( Engine ):
         
         return t
 
+    def trialLogL( self, walker, ptry, olegs, nlegs, lowLhood ) :
+        """
+        Return the logL of a trial order.
+
+        Parameters
+        ----------
+        walker : Walker
+            walker with the present order (allpars) and its logL
+        ptry : array_like
+            trial order
+        olegs : array_like of int
+            legs in walker.allpars which are changed
+        nlegs : array_like of int
+            legs in ptry which are changed
+        lowLhood : float
+            lower limit in logLikelihood
+        """
+        problem = walker.problem
+        if self.verbose > 4 :
+            return self.errdis.logLikelihood( problem, ptry )
+
+        delta = self.errdis.deltaLogL( problem, walker.allpars, ptry, olegs, nlegs )
+        if delta is None :
+            return self.errdis.logLikelihood( problem, ptry )
+
+        Ltry = walker.logL + delta
+        if Ltry >= lowLhood and ( self.report[self.SUCCESS] + 1 ) % self.CHECKPOINT == 0 :
+            Ltry = self.errdis.logLikelihood( problem, ptry )
+        return Ltry
+
+    def reversedLegs( self, problem, start, length ) :
+        """
+        Return the legs that are changed when a stretch of nodes is reversed.
+
+        For symmetric problems only the legs into and out of the stretch change;
+        otherwise all legs in the stretch change too.
+
+        Parameters
+        ----------
+        problem : OrderProblem
+            the problem
+        start : int
+            position of the first node in the stretch
+        length : int
+            number of nodes in the stretch
+        """
+        if getattr( problem, "symmetric", False ) :
+            return [start - 1, start + length - 1]
+        return numpy.arange( start - 1, start + length )
+
     def __str__( self ):
         return str( "OrderEngine" )
 
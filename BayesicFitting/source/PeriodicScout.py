@@ -1,4 +1,5 @@
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as numpy
 from astropy import units
@@ -40,13 +41,32 @@ class PeriodicScout( object ) :
     """
     Investigating scout for periodic models
 
+    The period search fits a periodic BasicSplinesModel to the data folded
+    at many trial periods. The fits are done in batches of trial periods: 
+    the normal equations are assembled from sums of powers of the folded 
+    phases between each pair of knots, and solved all at once. 
+    The batches can be distributed over a pool of processes.
+
+    Attributes
+    ----------
+    NRKNOTS : int
+        number of knots in the splines model over one period
+    MAXBATCH : int
+        maximum number of (trials * datapoints) in one batch
+    NCANDIDATES : int
+        number of minima in a coarse search that are refined
+
     """
+    NRKNOTS = 20
+    MAXBATCH = 2 ** 18
+    NCANDIDATES = 10
+
     def __init__( self ) :
 
         self.plotter = DummyPlotter()
 
-    def findPeriod( self, days, flux, pmin=1, pmax=2, grid=1000, clip=2, 
-                    verbose=0 ) :
+    def findPeriod( self, days, flux, pmin=1, pmax=2, grid=1000, clip=2, coarse=4,
+                    processes=None, verbose=0 ) :
         """
         Find period in  eclipsing star data.
 
@@ -54,6 +74,13 @@ class PeriodicScout( object ) :
         NP points, where NP = int( grid * log10( pmax / pmin ) / math.log10( 2 ) )
         That is grid points per octave from pmin to pmax.
 
+        With coarse > 1, first every coarse-th period of the grid is tried.
+        Around the best NCANDIDATES minima of this search all periods are tried.
+        It is about coarse times faster, but it can miss the minimum when that
+        is narrower than the coarse grid. The width of the minimum in the grid
+        is about grid * period / ( log( 2 ) * timespan ) points. For long timespans
+        or short periods, use a smaller coarse, or coarse=1 to try all periods.
+
         Select eclipsing parts and find the minimum distance
 
         Parameters
@@ -70,53 +97,56 @@ class PeriodicScout( object ) :
             number of points per octave in pmin to pmax
         clip : float (2)
             select data below median flux minus clip * median abs deviants        
+        coarse : int (4)
+            step size in the grid for a first, coarse search.
+        processes : None or int
+            scan the periods in a pool of this many processes.
+            (None or < 2 : no pool)
         verbose : int
             0 : silent
             1 : not
         """
-        NP = int( 1000 * math.log10( pmax / pmin ) / math.log10( 2 ) )
+        NP = int( grid * math.log10( pmax / pmin ) / math.log10( 2 ) )
 
         pers = numpy.geomspace( pmin, pmax, NP )
-        NK = 20
-        knots = numpy.linspace( 0, 1, NK )
-        bsm = BasicSplinesModel( knots=knots, border=1 )
-
-        prs = numpy.zeros( NP, dtype=float )
-        scl = numpy.zeros( NP, dtype=float )
 
-        k = 0
-        for ptry in pers :
-            dtry = ( days % ptry ) / ptry
-            ftr = Fitter( dtry, bsm )
-
-            try :
-                ftr.fit( flux )
-                prs[k] = ptry
-                scl[k] = ftr.scale
-                k += 1
-            except Exception :
-                pass
-
-        ## only k trials are valid
-        scl = scl[:k]
-        prs = prs[:k]
-        km = numpy.argmin( scl[1:k-1] ) + 1
+        ## scales of the trial periods; NaN is not yet tried; inf failed
+        scl = numpy.full( NP, math.nan )
+        if coarse > 1 :
+            kc = numpy.arange( 0, NP, coarse )
+            scl[kc] = self.scanPeriods( days, flux, pers[kc], processes=processes )
+
+            ## refine around the best minima
+            sc = scl[kc]
+            kmin = numpy.where( ( sc[1:-1] <= sc[:-2] ) & ( sc[1:-1] <= sc[2:] ) )[0] + 1
+            kmin = kmin[numpy.argsort( sc[kmin] )[:self.NCANDIDATES]]
+            kf = numpy.arange( 1 - coarse, coarse ) + kc[kmin][:,numpy.newaxis]
+            kf = numpy.unique( numpy.clip( kf, 0, NP - 1 ) )
+            kf = kf[numpy.isnan( scl[kf] )]
+            scl[kf] = self.scanPeriods( days, flux, pers[kf], processes=processes )
+        else :
+            scl = self.scanPeriods( days, flux, pers, processes=processes )
+
+        km = numpy.nanargmin( scl[1:-1] ) + 1
 
         if verbose :
-            print( "Between %8.2f and %8.2f" % ( prs[0], prs[-1] ), 
-                   "; minimum at %10.4f scale %8.3f" % ( prs[km], scl[km] ) )
+            print( "Between %8.2f and %8.2f" % ( pers[0], pers[-1] ), 
+                   "; minimum at %10.4f scale %8.3f" % ( pers[km], scl[km] ) )
 
-        self.plotter.plotSearch( prs, flux, scl )
+        ok = numpy.isfinite( scl )
+        self.plotter.plotSearch( pers[ok], flux, scl[ok] )
 
-        ks = [km-1, km, km+1]
-        period, scale = self.downhill( days, flux, prs[ks], scl[ks], verbose=verbose )
+        period, scale = self.downhill( days, flux, pers[km-1:km+2], 
+                                       self.bracket( days, flux, pers, scl, km ), 
+                                       verbose=verbose )
 
         # print( "Period  ", fmt( period ), fmt( scale ) ) 
 
         km -= grid          ## half the period
         if km > 0 :
-            ks = [km-1, km, km+1] 
-            per, sca = self.downhill( days, flux, prs[ks], scl[ks], verbose=verbose )
+            per, sca = self.downhill( days, flux, pers[km-1:km+2], 
+                                      self.bracket( days, flux, pers, scl, km ), 
+                                      verbose=verbose )
             # print( "Half    ", fmt( per ), fmt( sca ) ) 
             if sca < scale :
                 period = per
@@ -124,8 +154,9 @@ class PeriodicScout( object ) :
 
         km += 2 * grid      ## double the period
         if km < NP-1 :
-            ks = [km-1, km, km+1] 
-            per, sca = self.downhill( days, flux, prs[ks], scl[ks], verbose=verbose )
+            per, sca = self.downhill( days, flux, pers[km-1:km+2], 
+                                      self.bracket( days, flux, pers, scl, km ), 
+                                      verbose=verbose )
             # print( "Double  ", fmt( per ), fmt( sca ) ) 
             if sca < scale :
                 period = per
@@ -137,6 +168,68 @@ class PeriodicScout( object ) :
 
         return period, scale
 
+    def bracket( self, days, flux, pers, scl, km ) :
+        """
+        Return the scales at the periods km-1, km, km+1; scan them when not yet done.
+
+        Parameters
+        ----------
+        days : array
+            Julian days of observation
+        flux : array
+            measured flux
+        pers : array
+            grid of periods
+        scl : array
+            scales at the periods; NaN when not yet scanned. Updated.
+        km : int
+            index in the grid
+        """
+        ks = numpy.arange( km - 1, km + 2 )
+        kn = ks[numpy.isnan( scl[ks] )]
+        if len( kn ) > 0 :
+            scl[kn] = self.scanPeriods( days, flux, pers[kn] )
+        return scl[ks]
+
+    def scanPeriods( self, days, flux, periods, nrknots=None, processes=None ) :
+        """
+        Return the noise scales of splines fits to the data folded at the periods.
+
+        Parameters
+        ----------
+        days : array
+            Julian days of observation
+        flux : array
+            measured flux
+        periods : array
+            list of periods
+        nrknots : None or int
+            number of knots in BasicSplinesModel. None : NRKNOTS
+        processes : None or int
+            scan the periods in a pool of this many processes.
+            (None or < 2 : no pool)
+
+        Returns
+        -------
+        array of scales; inf where the fit failed.
+        """
+        if nrknots is None :
+            nrknots = self.NRKNOTS
+        days = numpy.asarray( days, dtype=float )
+        flux = numpy.asarray( flux, dtype=float )
+        periods = numpy.asarray( periods, dtype=float )
+
+        chunksize = max( 1, self.MAXBATCH // len( days ) )
+        tasks = [( days, flux, periods[k:k+chunksize], nrknots ) 
+                    for k in range( 0, len( periods ), chunksize )]
+
+        if processes is None or processes < 2 or len( tasks ) < 2 :
+            scales = [scanChunk( task ) for task in tasks]
+        else :
+            with ProcessPoolExecutor( max_workers=processes ) as pool :
+                scales = list( pool.map( scanChunk, tasks ) )
+
+        return numpy.concatenate( scales ) if len( scales ) > 0 else numpy.zeros( 0 )
 
     def downhill( self, days, flux, prs, scl, nrknots=20, tol=0.01, verbose=0 ) :
         """
@@ -176,12 +269,7 @@ class PeriodicScout( object ) :
         while ( k < 3 ) or ( ( (c2 - c0) > ( tol * c0 ) ) and ( k < 20 ) ) :
             ptry = ( p0 + p2 ) / 2
 
-            knots = numpy.linspace( 0, ptry, nrknots, dtype=float )
-            bsm = BasicSplinesModel( knots=knots, border=1 )
-            dtry = days % ptry
-            ftr = Fitter( dtry, bsm )
-            ftr.fit( flux )
-            sc = ftr.scale
+            sc = self.scanPeriods( days, flux, [ptry], nrknots=nrknots )[0]
 #            if verbose :
 #                print( "Iter %3d  period %10.5f   scale %10.5f" % (k, ptry, sc ), 
 #                         fmt( [c0, c1, c2] ), fmt( [p0, p1, p2] ) )
@@ -360,6 +448,91 @@ class PeriodicScout( object ) :
                  
 
 
+def scanChunk( task ) :
+    """
+    Return the noise scales of periodic splines fits for a chunk of trial periods.
+
+    Between two knots the splines are polynomials in the phase. So the normal
+    equations of each trial follow from the sums of the powers of the (local)
+    phase, and of the flux times them, between each pair of knots.
+    Those are assembled for all trials at once, and solved together.
+    The scales are computed from the residuals of the fits.
+    A module level function, such that it can be sent to a process pool.
+
+    Parameters
+    ----------
+    task : tuple of ( days, flux, periods, nrknots )
+        days and flux of the observations, trial periods and number of knots
+    """
+    days, flux, periods, nrknots = task
+    bsm = BasicSplinesModel( knots=numpy.linspace( 0, 1, nrknots ), border=1 )
+    np = bsm.npmax
+    nt = len( periods )
+    nd = len( days )
+
+    dof = nd - np
+    if dof <= 0 :
+        return numpy.full( nt, math.inf )
+
+    bpar, pix = bsm.segmentBasis()
+    ns, nb = pix.shape
+
+    ## knot segment of each folded phase, separate for each trial, and the phase in it
+    phase = ( days % periods[:,numpy.newaxis] ) / periods[:,numpy.newaxis]
+    seg = bsm.makeKnotIndices( phase )
+    dx = ( phase - bsm.knots[seg] ).ravel()
+    seg = ( seg + numpy.arange( nt )[:,numpy.newaxis] * ns ).ravel()
+    ftile = numpy.tile( flux, nt )
+
+    ## sums of the powers of dx in each segment and of the flux times them
+    upow = numpy.ones_like( dx )
+    moment = numpy.zeros( ( nt * ns, 2 * nb - 1 ), dtype=float )
+    fmoment = numpy.zeros( ( nt * ns, nb ), dtype=float )
+    for m in range( 2 * nb - 1 ) :
+        moment[:,m] = numpy.bincount( seg, weights=upow, minlength=nt*ns )
+        if m < nb :
+            fmoment[:,m] = numpy.bincount( seg, weights=ftile * upow, minlength=nt*ns )
+        upow *= dx
+
+    ## normal equations of the blobs in each segment, added into those of the trials
+    hankel = moment[:,numpy.arange( nb )[:,numpy.newaxis] + numpy.arange( nb )]
+    hseg = numpy.matmul( numpy.matmul( bpar, hankel.reshape( nt, ns, nb, nb ) ),
+                         bpar.transpose( 0, 2, 1 ) )
+    vseg = numpy.matmul( bpar, fmoment.reshape( nt, ns, nb, 1 ) )
+
+    tix = numpy.arange( nt )[:,numpy.newaxis,numpy.newaxis]
+    hx = ( pix[:,:,numpy.newaxis] * np + pix[:,numpy.newaxis,:] ) + tix[...,numpy.newaxis] * np * np
+    hessian = numpy.bincount( hx.ravel(), weights=hseg.ravel(), minlength=nt*np*np )
+    hessian = hessian.reshape( nt, np, np )
+    vector = numpy.bincount( ( pix + tix * np ).ravel(), weights=vseg.ravel(), minlength=nt*np )
+    vector = vector.reshape( nt, np )
+
+    ## trials with empty parts in the folded data, fail
+    valid = numpy.all( numpy.diagonal( hessian, axis1=1, axis2=2 ) > 0, axis=1 )
+    hessian[~valid] = numpy.identity( np )
+
+    try :
+        params = numpy.linalg.solve( hessian, vector[:,:,numpy.newaxis] )[:,:,0]
+    except numpy.linalg.LinAlgError :
+        params = numpy.zeros_like( vector )
+        for k in range( nt ) :
+            try :
+                params[k] = numpy.linalg.solve( hessian[k], vector[k] )
+            except numpy.linalg.LinAlgError :
+                valid[k] = False
+
+    ## polynomial parameters of the fits in each segment; residuals at each phase
+    poly = numpy.matmul( params[:,pix][:,:,numpy.newaxis,:], bpar ).reshape( nt * ns, nb )
+    poly = poly[seg]
+    fit = poly[:,-1]
+    for m in range( nb - 2, -1, -1 ) :
+        fit = fit * dx + poly[:,m]
+    res = ( ftile - fit ).reshape( nt, nd )
+
+    chisq = numpy.einsum( "ij,ij->i", res, res )
+    return numpy.where( valid, numpy.sqrt( chisq / dof ), math.inf )
+
+
 class DummyPlotter( object ) :
 
     def plotSearch( self, prs, flux, scl ) :
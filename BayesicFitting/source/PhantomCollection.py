@@ -1,7 +1,8 @@
 import numpy as numpy
 import math
+import threading
 
-from .WalkerList import WalkerList
+from .Walker import Walker
 
 __author__ = "Do Kester"
 __year__ = 2025
@@ -30,32 +31,48 @@ __status__ = "Perpetual Beta"
 class PhantomCollection( object ):
     """
     Helper class for NestedSamplers Engines to collect all trial walkers
-    obtained during the NS run. They are kept ordered according to their logL.  
-    They are used to find the minimum and maximum values 
-    of the parameter settings as function of the likelihood. 
+    obtained during the NS run. They are kept ordered according to their logL.
+    They are used to find the minimum and maximum values
+    of the parameter settings as function of the likelihood.
 
-    There are different methods for static models and for dynamic models. 
+    The phantoms are not kept as Walkers but in columns: a 2-d array of
+    parameters (padded for dynamic models), and arrays for logL, logPrior,
+    the number of parameters and the id, parent and start of the walker.
+    For static models all phantoms share one problem and fitIndex;
+    for dynamic (and modifiable) models they are kept per phantom.
+
+    New phantoms are collected in a list of pending walkers. They are merged
+    into the ordered columns when the columns are needed. The merge is a stable
+    sort, equivalent to inserting the phantoms one by one.
+
+    Phantoms with logL below the present lowLhood are retired from the columns.
+    The minimum and maximum values of the parameters are updated with the new
+    phantoms; they are only recalculated for parameters where a retired phantom
+    held the minimum or the maximum.
 
     For dynamic models only parameter sets of the proper length are searched.
-    The kth item in self.logL belongs to the kth list in self.pars.
-    If the model had np parameters then self.logL[np][k] pertain to 
-    self.pars[np][k,:] which has np items
 
-    For static models there is only one array of self.logL and one 2-d array 
-    od self.pars.
+    The engines of the threads of the Explorer share one PhantomCollection.
+    All methods that store, merge, retire or read phantoms hold a (reentrant) lock.
 
     Attributes
     ----------
-    phantoms : WalkerList or dict of { int : WalkerList }
-        int         number of parameters in the model
-        Wlakerlist  list of (phantom) walkers
+    phantoms : PhantomList (read only)
+        the phantoms, as a list of Walkers, ordered on logL
     paramMin : array_like or None
         minimum values of the parameters at this stage of lowLhood
         None if too few items of this parameter length is present
     paramMax : array_like or None
         maximum values of the parameters at this stage of lowLhood
         None if too few items of this parameter length is present
-
+    logL : array_like
+        ordered logL of the merged phantoms
+    pars : 2-d array_like
+        parameters of the merged phantoms (as floats, NaN padded)
+    nap : array of int
+        number of parameters of the merged phantoms
+    counted : array of bool
+        whether the phantom is included in paramMin and paramMax
 
     Author       Do Kester.
 
@@ -74,21 +91,65 @@ class PhantomCollection( object ):
             whether it is a dynamic model
         """
         self.minpars = self.MINPARS
+        self.dynamic = dynamic
         self.ncalls = 0
-            
-        self.phantoms = WalkerList()
-        self.lowLhood = -math.inf
+        self.lock = threading.RLock()
+
+        self.clear()
+
+    def __getstate__( self ) :
+        """
+        Return the state for pickling, without the lock.
+        """
+        state = self.__dict__.copy()
+        state.pop( "lock", None )
+        return state
 
+    def __setstate__( self, state ) :
+        """
+        Restore the state from pickling, with a new lock.
+        """
+        self.__dict__.update( state )
+        self.lock = threading.RLock()
+
+    def clear( self ) :
+        """
+        Remove all phantoms.
+        """
+        self.count = 0
+        self.pending = []
+        self.perWalker = None
+        self.problems = []
+        self.fitIndices = []
+
+        self.logL = numpy.zeros( 0, dtype=float )
+        self.pars = None
+        self.dtype = None
+        self.nap = numpy.zeros( 0, dtype=int )
+        self.logPrior = numpy.zeros( 0, dtype=float )
+        self.idents = numpy.zeros( ( 0, 3 ), dtype=int )
+        self.counted = numpy.zeros( 0, dtype=bool )
+
+        self.lowLhood = -math.inf
         self.npars = -1
+        self.paramMin = None
+        self.paramMax = None
 
     def __str__( self ):
         """ Return the name of this object.  """
         return "PhantomCollection"
 
+    def __getattr__( self, name ) :
+        """
+        Return the phantoms as an ordered list of walkers.
+        """
+        if name == "phantoms" :
+            return PhantomList( self )
+        raise AttributeError( "Unknown attribute " + name )
 
     def length( self, np=None ) :
         """
-        Return length of internal walkerlist
+        Return number of phantoms
 
         Parameters
         ----------
@@ -96,31 +157,52 @@ class PhantomCollection( object ):
             None return overall length
             number of parameters (in case of dynamic only)
         """
-        if np is None :
-            return len( self.phantoms )
+        with self.lock :
+            self.merge()
+            if np is None :
+                return len( self.logL )
 
-        kl = 0
-        for w in self.phantoms :
-            if w.nap == np :
-                kl += 1
-        return kl
+            return int( numpy.sum( self.nap == np ) )
 
     def getBest( self, np ) :
         """
-        Return the best phantom with np parameters; or -1 if no phantom has
-        np parameters
+        Return the index of the best phantom with np parameters; or -1 if no
+        phantom has np parameters
 
         Parameters
         ----------
         np : int
             number of parameters
         """
-        k = len( self.phantoms ) - 1
-        while k >= 0 and self.phantoms[k].nap != np :
-            k -= 1
+        with self.lock :
+            self.merge()
+            k = numpy.where( self.nap == np )[0]
+            return k[-1] if len( k ) > 0 else -1
+
+    def getWalker( self, k ) :
+        """
+        Return the k-th phantom as a Walker.
+
+        Parameters
+        ----------
+        k : int
+            index in the ordered phantoms
+        """
+        with self.lock :
+            self.merge()
+            if self.perWalker :
+                problem = self.problems[k]
+                fitIndex = self.fitIndices[k]
+            else :
+                problem, fitIndex = self.problems[0], self.fitIndices[0]
+
+            wid, parent, start = self.idents[k]
+            allpars = self.pars[k,:self.nap[k]].astype( self.dtype )
+            walker = Walker( int( wid ), problem, allpars, fitIndex,
+                             logL=float( self.logL[k] ), parent=int( parent ), start=int( start ) )
+            walker.logPrior = float( self.logPrior[k] )
+            return walker
 
-        return k
- 
     def nextLowPhantom( self, lowLhood ) :
         """
         Generator for phantoms with logL < lowLhood
@@ -130,24 +212,141 @@ class PhantomCollection( object ):
         lowLhood : float
             low border for likelihood
         """
-        for ph in self.phantoms :
-            if ph.logL <= lowLhood :
-                yield ph
+        self.merge()
+        for k in range( len( self.logL ) ) :
+            if self.logL[k] <= lowLhood :
+                yield self.getWalker( k )
             else :
                 return
 
     def storeItems( self, walker ) :
         """
-        Store both items as arrays.
+        Store the walker as a phantom.
 
         Parameters
         ----------
         walker : Walker
             to be added to the PhantomCollection
         """
-        self.ncalls += 1
-        self.phantoms = self.phantoms.insertWalker( walker )
+        with self.lock :
+            self.ncalls += 1
+            self.count += 1
+            self.pending.append( walker )
+
+    def merge( self ) :
+        """
+        Merge the pending walkers into the ordered columns.
+        """
+        with self.lock :
+            if len( self.pending ) == 0 :
+                return
+
+            pending = self.pending
+            self.pending = []
+
+            if self.perWalker is None :
+                model = pending[0].problem.model
+                self.perWalker = self.dynamic or ( model is not None and
+                                    ( model.isDynamic() or model.isModifiable() ) )
+                if not self.perWalker :
+                    self.problems = [pending[0].problem]
+                    self.fitIndices = [pending[0].fitIndex]
+
+            ## parameters are kept as floats, padded with NaN
+            nap = numpy.asarray( [w.nap for w in pending], dtype=int )
+            width = max( numpy.max( nap ), 0 if self.pars is None else self.pars.shape[1] )
+
+            pars = numpy.full( ( len( pending ), width ), math.nan, dtype=float )
+            for k, w in enumerate( pending ) :
+                pars[k,:nap[k]] = w.allpars
+            if self.pars is None :
+                self.dtype = numpy.asarray( pending[0].allpars ).dtype
+                self.pars = numpy.zeros( ( 0, width ), dtype=float )
+            elif self.pars.shape[1] < width :
+                self.pars = numpy.append( self.pars, numpy.full( ( len( self.pars ),
+                                width - self.pars.shape[1] ), math.nan ), axis=1 )
+
+            ## sort the pending block only (stable: equal logL keep the order of
+            ## storage) and merge it into the ordered columns. Inserting at the
+            ## right side keeps earlier stored phantoms in front of equal logL.
+            logL = numpy.asarray( [w.logL for w in pending], dtype=float )
+            srt = numpy.argsort( logL, kind="stable" )
+            idx = numpy.searchsorted( self.logL, logL[srt], side="right" )
+
+            self.logL = self.insertRows( self.logL, idx, logL[srt] )
+            self.pars = self.insertRows( self.pars, idx, pars[srt] )
+            self.nap = self.insertRows( self.nap, idx, nap[srt] )
+            self.logPrior = self.insertRows( self.logPrior, idx,
+                                numpy.asarray( [w.logPrior for w in pending], dtype=float )[srt] )
+            self.idents = self.insertRows( self.idents, idx,
+                                numpy.asarray( [[w.id, w.parent, w.start] for w in pending],
+                                               dtype=int )[srt] )
+            self.counted = self.insertRows( self.counted, idx,
+                                numpy.zeros( len( pending ), dtype=bool ) )
+
+            if self.perWalker :
+                ## final positions, ascending: each insert leaves the earlier ones in place
+                for k, i in zip( srt, idx + numpy.arange( len( pending ) ) ) :
+                    self.problems.insert( i, pending[k].problem )
+                    self.fitIndices.insert( i, pending[k].fitIndex )
+
+    def insertRows( self, column, idx, values ) :
+        """
+        Return the column with the values inserted before the rows at idx.
+
+        Same as numpy.insert( column, idx, values, axis=0 ), but the stretches
+        between the insertion points are copied as slices, which is much faster
+        for 2-d columns.
+
+        Parameters
+        ----------
+        column : array_like
+            ordered column (1-d, or 2-d with one row per phantom)
+        idx : array_like of int
+            ascending insertion points into column
+        values : array_like
+            values to be inserted; one (row) per index
+        """
+        nv = len( idx )
+        merged = numpy.empty( ( len( column ) + nv, ) + column.shape[1:], dtype=column.dtype )
+        lo = 0
+        for k, hi in enumerate( idx ) :
+            merged[lo+k:hi+k] = column[lo:hi]
+            merged[hi+k] = values[k]
+            lo = hi
+        merged[lo+nv:] = column[lo:]
+        return merged
+
+    def retire( self, lowLhood ) :
+        """
+        Remove the phantoms with logL <= lowLhood.
+
+        Return the parameters of those that were counted in the min and max values.
 
+        Parameters
+        ----------
+        lowLhood : float
+            lower boundary of the log Likelihood
+        """
+        with self.lock :
+            self.merge()
+            klow = numpy.searchsorted( self.logL, lowLhood, side="right" )
+
+            retired = self.pars[:klow][self.counted[:klow]]
+            retnap = self.nap[:klow][self.counted[:klow]]
+
+            ## slices are views: the memory is compacted at the next merge
+            self.logL = self.logL[klow:]
+            self.pars = self.pars[klow:]
+            self.nap = self.nap[klow:]
+            self.logPrior = self.logPrior[klow:]
+            self.idents = self.idents[klow:]
+            self.counted = self.counted[klow:]
+            if self.perWalker :
+                del self.problems[:klow]
+                del self.fitIndices[:klow]
+
+            return ( retired, retnap )
 
     def getParamMinmax( self, lowLhood, np=None ):
         """
@@ -161,10 +360,11 @@ class PhantomCollection( object ):
             number of parameters (not used in this implementation)
 
         """
-        if lowLhood > self.lowLhood or self.npars != np :
-            self.calculateParamMinmax( lowLhood, np=np )
+        with self.lock :
+            if lowLhood > self.lowLhood or self.npars != np :
+                self.calculateParamMinmax( lowLhood, np=np )
 
-        return ( self.paramMin, self.paramMax )
+            return ( self.paramMin, self.paramMax )
 
 
     def calculateParamMinmax( self, lowLhood, np=None ):
@@ -180,24 +380,92 @@ class PhantomCollection( object ):
             number of parameters
 
         """
-        self.lowLhood = lowLhood
-        self.npars = np
+        with self.lock :
+            samenp = self.npars == np and self.paramMin is not None
+
+            self.lowLhood = lowLhood
+            self.npars = np
+
+            retired, retnap = self.retire( lowLhood )
+
+            if self.length( np ) <= self.minpars :
+                self.paramMax = None
+                self.paramMin = None
+                return
+
+            if np is None :
+                np = self.pars.shape[1]
+                select = numpy.ones( len( self.nap ), dtype=bool )
+            else :
+                select = self.nap == np
+
+            if not samenp :
+                ## calculate from scratch
+                pars = self.pars[select,:np]
+                self.paramMin = numpy.nanmin( pars, axis=0 )
+                self.paramMax = numpy.nanmax( pars, axis=0 )
+                self.counted = select
+                return
 
-        self.phantoms = self.phantoms.cropOnLow( lowLhood )
+            ## add the new phantoms
+            new = select & ~self.counted
+            if numpy.any( new ) :
+                pars = self.pars[new,:np]
+                self.paramMin = numpy.fmin( self.paramMin, numpy.nanmin( pars, axis=0 ) )
+                self.paramMax = numpy.fmax( self.paramMax, numpy.nanmax( pars, axis=0 ) )
+            self.counted = select
+
+            ## recalculate where a retired phantom held the min or max
+            retired = retired[retnap == np,:np]
+            if len( retired ) > 0 :
+                redo = ( numpy.any( retired == self.paramMin, axis=0 ) |
+                         numpy.any( retired == self.paramMax, axis=0 ) )
+                if numpy.any( redo ) :
+                    pars = self.pars[select][:,:np][:,redo]
+                    self.paramMin[redo] = numpy.nanmin( pars, axis=0 )
+                    self.paramMax[redo] = numpy.nanmax( pars, axis=0 )
 
-        if self.length( np ) <= self.minpars :
-            self.paramMax = None
-            self.paramMin = None
             return
 
-        pars = self.phantoms.allPars( npars=np )
 
-        self.paramMin = numpy.nanmin( pars, axis=0 )
-        self.paramMax = numpy.nanmax( pars, axis=0 )
+class PhantomList( object ):
+    """
+    PhantomList presents the phantoms of a PhantomCollection as an ordered list of Walkers.
+
+    The walkers are made upon request.
+
+    Attributes
+    ----------
+    phancol : PhantomCollection
+        the collection of phantoms
+
+    Author       Do Kester.
+
+    """
+    def __init__( self, phancol ) :
+        """
+        Constructor.
 
-        return
+        Parameters
+        ----------
+        phancol : PhantomCollection
+            the collection of phantoms
+        """
+        self.phancol = phancol
+        phancol.merge()
 
+    def __len__( self ) :
+        return len( self.phancol.logL )
 
+    def __getitem__( self, k ) :
+        return self.phancol.getWalker( k )
 
+    def __iter__( self ) :
+        for k in range( len( self ) ) :
+            yield self.phancol.getWalker( k )
 
+    def __getattr__( self, name ) :
+        if name == "_count" :
+            return self.phancol.count
+        raise AttributeError( "Unknown attribute " + name )
 
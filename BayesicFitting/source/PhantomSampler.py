@@ -56,7 +56,7 @@ class PhantomSampler( NestedSampler ):
     def __init__( self, xdata=None, model=None, ydata=None, weights=None,
                 accuracy=None, problem=None, distribution=None, limits=None,
                 keep=None, ensemble=ENSEMBLE, seed=80409, rate=1.0, engines=None,
-                maxsize=None, threads=False, verbose=1 ) :
+                maxsize=None, threads=False, processes=None, verbose=1 ) :
         """
         Create a new class, providing inputs and model.
 
@@ -139,6 +139,8 @@ class PhantomSampler( NestedSampler ):
             maximum size of the resulting sample list (None : no limit)
         threads : bool (False)
             Use Threads to distribute the diffusion of discarded samples over the available cores.
+        processes : None or int
+            Number of processes to distribute the diffusion of discarded samples over.
         verbose : int (1)
             0   silent
             1   basic information
@@ -150,7 +152,8 @@ class PhantomSampler( NestedSampler ):
         super().__init__( xdata=xdata, model=model, ydata=ydata, weights=weights,
                 accuracy=accuracy, problem=problem, distribution=distribution, limits=limits,
                 keep=keep, ensemble=ensemble, seed=seed, rate=rate, engines=engines,
-                maxsize=maxsize, usePhantoms=True, threads=threads, verbose=verbose )
+                maxsize=maxsize, usePhantoms=True, threads=threads, processes=processes,
+                verbose=verbose )
 
 
     def __str__( self ):
@@ -180,36 +183,30 @@ class PhantomSampler( NestedSampler ):
 
         """
 
-        kw = 0      ### DONT use enumerate here
-        for lowph in self.phancol.nextLowPhantom( self.lowLhood ) :
-            lpc = self.livepointcount
-            logWidth = self.logUnitDom - math.log( lpc )
-            logWeight = logWidth + lowph.logL + lowph.logPrior
+        phancol = self.phancol
+        phancol.merge()             ## the pending phantoms are needed too
+        lpc = self.livepointcount
+        nlow = int( numpy.searchsorted( phancol.logL, self.lowLhood, side="right" ) )
 
-            # update evidence, logZ
-            logZnew = numpy.logaddexp( self.logZ, logWeight )
+        ## check if there has something to be updated
+        if nlow == 0 :
+            return
 
-            # update Information, H
-            self.info = ( math.exp( logWeight - logZnew ) * self.lowLhood +
-                    math.exp( self.logZ - logZnew ) * ( self.info + self.logZ ) - logZnew )
+        ## the unit domain shrinks by ( lpc - 1 ) / lpc per phantom
+        logShrink = math.log( lpc - 1 ) - math.log( lpc )
+        logUnitDom = self.logUnitDom + logShrink * numpy.arange( nlow + 1 )
+        logWidth = logUnitDom[:-1] - math.log( lpc )
+        logWeight = logWidth + phancol.logL[:nlow] + phancol.logPrior[:nlow]
 
-            if math.isnan( self.info ) :
-                self.info = 0.0
-            self.logZ = logZnew
+        self.accumulateEvidence( logWeight )
 
-            # store posterior samples
-            smpl = lowph.toSample( logWeight )
-            self.samples.add( smpl )
+        # store posterior samples
+        self.samples.addWalkers( [phancol.getWalker( k ) for k in range( nlow )], logWeight )
 
-            self.sumWidth += math.exp( logWidth )
+        self.sumWidth += numpy.sum( numpy.exp( logWidth ) )
+        self.logUnitDom = float( logUnitDom[-1] )
 
-            self.logUnitDom = logWidth + math.log( lpc - 1 )
-
-            kw += 1
-
-        ## check if there has something been updated
-        if kw > 0 :
-            self.logdZ = logWeight - self.logZ
+        self.logdZ = logWeight[-1] - self.logZ
 
         return
 
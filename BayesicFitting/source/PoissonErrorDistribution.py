@@ -118,7 +118,7 @@ class PoissonErrorDistribution( ErrorDistribution ):
         if numpy.any(  mock <= 0.0 ) :
             return -math.inf
 
-        lfdata = logFactorial( problem.ydata )
+        lfdata = self.dataTerm( problem, "logFactorial", self.logFactorialData )
 
         logl = numpy.sum( problem.ydata * numpy.log( mock ) - mock - lfdata )
 
@@ -145,7 +145,7 @@ class PoissonErrorDistribution( ErrorDistribution ):
         """
         if mockdata is None :
             mockdata = problem.result( allpars )
-        lfdata = logFactorial( problem.ydata )
+        lfdata = self.dataTerm( problem, "logFactorial", self.logFactorialData )
 
         with warnings.catch_warnings():
             warnings.simplefilter( "ignore", category=RuntimeWarning )
@@ -160,6 +160,11 @@ class PoissonErrorDistribution( ErrorDistribution ):
 
         return lld
 
+    @staticmethod
+    def logFactorialData( problem, arg=None ) :
+        """ Return the log( n! ) of the data; kept in the datacache of the problem. """
+        return logFactorial( problem.ydata )
+
     def partialLogL_alt( self, problem, allpars, fitIndex ):
         """
         Return the partial derivative of log( likelihood ) to the parameters.
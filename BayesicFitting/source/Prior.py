@@ -85,7 +85,14 @@ class Prior( object ):
         umin lowLimit in unit
     _urng : float
         urange (hi-lo) in unit
+
+    Class Attributes
+    ----------------
+    version : int
+        counts the changes of attributes in all priors, and the replacements
+        of priors in models and hyperparameters. See Engine.getPriorVector.
     """
+    version = 0
 
 ##  TBD : 1. change all self.attribute = value to setattr( "attribute, value )
 ##        2. forbid external settings of (most) attributes except through methods
@@ -291,6 +298,7 @@ class Prior( object ):
 
         if name in keys :
             setatt( self, name, value )
+            Prior.version += 1
         else :
             raise AttributeError( repr( self ) + " object has no attribute " + name )
 
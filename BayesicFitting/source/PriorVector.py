@@ -0,0 +1,385 @@
+import numpy as numpy
+import math
+from scipy import special
+
+from .UniformPrior import UniformPrior
+from .CircularUniformPrior import CircularUniformPrior
+from .GaussPrior import GaussPrior
+from .JeffreysPrior import JeffreysPrior
+from .LaplacePrior import LaplacePrior
+from .ExponentialPrior import ExponentialPrior
+from .CauchyPrior import CauchyPrior
+
+__author__ = "Do Kester"
+__year__ = 2026
+__license__ = "GPL3"
+__version__ = "3.3.0"
+__url__ = "https://www.bayesicfitting.nl"
+__status__ = "Perpetual Beta"
+
+#  * This file is part of the BayesicFitting package.
+#  *
+#  * BayesicFitting is free software: you can redistribute it and/or modify
+#  * it under the terms of the GNU Lesser General Public License as
+#  * published by the Free Software Foundation, either version 3 of
+#  * the License, or ( at your option ) any later version.
+#  *
+#  * BayesicFitting is distributed in the hope that it will be useful,
+#  * but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  * GNU Lesser General Public License for more details.
+#  *
+#  * The GPL3 license can be found at <http://www.gnu.org/licenses/>.
+#  *
+#  *    2026 Do Kester
+
+
+class PriorVector( object ):
+    """
+    PriorVector applies a list of priors to an array of values in one go.
+
+    The priors are grouped by type: Uniform, Gauss, Jeffreys, Laplace
+    (and Exponential) and Cauchy. Each group keeps the centers, scales,
+    limits and circularity of its priors in arrays, such that the
+    transformations unit2Domain and domain2Unit, and the methods logResult
+    and partialLog, take a few numpy operations per group, irrespective of
+    the number of priors.
+    Priors of other types are handled one by one.
+
+    The values are arrays where the last axis runs over the priors;
+    a 2-d array is a batch of parameter sets, one set per row.
+
+    The attributes of the priors are copied at construction.
+    Changes in the priors afterwards are not seen by the PriorVector.
+
+    Examples
+    --------
+    >>> priors = [model.getPrior( k ) for k in range( model.npars )]
+    >>> pv = PriorVector( priors )
+    >>> dval = pv.unit2Domain( numpy.random.rand( model.npars ) )
+    >>> uval = pv.domain2Unit( dval )
+
+    Attributes
+    ----------
+    priors : list of Prior
+        the priors, one for each value
+    groups : list of PriorGroup
+        priors of the same type, treated as one
+    others : list of int
+        indices of priors that are handled one by one
+    lowLimit : array_like
+        low limits of the priors
+    highLimit : array_like
+        high limits of the priors
+
+    Author       Do Kester.
+
+    """
+    KIND = {UniformPrior : "uniform", CircularUniformPrior : "uniform",
+            GaussPrior : "gauss", JeffreysPrior : "jeffreys",
+            LaplacePrior : "laplace", ExponentialPrior : "laplace",
+            CauchyPrior : "cauchy"}
+
+    def __init__( self, priors ):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        priors : list of Prior
+            the priors, one for each value
+        """
+        self.priors = list( priors )
+
+        index = {}
+        self.others = []
+        for k, pr in enumerate( self.priors ) :
+            kind = self.KIND.get( type( pr ), None )
+            if kind is None :
+                self.others += [k]
+            else :
+                index.setdefault( kind, [] ).append( k )
+
+        self.groups = [PriorGroup( kind, [self.priors[k] for k in idx], idx )
+                            for kind, idx in index.items()]
+
+        self.lowLimit = numpy.asarray( [pr.lowLimit for pr in self.priors], dtype=float )
+        self.highLimit = numpy.asarray( [pr.highLimit for pr in self.priors], dtype=float )
+
+    def __len__( self ) :
+        return len( self.priors )
+
+    def unit2Domain( self, uval ):
+        """
+        Return the values within the domains of the priors, given values in [0,1].
+
+        Parameters
+        ----------
+        uval : array_like
+            values in [0,1]; last axis runs over the priors
+        """
+        uval = numpy.asarray( uval, dtype=float )
+        dval = numpy.empty_like( uval )
+        for grp in self.groups :
+            dval[...,grp.index] = grp.unit2Domain( uval[...,grp.index] )
+        for k in self.others :
+            dval[...,k] = self.oneByOne( self.priors[k].unit2Domain, uval[...,k] )
+        return dval
+
+    def domain2Unit( self, dval ):
+        """
+        Return values in [0,1], given values within the domains of the priors.
+
+        Parameters
+        ----------
+        dval : array_like
+            values within the domains; last axis runs over the priors
+        """
+        dval = numpy.asarray( dval, dtype=float )
+        uval = numpy.empty_like( dval )
+        for grp in self.groups :
+            uval[...,grp.index] = grp.domain2Unit( dval[...,grp.index] )
+        for k in self.others :
+            uval[...,k] = self.oneByOne( self.priors[k].domain2Unit, dval[...,k] )
+        return uval
+
+    def logResult( self, dval ):
+        """
+        Return the log of the priors at the values; -inf when outside the limits.
+
+        Parameters
+        ----------
+        dval : array_like
+            values within the domains; last axis runs over the priors
+        """
+        dval = numpy.asarray( dval, dtype=float )
+        logr = numpy.empty_like( dval )
+        for grp in self.groups :
+            logr[...,grp.index] = grp.logResult( dval[...,grp.index] )
+        for k in self.others :
+            logr[...,k] = self.oneByOne( self.priors[k].logResult, dval[...,k] )
+        return logr
+
+    def partialLog( self, dval ):
+        """
+        Return the partial derivatives of the log of the priors at the values.
+
+        Parameters
+        ----------
+        dval : array_like
+            values within the domains; last axis runs over the priors
+        """
+        dval = numpy.asarray( dval, dtype=float )
+        part = numpy.empty_like( dval )
+        for grp in self.groups :
+            part[...,grp.index] = grp.partialLog( dval[...,grp.index] )
+        for k in self.others :
+            part[...,k] = self.oneByOne( self.priors[k].partialLog, dval[...,k] )
+        return part
+
+    def oneByOne( self, method, val ) :
+        """
+        Return the method applied to each of the values.
+        """
+        if numpy.ndim( val ) == 0 :
+            return method( float( val ) )
+        return numpy.fromiter( ( method( v ) for v in val.flat ), float,
+                               count=val.size ).reshape( val.shape )
+
+    def isOutOfLimits( self, dval ):
+        """
+        Return True for the values that are out of the limits of their priors.
+
+        Parameters
+        ----------
+        dval : array_like
+            values within the domains; last axis runs over the priors
+        """
+        return ( dval < self.lowLimit ) | ( dval > self.highLimit )
+
+    def checkLimit( self, dval ):
+        """
+        Check whether the values are within the limits of their priors.
+
+        Parameters
+        ----------
+        dval : array_like
+            values within the domains
+
+        Raises
+        ------
+            ValueError when a value is outside its limits.
+        """
+        out = numpy.where( self.isOutOfLimits( dval ) )[0]
+        if len( out ) > 0 :
+            k = out[0]
+            raise ValueError( "Parameter outside supplied limits: %8.2f < %8.2f < %8.2f"%
+                            ( self.lowLimit[k], dval[k], self.highLimit[k] ) )
+
+
+class PriorGroup( object ):
+    """
+    PriorGroup collects priors of the same type for PriorVector.
+
+    The limits are applied as in Prior.limitedUnit2Domain and
+    Prior.limitedDomain2Unit; circularity as in Prior.circularUnit2Domain
+    and Prior.circularDomain2Unit. Unlimited priors get umin = 0 and urng = 1.
+
+    Attributes
+    ----------
+    kind : str
+        the type of the priors
+    index : array of int
+        positions of the priors in the PriorVector
+    center, scale, limint, maxval : array_like
+        attributes of the priors
+    lowLimit, highLimit : array_like
+        limits of the priors
+    umin, urng : array_like
+        low limit and range in unit space
+    circular : array of bool
+        whether the prior is circular
+
+    Author       Do Kester.
+
+    """
+    SQRT2 = math.sqrt( 2.0 )
+
+    def __init__( self, kind, priors, index ):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        kind : str
+            the type of the priors
+        priors : list of Prior
+            the priors
+        index : list of int
+            positions of the priors in the PriorVector
+        """
+        self.kind = kind
+        self.index = numpy.asarray( index, dtype=int )
+
+        self.center = self.collect( priors, "center", 0.0 )
+        self.scale = self.collect( priors, "scale", 1.0 )
+        self.limint = self.collect( priors, "limint", 1.0 )
+        self.maxval = self.collect( priors, "MAXVAL", 0.0 )
+        self.lowLimit = self.collect( priors, "lowLimit", -math.inf )
+        self.highLimit = self.collect( priors, "highLimit", math.inf )
+
+        limited = [( "baseUnit2Domain" in vars( pr ) ) for pr in priors]
+        self.umin = numpy.asarray( [pr._umin if lim else 0.0
+                            for pr, lim in zip( priors, limited )], dtype=float )
+        self.urng = numpy.asarray( [pr._urng if lim else 1.0
+                            for pr, lim in zip( priors, limited )], dtype=float )
+        ## the uniform density needs the true range, also when not limited
+        self.drng = numpy.asarray( [pr._urng for pr in priors], dtype=float )
+
+        self.circular = numpy.asarray( [pr.isCircular() for pr in priors], dtype=bool )
+        self.anyCircular = numpy.any( self.circular )
+
+    def collect( self, priors, name, default ) :
+        return numpy.asarray( [getattr( pr, name, default ) for pr in priors], dtype=float )
+
+    def unit2Domain( self, uval ):
+        """
+        Return the domain values, given values in [0,1].
+        """
+        if self.anyCircular :
+            uval = numpy.where( self.circular, ( uval * 3 ) % 1, uval )
+        return self.baseUnit2Domain( uval * self.urng + self.umin )
+
+    def domain2Unit( self, dval ):
+        """
+        Return values in [0,1], given domain values.
+        """
+        uval = ( self.baseDomain2Unit( dval ) - self.umin ) / self.urng
+        if self.anyCircular :
+            uval = numpy.where( self.circular, ( uval + 1 ) / 3, uval )
+        return uval
+
+    def baseUnit2Domain( self, uval ):
+        kind = self.kind
+        if kind == "uniform" :
+            return uval
+        if kind == "jeffreys" :
+            return numpy.exp( uval )
+        if kind == "gauss" :
+            dom = special.erfinv( 2 * uval - 1 )
+            return numpy.where( numpy.isfinite( dom ),
+                    dom * self.scale * self.SQRT2 + self.center,
+                    numpy.copysign( self.maxval, uval - 0.5 ) * self.scale + self.center )
+        if kind == "laplace" :
+            uv = 2 * uval
+            with numpy.errstate( divide="ignore", invalid="ignore" ) :
+                dv = numpy.where( ( uv == 0 ) | ( uv == 2 ),
+                        numpy.copysign( self.maxval, uv - 1 ),
+                        numpy.where( uv <= 1, numpy.log( uv ), -numpy.log( 2 - uv ) ) )
+            return self.center + dv * self.scale
+        if kind == "cauchy" :
+            return numpy.tan( ( uval - 0.5 ) * math.pi ) * self.scale + self.center
+
+    def baseDomain2Unit( self, dval ):
+        kind = self.kind
+        if kind == "uniform" :
+            return dval
+        if kind == "jeffreys" :
+            if numpy.any( dval <= 0 ) :
+                raise ValueError()
+            return numpy.log( dval )
+        if kind == "gauss" :
+            return 0.5 * ( special.erf( ( dval - self.center ) /
+                                        ( self.SQRT2 * self.scale ) ) + 1 )
+        if kind == "laplace" :
+            dv = ( dval - self.center ) / self.scale
+            with numpy.errstate( over="ignore" ) :
+                return numpy.where( dv < 0, 0.5 * numpy.exp( dv ), 1.0 - 0.5 * numpy.exp( -dv ) )
+        if kind == "cauchy" :
+            return numpy.arctan( ( dval - self.center ) / self.scale ) / math.pi + 0.5
+
+    def logResult( self, dval ):
+        """
+        Return the log of the priors at the domain values.
+        """
+        out = ( dval < self.lowLimit ) | ( dval > self.highLimit )
+        kind = self.kind
+        with numpy.errstate( divide="ignore", invalid="ignore" ) :
+            if kind == "uniform" :
+                logr = numpy.zeros_like( dval ) - numpy.log( self.drng )
+            elif kind == "jeffreys" :
+                logr = -numpy.log( dval * self.drng )
+            elif kind == "gauss" :
+                xs = ( dval - self.center ) / self.scale
+                logr = ( GaussPrior.LS2PI - numpy.log( self.scale * self.limint ) -
+                         0.5 * xs * xs )
+            elif kind == "laplace" :
+                xs = ( dval - self.center ) / self.scale
+                logr = -numpy.log( 2 * self.scale * self.limint ) - numpy.abs( xs )
+            elif kind == "cauchy" :
+                xc = dval - self.center
+                logr = numpy.log( self.scale / ( ( self.scale * self.scale + xc * xc ) *
+                                  math.pi * self.limint ) )
+        return numpy.where( out, -math.inf, logr )
+
+    def partialLog( self, dval ):
+        """
+        Return the partial derivative of the log of the priors at the domain values.
+        """
+        out = ( dval < self.lowLimit ) | ( dval > self.highLimit )
+        kind = self.kind
+        if kind == "uniform" :
+            return numpy.where( out, math.nan, 0.0 )
+        if kind == "jeffreys" :
+            with numpy.errstate( divide="ignore" ) :
+                return numpy.where( out, math.nan, -1 / dval )
+        if kind == "gauss" :
+            return - ( dval - self.center ) / ( self.scale * self.scale )
+        if kind == "laplace" :
+            return numpy.where( dval == self.center, 0.0,
+                   numpy.where( out, math.nan,
+                   numpy.where( dval > self.center, -1 / self.scale, 1 / self.scale ) ) )
+        if kind == "cauchy" :
+            xc = dval - self.center
+            return - 2 * xc / ( self.scale * self.scale + xc * xc )
+
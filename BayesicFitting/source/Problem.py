@@ -1,4 +1,5 @@
 import numpy as numpy
+import threading
 
 from .Tools import shortName as ToolsShortName
 from .Tools import setAttribute as setatt
@@ -64,6 +65,12 @@ class Problem( object ):
         type of the parameters
     ndout : int
         number of output dimensions
+    datacache : dict
+        terms of the ErrorDistributions that only depend on the data.
+        It is emptied when ydata, weights or accuracy are reassigned.
+    threadlocal : threading.local
+        scratch arrays of the ErrorDistributions, one set per thread.
+        See workspace().
 
     Author :         Do Kester
 
@@ -116,6 +123,8 @@ class Problem( object ):
                 self.model = copy.model
             self.partype = copy.partype
             self.ndout = copy.ndout
+            if "datacache" in copy.__dict__ :
+                self.datacache = copy.datacache
 
         if self.model is None or not hasattr( self.model, "cyclic" ) :
             pass                                    # default is no correction
@@ -143,6 +152,17 @@ class Problem( object ):
                 delattr( self, "sumweight" )
             except Exception :
                 pass
+        if name in ["ydata", "weights", "accuracy", "varyy"] :
+            ## a new (not emptied) cache, as it might be shared with copies
+            self.__dict__.pop( "datacache", None )
+
+    def __getstate__( self ) :
+        """
+        Return the state for pickling and copying, without the scratch arrays.
+        """
+        state = self.__dict__.copy()
+        state.pop( "threadlocal", None )
+        return state
 
     def __getattr__( self, name ) :
         """
@@ -168,6 +188,12 @@ class Problem( object ):
         elif name == 'ndata' :
             self.ndata = len( self.ydata )        # number of data points/tuples
             return self.ndata
+        elif name == 'datacache' :
+            self.datacache = {}
+            return self.datacache
+        elif name == 'threadlocal' :
+            self.threadlocal = threading.local()
+            return self.threadlocal
         elif name == 'logScale' :
             return 0.0
         else :
@@ -189,6 +215,27 @@ class Problem( object ):
         self.accuracy = accuracy if self.hasAccuracy else 0
         self.varyy = self.accuracy * self.accuracy
 
+    def workspace( self, name, shape ) :
+        """
+        Return a scratch array of shape, private to the calling thread.
+
+        The array is kept with the problem and reused at the next request
+        for name. Its contents are undefined.
+
+        Parameters
+        ----------
+        name : str
+            name of the scratch array
+        shape : tuple of int
+            shape of the array
+        """
+        local = self.threadlocal
+        array = getattr( local, name, None )
+        if array is None or array.shape != shape :
+            array = numpy.empty( shape, dtype=float )
+            setattr( local, name, array )
+        return array
+
     def hasWeights( self ):
         """ Return whether it has weights.  """
         return self.weights is not None
@@ -209,6 +256,18 @@ class Problem( object ):
         """
         pass
 
+    def resultBatch( self, params2d ):
+        """
+        Returns the results for a batch of parameter sets.
+
+        Parameters
+        ----------
+        params2d : 2d array_like
+            values for the parameters, one set per row.
+
+        """
+        return numpy.asarray( [self.result( param ) for param in params2d] )
+
 
     def residuals( self, param, mockdata=None ) :
         """
@@ -1,5 +1,6 @@
 import numpy as numpy
 import math
+from scipy.linalg import cholesky_banded, cho_solve_banded
 
 from .BaseFitter import BaseFitter
 
@@ -73,16 +74,23 @@ class QRFitter( BaseFitter ):
     ----------
     needsNewDecomposition : bool
         True when starting. Thereafter False,
-            i.e. the previous QR-decomposition is used, unless weights are used.
-            Only for linear fitters, setting it to false might improve efficiency.
-            It only works properly when the model, the x-data etc are exactly the
-            same in the previous run.
-            Whenever weights are used, it always needs a new decomposition.
+            i.e. the previous QR-decomposition is used, as long as the xdata,
+            the model, the weights and keep are the same as in the previous run.
+            Set it to True when the model has been changed in place.
+            The decomposition is kept with the factors, see BaseFitter.getFactors().
 
     qrmat : matrix
         matrix formed by q * inverse( r ), where q,r is the QR decomposition
         of the design matrix.
         qrmat is to be multiplied with the data vector to get the solution.
+        None when the design is banded.
+    banded : None or tuple of ( 2-d array, int array )
+        the weighted design as a band, when the model provides one.
+        See Model.bandedPartial().
+        A band is decomposed via the Cholesky decomposition of the banded
+        hessian, which takes O( ndata * nband ) in time and memory.
+    cholesky : 2-d array
+        Cholesky decomposition of the banded hessian, in upper banded form.
 
     """
 
@@ -114,6 +122,9 @@ class QRFitter( BaseFitter ):
 
         self.needsNewDecomposition = True
         self.qrmat = None
+        self.banded = None
+        self.cholesky = None
+        self.cacheFactors = True
 
     def fit( self, ydata, weights=None, accuracy=None, keep=None, plot=False ):
         """
@@ -165,18 +176,40 @@ class QRFitter( BaseFitter ):
 
         ydatacopy = ydatacopy * wgts
 
-        if self.needsNewDecomposition or weights is not None:
-            design = ( self.getDesign( index=fi ).transpose() * wgts ).transpose()
-
-            # The QR decomposition in numpy has a different interface from that in scipy.
-            # Here we use numpy. See:
-            #   https://docs.scipy.org/doc/numpy/reference/generated/numpy.linalg.qr.html
-
-            q, r = numpy.linalg.qr( design )
-            self.qrmat = numpy.dot( numpy.linalg.inv( r ), q.transpose() )
+        if self.needsNewDecomposition :
+            self.factors = None
+        factors = self.getFactors( weights=fitwgts, index=fi )
+
+        if factors is not None and "decomposition" in factors :
+            self.qrmat, self.banded, self.cholesky = factors["decomposition"]
+        elif self.needsNewDecomposition or factors is not None or weights is not None :
+            self.qrmat = None
+            self.banded = self.getBandedDesign( index=fi )
+            if self.banded is not None :
+                self.banded = ( self.banded[0] * wgts[:,numpy.newaxis], self.banded[1] )
+                try :
+                    self.cholesky = cholesky_banded( self.makeBandedHessian( self.banded ) )
+                except numpy.linalg.LinAlgError :
+                    self.banded = None
+
+            if self.banded is None :
+                design = ( self.getDesign( index=fi ).transpose() * wgts ).transpose()
+
+                # The QR decomposition in numpy has a different interface from that in scipy.
+                # Here we use numpy. See:
+                #   https://docs.scipy.org/doc/numpy/reference/generated/numpy.linalg.qr.html
+
+                q, r = numpy.linalg.qr( design )
+                self.qrmat = numpy.dot( numpy.linalg.inv( r ), q.transpose() )
             self.needsNewDecomposition = False
-
-        params = numpy.dot( self.qrmat, ydatacopy )
+            if factors is not None :
+                factors["decomposition"] = ( self.qrmat, self.banded, self.cholesky )
+
+        if self.qrmat is None :
+            params = cho_solve_banded( ( self.cholesky, False ),
+                                       self.bandedVector( self.banded, ydatacopy ) )
+        else :
+            params = numpy.dot( self.qrmat, ydatacopy )
 
         params = self.insertParameters( params, index=fi )
         self.model.parameters = params
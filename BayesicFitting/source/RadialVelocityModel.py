@@ -138,7 +138,7 @@ class RadialVelocityModel( NonLinearModel ) :
 
         """
         pars = params[:4]
-        r, v = self.keppler.radiusAndTrueAnomaly( xdata, pars )
+        r, v, E, sinE, cosE = self.keppler.orbit( xdata, pars )
 
         x = v + params[4]
 
@@ -175,11 +175,7 @@ class RadialVelocityModel( NonLinearModel ) :
         np = self.npbase if parlist is None else len( parlist )
 
         pars = params[:4]
-        r, v = self.keppler.radiusAndTrueAnomaly( xdata, pars )
-
-        E = self.keppler.eccAnomaly
-        sinE = self.keppler.sinE
-        cosE = self.keppler.cosE
+        r, v, E, sinE, cosE = self.keppler.orbit( xdata, pars )
 
         drde, drda, drdP, drdp, dvde, dvdP, dvdp = self.keppler.drvdpar( xdata, pars,
                                        E, cosE, sinE )
@@ -220,10 +216,8 @@ class RadialVelocityModel( NonLinearModel ) :
 
         """
         pars = params[:4]
-        r, v = self.keppler.radiusAndTrueAnomaly( xdata, pars )
+        r, v, E, sinE, cosE = self.keppler.orbit( xdata, pars )
 
-        sinE = self.keppler.sinE
-        cosE = self.keppler.cosE
         drdx, dvdx = self.keppler.drvdx( xdata, pars, cosE, sinE )
 
         return - params[1] * numpy.sin( v + params[4] ) * dvdx
@@ -118,13 +118,16 @@ class RandomEngine( Engine ):
 
         self.plotter.start( param=walker.allpars )
 
-        t = 0
-        for tt in range( self.nstep() ) :
-            ptry = param.copy()
-            uval = self.rng.uniform( um, ux, nap )
-            ptry[fi] = self.unit2Domain( problem, uval, kpar=fi )
+        ## Evaluate all trials in one batch
+        nstep = self.nstep()
+        pbatch = numpy.tile( param, ( nstep, 1 ) )
+        ubatch = self.rng.uniform( um, ux, ( nstep, nap ) )
+        pbatch[:,fi] = self.unit2Domain( problem, ubatch[:,fi], kpar=fi )
+
+        Lbatch = self.errdis.logLikelihoodBatch( problem, pbatch )
 
-            Ltry = self.errdis.logLikelihood( problem, ptry )
+        t = 0
+        for ptry, Ltry in zip( pbatch, Lbatch ) :
 
             if Ltry >= lowLhood :       ## Lucky, in 1 step a truely random point
                 self.plotter.move( param, ptry, col=0, sym=2 )
@@ -89,7 +89,9 @@ class ReverseEngine( OrderEngine ):
             ## reverse first t items
             ptry[:t] = ptry[t-1::-1]
 
-            Ltry = self.errdis.logLikelihood( problem, ptry )
+            ## ptry is rolled by src wrt param
+            nlegs = numpy.asarray( self.reversedLegs( problem, 0, t ) )
+            Ltry = self.trialLogL( walker, ptry, nlegs + src, nlegs, lowLhood )
 
             if self.verbose > 4 :
                 print( "Reverse  ", src, t, fmt( lowLhood ), fmt( Ltry ) )
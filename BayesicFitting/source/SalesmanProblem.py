@@ -1,6 +1,7 @@
 import numpy as numpy
 import math
 import warnings
+from scipy.spatial import cKDTree
 
 from .OrderProblem import OrderProblem
 
@@ -42,6 +43,23 @@ class SalesmanProblem( OrderProblem ):
     The number of parameters is equal to the length of the xdata array
     The parameters are initialized at [k for k in range( npars )]
 
+    A move in the order changes only a few legs of the loop. The change in
+    the total cost can be obtained from those legs only, see costChange.
+
+    At construction the nearest neighbours of all nodes are found with a
+    KD-tree (for euclidic, manhattan and spherical distances) or by sorting
+    the rows of the table. For user defined distances they are calculated
+    when needed. See nearestNodes.
+
+    Attributes
+    ----------
+    symmetric : bool
+        True if the cost of a leg does not depend on the direction it is traveled.
+        I.e. no weights and no user defined or asymmetric tabulated distances.
+    neighbours : array of int, shape ( npars, NNEIGHBOURS )
+        indices of the nearest other nodes, nearest first, for each node.
+        Rows of -1 are not yet calculated.
+
     Examples
     --------
     >>> tsm = SalesmanProblem( 100 )
@@ -54,6 +72,7 @@ class SalesmanProblem( OrderProblem ):
     """
 
     DISNAMES = ["User Defined", "Manhattan", "Euclidic", "Spherical", "Tabulated"]
+    NNEIGHBOURS = 10
 
 
     def __init__( self, xdata=None, weights=None, distance="euclid", scale=None, table=None,
@@ -93,6 +112,8 @@ class SalesmanProblem( OrderProblem ):
             self.disname = copy.disname
             self.scale = copy.scale
             self.oneway = copy.oneway
+            self.symmetric = copy.symmetric
+            self.neighbours = copy.neighbours
             return
 
         self.oneway = oneway
@@ -124,6 +145,8 @@ class SalesmanProblem( OrderProblem ):
             warnings.warn( "Unknown distance ", distance, " Using euclidic in stead" )
             self.distance = self.euclidic
 
+        self.neighbours = self.makeNeighbours()
+
         mindis = self.minimumDistance()
         if mindis < 1e-10 :
             print( "SalesmanProblem. minimumDistance less than 1.e-10" )
@@ -131,6 +154,9 @@ class SalesmanProblem( OrderProblem ):
 
         self.scale = scale if scale is not None else mindis 
 
+        self.symmetric = ( self.weights is None and self.disname != self.DISNAMES[0] and
+                ( self.disname != self.DISNAMES[4] or numpy.array_equal( table, numpy.transpose( table ) ) ) )
+
 
     def copy( self ):
         """ Copy method.  """
@@ -173,6 +199,119 @@ class SalesmanProblem( OrderProblem ):
         else :
             return res * self.weights[params]
 
+    def makeNeighbours( self ) :
+        """
+        Return the indices of the nearest other nodes for each node.
+
+        Euclidic, manhattan and spherical distances use a KD-tree; for the latter
+        on the unit vectors, as the chord is monotonous in the distance over
+        the sphere. For tabulated distances the rows of the table are sorted.
+        For user defined distances all rows are -1, to be filled when needed.
+        """
+        np = self.npars
+        nnb = min( self.NNEIGHBOURS, np - 1 )
+
+        if self.disname == self.DISNAMES[0] :
+            return numpy.zeros( ( np, nnb ), dtype=int ) - 1
+
+        if self.disname == self.DISNAMES[4] :
+            table = numpy.array( self.table, dtype=float )
+            numpy.fill_diagonal( table, math.inf )
+            idx = numpy.argpartition( table, nnb - 1, axis=1 )[:,:nnb]
+            srt = numpy.argsort( numpy.take_along_axis( table, idx, axis=1 ), axis=1 )
+            return numpy.take_along_axis( idx, srt, axis=1 )
+
+        if self.disname == self.DISNAMES[3] :
+            xd = self.xdata * math.pi / 180
+            clat = numpy.cos( xd[:,1] )
+            points = numpy.stack( ( clat * numpy.cos( xd[:,0] ), clat * numpy.sin( xd[:,0] ),
+                                    numpy.sin( xd[:,1] ) ), axis=1 )
+        else :
+            points = self.xdata
+
+        norm = 1 if self.disname == self.DISNAMES[1] else 2
+        dis, idx = cKDTree( points ).query( points, k=nnb+1, p=norm )
+
+        ## remove the node itself (or the farthest when it is lost among equals)
+        keep = idx != numpy.arange( np )[:,numpy.newaxis]
+        keep[numpy.all( keep, axis=1 ),-1] = False
+        return idx[keep].reshape( np, nnb )
+
+    def nearestNodes( self, node ) :
+        """
+        Return the indices of the nearest other nodes, nearest first.
+
+        Parameters
+        ----------
+        node : int
+            index of the node
+        """
+        if self.neighbours[node,0] < 0 :
+            np = self.npars
+            dis = self.nodeDistance( numpy.zeros( np, dtype=int ) + node,
+                                     numpy.arange( np, dtype=int ) )
+            dis[node] = math.inf
+            self.neighbours[node] = numpy.argsort( dis, kind="stable" )[:self.neighbours.shape[1]]
+
+        return self.neighbours[node]
+
+    def nodeDistance( self, nodes1, nodes2 ) :
+        """
+        Return the distances between pairs of nodes.
+
+        Parameters
+        ----------
+        nodes1 : array_like of int
+            indices of the departure nodes
+        nodes2 : array_like of int
+            indices of the arrival nodes
+        """
+        nn = len( nodes1 )
+        pars = numpy.append( nodes1, nodes2 )
+        return self.distance( self.xdata, pars, roll=nn )[:nn]
+
+    def costChange( self, params, ptry, olegs, nlegs ) :
+        """
+        Return the change in the sum of result() when going from params to ptry.
+
+        Leg k leaves from node params[k] to node params[k+1].
+        All legs of ptry that are not in nlegs, need to be found, in any order,
+        among the legs of params that are not in olegs.
+        As the cost is independent of where the loop starts, ptry can be
+        rolled with respect to params.
+
+        Parameters
+        ----------
+        params : array_like
+            present order of the nodes
+        ptry : array_like
+            trial order of the nodes
+        olegs : array_like of int
+            positions of the legs in params that are removed
+        nlegs : array_like of int
+            positions of the legs in ptry that are added
+        """
+        np = len( params )
+        olegs = numpy.unique( numpy.asarray( olegs, dtype=int ) % np )
+        nlegs = numpy.unique( numpy.asarray( nlegs, dtype=int ) % np )
+
+        dep = [params[olegs], ptry[nlegs]]
+        arr = [params[( olegs + 1 ) % np], ptry[( nlegs + 1 ) % np]]
+        sign = [-numpy.ones( len( olegs ) ), numpy.ones( len( nlegs ) )]
+
+        if self.oneway :
+            ## the last leg is not traveled; it does not need to be the same one
+            dep += [params[-1:], ptry[-1:]]
+            arr += [params[:1], ptry[:1]]
+            sign += [[1], [-1]]
+
+        dep = numpy.concatenate( dep )
+        cost = self.nodeDistance( dep, numpy.concatenate( arr ) ) * numpy.concatenate( sign )
+        if self.weights is not None :
+            cost *= self.weights[dep]
+
+        return numpy.sum( cost ) / self.scale
+
     def manhattan( self, xdata, pars, roll=1 ) :
         """
         Use Manhattan distances (1-norm)
@@ -296,9 +435,13 @@ class SalesmanProblem( OrderProblem ):
         """
         Return the smallest distance in the data.
 
+        It is found among the nearest neighbours, except for user defined distances.
         """        
         ndata = len( self.xdata[:,0] )
         pars = numpy.arange( ndata, dtype=int )
+        if self.neighbours[0,0] >= 0 :
+            return self.nodeDistance( pars, self.neighbours[:,0] ).min()
+
         md = self.distance( self.xdata, pars ).min()
         for roll in range( 2, ndata ) :
             md = self.distance( self.xdata, pars, roll=roll ).min( initial=md )
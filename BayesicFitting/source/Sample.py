@@ -66,11 +66,19 @@ class Sample( object ):
     allpars : array_like (read only)
         list of parameters, nuisance parameters and hyperparameters
 
+    A Sample obtained from a SampleList is a view on the columns of that list.
+    Its attributes are read from and written into the list. The view remains
+    valid until samples are removed from the list.
+
     Author       Do Kester
 
     """
 
-    def __init__( self, id, parent, start, model, parameters=None, fitIndex=None, copy=None ):
+    VIEWITEMS = ["id", "parent", "start", "model", "parameters", "fitIndex",
+                 "logL", "logW", "hyper", "nuisance"]
+
+    def __init__( self, id, parent, start, model, parameters=None, fitIndex=None, copy=None,
+                  samplelist=None, index=None ):
         """
         Constructor.
 
@@ -90,8 +98,18 @@ class Sample( object ):
             list of indices in allpars that need fitting
         copy : Sample
             the sample to be copied
+        samplelist : SampleList
+            make this Sample a view of an item in the samplelist.
+            All other arguments are ignored.
+        index : int
+            the index of the item in the samplelist
 
         """
+        if samplelist is not None :
+            object.__setattr__( self, "_list", samplelist )
+            object.__setattr__( self, "_index", index )
+            return
+
         self.id = id
         self.parent = parent
         self.start = start
@@ -127,6 +145,10 @@ class Sample( object ):
         Return the value of one of `parameters`, `scale`,
 
         """
+        slist = self.__dict__.get( "_list" )
+        if slist is not None and name in self.VIEWITEMS :
+            return slist.getSampleItem( self._index, name )
+
         if name == "weight" :
             return math.exp( self.logW )
         elif name == "allpars" :
@@ -147,8 +169,12 @@ class Sample( object ):
         """
         Set attributes.
         """
+        slist = self.__dict__.get( "_list" )
         if name == "parameters" :
-            object.__setattr__( self, name, value )
+            if slist is not None :
+                slist.setSampleItem( self._index, name, value )
+            else :
+                object.__setattr__( self, name, value )
             return
 
         key0 = [ "model", "fitIndex" ]
@@ -163,6 +189,10 @@ class Sample( object ):
             raise AttributeError(
                 "Object has no attribute " + name + " of type " + str( value.__class__ ) )
 
+        ## move the checked value into the samplelist
+        if slist is not None :
+            slist.setSampleItem( self._index, name, self.__dict__.pop( name ) )
+
     def __str__( self ) :
         return str( "Sample: %3d parent: %3d model: %s logL: %10.2f logW: %10.2f"%
                     ( self.id, self.parent, self.model.shortName(), self.logL, self.logW ) )
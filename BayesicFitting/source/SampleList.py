@@ -1,7 +1,9 @@
 import numpy as numpy
 import math
+from concurrent.futures import ProcessPoolExecutor
 from . import Tools
 from .Sample import Sample
+from .SampleSink import SampleSink
 
 __author__ = "Do Kester"
 __year__ = 2026
@@ -32,7 +34,7 @@ __status__ = "Perpetual Beta"
 #  *    2017        Do Kester
 
 
-class SampleList( list ):
+class SampleList( object ):
     """
     SampleList is a list of Samples, see @Sample
 
@@ -51,6 +53,17 @@ class SampleList( list ):
     A large set of utility functions is provided to extract the information from the
     SampleList.
 
+    The samples are not kept as Sample objects but in columns: arrays for id, parent,
+    start, logL and logW, a 2-d array of the parameters (zero-padded for dynamic models)
+    and likewise for the hyper and nuisance parameters. The models and fitIndices are
+    kept as (references in) lists. The arrays grow when needed.
+    Indexing or iterating the SampleList returns Samples that are views on the columns.
+
+    The SampleList can stream its samples into a SampleSink on disk, see openSink().
+    Then only the last, unfinished chunk of samples is kept in memory. The averages,
+    the normalization and the evolutions are calculated chunk by chunk.
+    Samples from the sink are (read-only) copies, with fitIndex None.
+
 
     Attributes
     ----------
@@ -94,12 +107,27 @@ class SampleList( list ):
 
     normalized : bool
         True when the weights are normalized to SUM( weights ) = 1
+    sink : None or SampleSink
+        when present, the samples removed by weed() are written into it, or
+        when streaming, it contains the first samples of the list.
+    streaming : bool
+        True when the samples are streamed into the sink.
+
+    result : numpy.array
+        the average result of the model(s), calculated by average()
+    error : numpy.array
+        the standard deviations of the result
+    quantiles : numpy.array
+        the weighted quantiles of the result, when requested in average()
 
 
     Author       Do Kester
 
     """
-    def __init__( self, model, nsamples, parameters=None, fitIndex=None, ndata=1 ):
+    ## maximum number of model results evaluated at once in average()
+    MAXBATCH = 2 ** 22
+
+    def __init__( self, model, nsamples, parameters=None, fitIndex=None, ndata=1, sink=None ):
         """
         Constructor.
 
@@ -115,16 +143,23 @@ class SampleList( list ):
             indicating which parameters need fitting
         ndata : int
             length of the data vector; to be used in stdev calculations
+        sink : None or str or SampleSink
+            stream the samples into this sink (or directory); see openSink()
 
         """
-        super( SampleList, self ).__init__( )
+        self.sink = None
+        self.streaming = False
+        self.clear()
+        self.model = model
         self._count = 0
         self.iteration = 0
         self.logZ = 0.0
         self.info = 0.0
+        self.normalized = False
+        if sink is not None :
+            self.openSink( sink )
         self.addSamples( model, nsamples, parameters, fitIndex=fitIndex )
         self.maxLikelihoodIndex = -1            # always the last one
-        self.normalized = False
         self.ndata = ndata
 
     def addSamples( self, model, nSamples, parameters, fitIndex=None ):
@@ -138,6 +173,389 @@ class SampleList( list ):
             self.append( sample )
             self._count += 1
 
+    # ===== SINK ==============================================================
+    def openSink( self, sink ) :
+        """
+        Stream the samples into the sink.
+
+        The samples already present in the sink, e.g. from a previous run, are
+        the first samples of this list. Later samples are added in memory;
+        when a chunk is full it is written into the sink.
+        Samples removed by weed() are not written into the sink.
+
+        The models of the samples are written into the sink (as pickles) only
+        for dynamic and modifiable models; otherwise they are the model of the list.
+
+        Parameters
+        ----------
+        sink : str or SampleSink
+            the sink or its directory
+        """
+        self.sink = sink if isinstance( sink, SampleSink ) else SampleSink( sink )
+        self.streaming = True
+        self._chunklen = [len( chunk["logW"] ) for chunk in self.sink.chunks()]
+        self._ndisk = sum( self._chunklen )
+        self._count = self._ndisk
+        for key, value in self.sink.getValues().items() :
+            setattr( self, key, value )
+
+    def flush( self ) :
+        """
+        Write all samples in memory into the sink, if streaming; and flush the sink.
+        """
+        if self.sink is None :
+            return
+        if self.streaming and self._size > 0 :
+            self.sink.write( self._sinkColumns() )
+            self._chunklen += [self._size]
+            self._ndisk += self._size
+            self.clear()
+        self.sink.flush()
+
+    def _chunks( self ) :
+        """
+        Generator over the chunks of columns: first those in the sink, then
+        (views on) the columns in memory.
+        """
+        if self._ndisk > 0 :
+            for chunk in self.sink.chunks() :
+                yield chunk
+
+        rows = self._rows()
+        columns = {"id" : self._id[rows], "parent" : self._parent[rows],
+                   "start" : self._start[rows], "logL" : self._logL[rows],
+                   "logW" : self._logW[rows]}
+        for name in self._pars :
+            columns[name] = self._pars[name][rows]
+            columns["n" + name] = self._npars[name][rows]
+        yield columns
+
+    def _diskSamples( self, kchunk=None ) :
+        """
+        Generator over the samples in the sink, as Samples.
+
+        Parameters
+        ----------
+        kchunk : None or int
+            only the samples in this chunk.
+        """
+        for k, chunk in enumerate( self.sink.chunks() ) :
+            if kchunk is not None and k != kchunk :
+                continue
+            columns = { name : chunk[name] for name in chunk.files }
+            models = SampleSink.unpackModels( columns )
+            for i in range( len( columns["logW"] ) ) :
+                sample = Sample( int( columns["id"][i] ), int( columns["parent"][i] ),
+                                 int( columns["start"][i] ),
+                                 self.model if models is None else models[i],
+                                 parameters=columns["parameters"][i,:columns["nparameters"][i]] )
+                for name in ["hyper", "nuisance"] :
+                    if columns["n" + name][i] >= 0 :
+                        setattr( sample, name, columns[name][i,:columns["n" + name][i]] )
+                sample.logL = float( columns["logL"][i] )
+                sample.logW = float( columns["logW"][i] )
+                yield sample
+
+    def _diskSample( self, k ) :
+        """
+        Return the k-th sample from the sink.
+        """
+        ends = numpy.cumsum( self._chunklen )
+        kchunk = int( numpy.searchsorted( ends, k, side="right" ) )
+        i = k - ( ends[kchunk] - self._chunklen[kchunk] )
+        for sample in self._diskSamples( kchunk=kchunk ) :
+            if i == 0 :
+                return sample
+            i -= 1
+
+    # ===== COLUMNS ===========================================================
+    def clear( self ) :
+        """
+        Remove all samples from memory.
+        """
+        if not self.streaming :
+            self._ndisk = 0
+            self._chunklen = []
+        self._lo = 0
+        self._size = 0
+        self._id = numpy.zeros( 0, dtype=int )
+        self._parent = numpy.zeros( 0, dtype=int )
+        self._start = numpy.zeros( 0, dtype=int )
+        self._logL = numpy.zeros( 0, dtype=float )
+        self._logW = numpy.zeros( 0, dtype=float )
+        self._pars = { name : numpy.zeros( ( 0, 0 ), dtype=float )
+                       for name in ["parameters", "hyper", "nuisance"] }
+        self._npars = { name : numpy.zeros( 0, dtype=int )
+                        for name in ["parameters", "hyper", "nuisance"] }
+        self._model = []
+        self._fitIndex = []
+        self._dtype = None
+
+    def _rows( self ) :
+        """
+        Return the slice of the columns that contain the samples.
+
+        The samples occupy the rows [lo:lo+size]; the rows below lo are
+        left by samples removed from the front of the list.
+        """
+        return slice( self._lo, self._lo + self._size )
+
+    def _reserve( self, size ) :
+        """
+        Make the columns large enough to hold size samples after lo.
+
+        When needed, the samples are moved to the start of (new) columns.
+        """
+        cap = len( self._logL )
+        if self._lo + size <= cap :
+            return
+        cap = max( 2 * size, cap, 64 )
+        rows = self._rows()
+
+        def move( column, fill=0 ) :
+            if cap > len( column ) :
+                new = numpy.full( ( cap, ) + column.shape[1:], fill, dtype=column.dtype )
+            else :
+                new = column
+            new[:self._size] = column[rows]
+            return new
+
+        self._id = move( self._id )
+        self._parent = move( self._parent )
+        self._start = move( self._start )
+        self._logL = move( self._logL )
+        self._logW = move( self._logW )
+        for name in self._pars :
+            self._pars[name] = move( self._pars[name] )
+            self._npars[name] = move( self._npars[name], fill=-1 )
+        del self._model[:self._lo]
+        del self._fitIndex[:self._lo]
+        self._lo = 0
+
+    def _widen( self, name, width ) :
+        """
+        Make the 2-d column name at least width wide.
+        """
+        pars = self._pars[name]
+        if width > pars.shape[1] :
+            new = numpy.zeros( ( pars.shape[0], width ), dtype=float )
+            new[:,:pars.shape[1]] = pars
+            self._pars[name] = new
+
+    def getSampleItem( self, k, name ) :
+        """
+        Return the named item of the k-th sample.
+
+        Parameters
+        ----------
+        k : int
+            the index of the sample
+        name : str
+            name of a Sample attribute
+        """
+        k += self._lo
+        if name == "id" :
+            return int( self._id[k] )
+        elif name == "parent" :
+            return int( self._parent[k] )
+        elif name == "start" :
+            return int( self._start[k] )
+        elif name == "logL" :
+            return float( self._logL[k] )
+        elif name == "logW" :
+            return float( self._logW[k] )
+        elif name == "model" :
+            return self._model[k]
+        elif name == "fitIndex" :
+            return self._fitIndex[k]
+
+        np = self._npars[name][k]
+        if np < 0 :
+            raise AttributeError( "Unknown attribute " + name )
+        pars = self._pars[name][k,:np]
+        if name == "parameters" and self._dtype != pars.dtype :
+            return pars.astype( self._dtype )
+        return pars
+
+    def setSampleItem( self, k, name, value ) :
+        """
+        Set the named item of the k-th sample.
+
+        Parameters
+        ----------
+        k : int
+            the index of the sample
+        name : str
+            name of a Sample attribute
+        value : any
+            the value of the item. None for hyper and nuisance removes it.
+        """
+        k += self._lo
+        if name == "id" :
+            self._id[k] = value
+        elif name == "parent" :
+            self._parent[k] = value
+        elif name == "start" :
+            self._start[k] = value
+        elif name == "logL" :
+            self._logL[k] = value
+        elif name == "logW" :
+            self._logW[k] = value
+        elif name == "model" :
+            self._model[k] = value
+        elif name == "fitIndex" :
+            self._fitIndex[k] = value
+        elif value is None :
+            self._npars[name][k] = -1
+        else :
+            value = numpy.asarray( value )
+            if name == "parameters" and self._dtype is None :
+                self._dtype = value.dtype
+            np = len( value )
+            self._widen( name, np )
+            self._pars[name][k,:np] = value
+            self._pars[name][k,np:] = 0
+            self._npars[name][k] = np
+
+    def setSample( self, k, sample ) :
+        """
+        Copy the contents of sample into the k-th item.
+
+        Parameters
+        ----------
+        k : int
+            the index of the sample
+        sample : Sample
+            the sample to be copied
+        """
+        for name in Sample.VIEWITEMS :
+            self.setSampleItem( k, name, getattr( sample, name, None ) )
+
+    def append( self, sample ) :
+        """
+        Append a (copy of the contents of) sample to the list.
+
+        Parameters
+        ----------
+        sample : Sample
+            the sample to be appended
+        """
+        k = self._size
+        self._reserve( k + 1 )
+        self._model.append( None )
+        self._fitIndex.append( None )
+        self._size += 1
+        self.setSample( k, sample )
+
+    def getColumns( self, kstart=0, kend=None ) :
+        """
+        Return a dictionary with copies of the columns of the samples [kstart:kend].
+
+        The items are "id", "parent", "start", "logL", "logW", and "parameters",
+        "hyper" and "nuisance" as 2-d arrays with the number of items in each row
+        in "nparameters", "nhyper" and "nnuisance" (-1 when not present).
+        The models are not included.
+
+        Parameters
+        ----------
+        kstart : int
+            first sample
+        kend : None or int
+            last sample (not included). None is till the end.
+        """
+        kend = self._size if kend is None else kend
+        rows = slice( self._lo + kstart, self._lo + kend )
+
+        columns = {"id" : self._id[rows].copy(), "parent" : self._parent[rows].copy(),
+                   "start" : self._start[rows].copy(), "logL" : self._logL[rows].copy(),
+                   "logW" : self._logW[rows].copy()}
+        for name in self._pars :
+            columns[name] = self._pars[name][rows].copy()
+            columns["n" + name] = self._npars[name][rows].copy()
+        return columns
+
+    def _sinkColumns( self, kstart=0, kend=None ) :
+        """
+        Return the columns of the samples [kstart:kend] as they are written into the sink.
+
+        These are the columns of getColumns, with the models packed into them
+        (see SampleSink.packModels) when the model is dynamic or modifiable.
+
+        Parameters
+        ----------
+        kstart : int
+            first sample
+        kend : None or int
+            last sample (not included). None is till the end.
+        """
+        columns = self.getColumns( kstart, kend )
+        mdl = self.model
+        if mdl is not None and ( mdl.isDynamic() or mdl.isModifiable() ) :
+            kend = self._size if kend is None else kend
+            columns.update( SampleSink.packModels( self._model[self._lo+kstart:self._lo+kend] ) )
+        return columns
+
+    def __len__( self ) :
+        return self._ndisk + self._size
+
+    def _checkIndex( self, k, write=False ) :
+        """
+        Return the index in memory of the k-th sample; negative for samples in the sink.
+        """
+        if k < 0 :
+            k += len( self )
+        if k < 0 or k >= len( self ) :
+            raise IndexError( "SampleList index out of range" )
+        k -= self._ndisk
+        if write and k < 0 :
+            raise ValueError( "Samples in the sink are read only" )
+        return k
+
+    def __getitem__( self, k ) :
+        if isinstance( k, slice ) :
+            return [self[i] for i in range( *k.indices( len( self ) ) )]
+        k = self._checkIndex( k )
+        if k < 0 :
+            return self._diskSample( k + self._ndisk )
+        return Sample( None, None, None, None, samplelist=self, index=k )
+
+    def __setitem__( self, k, sample ) :
+        self.setSample( self._checkIndex( k, write=True ), sample )
+
+    def __delitem__( self, k ) :
+        keep = numpy.ones( len( self ), dtype=bool )
+        if isinstance( k, slice ) :
+            keep[k] = False
+        else :
+            keep[self._checkIndex( k ) + self._ndisk] = False
+        if not numpy.all( keep[:self._ndisk] ) :
+            raise ValueError( "Samples in the sink are read only" )
+        self._keep( keep[self._ndisk:] )
+
+    def _keep( self, keep ) :
+        """
+        Keep only the samples for which keep is True.
+        """
+        n = int( numpy.sum( keep ) )
+        rows = self._rows()
+        for name in ["_id", "_parent", "_start", "_logL", "_logW"] :
+            column = getattr( self, name )
+            column[:n] = column[rows][keep]
+        for name in self._pars :
+            self._pars[name][:n] = self._pars[name][rows][keep]
+            self._npars[name][:n] = self._npars[name][rows][keep]
+        self._model = [m for m, kp in zip( self._model[rows], keep ) if kp]
+        self._fitIndex = [f for f, kp in zip( self._fitIndex[rows], keep ) if kp]
+        self._lo = 0
+        self._size = n
+
+    def __iter__( self ) :
+        if self._ndisk > 0 :
+            for sample in self._diskSamples() :
+                yield sample
+        for k in range( self._size ) :
+            yield Sample( None, None, None, None, samplelist=self, index=k )
+
     def __getattr__( self, name ) :
         if name == "parameters" :
             return self.getParameters()
@@ -172,8 +590,7 @@ class SampleList( list ):
         elif name == "medianScale" :
             return self[self.medianIndex].hypars[0]
         elif name == "modusIndex" :
-            we = list( self.getLogWeightEvolution() )
-            self.modusIndex = we.index( max( we ) )
+            self.modusIndex = self.getExtremeIndex( "logW" )
             return self.modusIndex
         elif name == "modusParameters" :
             return self[self.modusIndex].parameters
@@ -211,15 +628,15 @@ class SampleList( list ):
 
         """
         self.normalized = True
-        lwev = self.getLogWeightEvolution()
+        lwevs = [chunk["logW"] for chunk in self._chunks()]
+        lwevs = [lw for lw in lwevs if len( lw ) > 0]
 
-        lmax = numpy.max( lwev )
-        lwev -= lmax
+        lmax = max( numpy.max( lw ) for lw in lwevs )
+        lswt = math.log( sum( numpy.sum( numpy.exp( lw - lmax ) ) for lw in lwevs ) )
 
-        lswt = math.log( numpy.sum( numpy.exp( lwev ) ) )
-
-        for sample in self :
-            sample.logW -= ( lmax + lswt )
+        self._logW[self._rows()] -= ( lmax + lswt )
+        if self._ndisk > 0 :
+            self.sink.shiftLogW( -( lmax + lswt ) )
 
 
     def add( self, sample ):
@@ -237,6 +654,82 @@ class SampleList( list ):
         self._count += 1
         self.append( sample )
         self.normalized = False
+        if self.streaming and self._size >= self.sink.chunksize :
+            self.flush()
+
+    def addWalkers( self, walkers, logW ) :
+        """
+        Add the walkers as Samples to the list, all at once.
+
+        It is equivalent to add( walker.toSample( lw ) ) for each walker.
+
+        Parameters
+        ----------
+        walkers : list of Walker
+            the walkers to be added
+        logW : array_like
+            log of the weights of the walkers
+        """
+        nw = len( walkers )
+        if nw == 0 :
+            return
+        k0 = self._size
+        self._reserve( k0 + nw )
+        rows = slice( self._lo + k0, self._lo + k0 + nw )
+
+        self._id[rows] = numpy.arange( self._count, self._count + nw )
+        self._parent[rows] = [w.id for w in walkers]            ## where it is from
+        self._start[rows] = [w.start for w in walkers]
+        self._logL[rows] = [w.logL + w.logPrior for w in walkers]
+        self._logW[rows] = logW
+
+        items = {"parameters" : [], "hyper" : [], "nuisance" : []}
+        for w in walkers :
+            np = w.problem.npars
+            nm = w.problem.model.npars if w.problem.model else np
+            items["parameters"] += [w.allpars[:nm]]
+            items["hyper"] += [w.allpars[np:] if len( w.allpars ) > np else None]
+            items["nuisance"] += [w.allpars[nm:np] if np > nm else None]
+            self._model += [w.problem.model]
+            self._fitIndex += [w.fitIndex]
+        if self._dtype is None :
+            self._dtype = numpy.asarray( items["parameters"][0] ).dtype
+        for name, values in items.items() :
+            self._setColumn( name, rows, values )
+
+        self._count += nw
+        self._size += nw
+        self.normalized = False
+        if self.streaming and self._size >= self.sink.chunksize :
+            self.flush()
+
+    def _setColumn( self, name, rows, values ) :
+        """
+        Set the 2-d column name in rows to values.
+
+        Parameters
+        ----------
+        name : str
+            "parameters", "hyper" or "nuisance"
+        rows : slice
+            rows of the column
+        values : list of (array_like or None)
+            one for each row
+        """
+        nps = numpy.asarray( [-1 if v is None else len( v ) for v in values], dtype=int )
+        self._widen( name, max( numpy.max( nps ), 0 ) )
+        self._npars[name][rows] = nps
+
+        block = self._pars[name][rows]
+        if nps[0] >= 0 and numpy.all( nps == nps[0] ) :
+            block[:,:nps[0]] = values
+            block[:,nps[0]:] = 0
+            return
+
+        block[:] = 0
+        for k, value in enumerate( values ) :
+            if value is not None :
+                block[k,:nps[k]] = value
 
     def copy( self, src, des ):
         """
@@ -261,21 +754,42 @@ class SampleList( list ):
 
         If MaxSamples has been set, it is checked whether the size of the
         SampleList exceeds the maximum. If so the Sample with the smallest
-        log( Weight ) is removed.
-        weed( ) is called recursively until the size has the required length.
+        log( Weight ) of the first and the last sample is removed, until
+        the size has the required length.
+
+        Removing a sample from either end takes constant time; the columns
+        are compacted when they need to grow.
+        If a sink is present, the removed samples are written into it.
+        When streaming, no samples are removed.
 
         """
-        if maxsize is None :
+        if maxsize is None or self.streaming :
             return
 
-        while len( self ) > maxsize :
-            if self[0].logW < self[-1].logW :
-                self.remove( self[0] )
+        ## find how many to remove at either end
+        lwev = self._logW
+        klo = self._lo
+        khi = self._lo + self._size
+        while khi - klo > maxsize :
+            if lwev[klo] < lwev[khi-1] :
+                klo += 1
             else :
-                self.remove( self[-1] )
+                khi -= 1
+
+        klo -= self._lo
+        khi -= self._lo
+        if self.sink is not None :
+            if klo > 0 :
+                self.sink.write( self._sinkColumns( 0, klo ) )
+            if khi < self._size :
+                self.sink.write( self._sinkColumns( khi, self._size ) )
+
+        del self._model[self._lo + khi:]
+        del self._fitIndex[self._lo + khi:]
+        self._lo += klo
+        self._size = khi - klo
         return
 
-
     def logPlus( self, x, y ):
         """
         Return  log( exp(x) + exp(y) )
@@ -364,14 +878,17 @@ class SampleList( list ):
 
         aver = 0.0
         stdv = 0.0
-        sw = 0.0
-        for sample in self :
-            wt = math.exp( sample.logW )
-            sw += wt
-            ss = getattr( sample, name )
-            ws = wt * ss
-            aver += ws
-            stdv += ws * ss
+        for chunk in self._chunks() :
+            nps = chunk["n" + name]
+            if len( nps ) == 0 :
+                continue
+            if numpy.any( nps != nps[-1] ) or ( numpy.ndim( aver ) > 0 and len( aver ) != nps[-1] ) :
+                raise ValueError( "Varying number of %s in SampleList" % name )
+
+            wt = numpy.exp( chunk["logW"] )
+            ss = chunk[name][:,:nps[-1]]
+            aver = aver + numpy.dot( wt, ss )
+            stdv = stdv + numpy.dot( wt, ss * ss )
         stdv = numpy.sqrt( numpy.maximum( stdv - aver * aver, 0 ) )
 
         return ( aver, stdv )
@@ -381,14 +898,16 @@ class SampleList( list ):
         """
         Return the index at which the median can be found.
         """
-        sum = 0.0
         k = 0
-        for sample in self :
-            sum += math.exp( sample.logW )
-            if sum < 0.5 :
-                k += 1
-            else :
+        sum = 0.0
+        for chunk in self._chunks() :
+            cumwgt = sum + numpy.cumsum( numpy.exp( chunk["logW"] ) )
+            kc = int( numpy.searchsorted( cumwgt, 0.5, side="left" ) )
+            k += kc
+            if kc < len( cumwgt ) :
                 break
+            if kc > 0 :
+                sum = cumwgt[-1]
         self.medianIndex = k
         return self.medianIndex
 
@@ -402,6 +921,31 @@ class SampleList( list ):
 
         return self[0].model.npchain
 
+    def _column( self, name ) :
+        """
+        Return the named column of all samples.
+
+        For samples in memory only, it is a read-only view.
+        Otherwise the column is collected from the chunks in the sink.
+        2-d columns are as wide as the largest number of items.
+
+        Parameters
+        ----------
+        name : str
+            name of the column: id, parent, start, logL, logW, parameters, hyper, nuisance
+        """
+        items = [chunk[name] for chunk in self._chunks()]
+        if name in self._pars :
+            nitems = [chunk["n" + name] for chunk in self._chunks()]
+            width = max( numpy.max( n, initial=0 ) for n in nitems )
+            items = [item[:,:width] if item.shape[1] >= width else
+                     numpy.pad( item, ( ( 0, 0 ), ( 0, width - item.shape[1] ) ) )
+                     for item in items]
+
+        column = items[0] if len( items ) == 1 else numpy.concatenate( items )
+        column.flags.writeable = False
+        return column
+
     def getParameterEvolution( self, kpar=None ):
         """
         Return the evolution of one or all parameters.
@@ -410,19 +954,22 @@ class SampleList( list ):
         They are zero-padded. Use `getNumberOfParametersEvolution`
         to get the actual number.
 
+        The returned array is read-only; for samples in memory only,
+        it is a view on the SampleList.
+
         Parameters
         ----------
         kpar : int or tuple of ints
             the parameter to be selected. Default: all
 
         """
-        pe = []
-        for sample in self :
-            pe += [sample.parameters]
+        pe = self._column( "parameters" )
+        if self._dtype is not None and self._dtype != pe.dtype :
+            pe = pe.astype( self._dtype )
         if kpar is None :
-            return numpy.asarray( pe )
+            return pe
         else :
-            return numpy.asarray( pe )[:,kpar]
+            return pe[:,kpar]
 
     def getParAndWgtEvolution( self ):
         """
@@ -437,28 +984,23 @@ class SampleList( list ):
         tuple of parameters [NS,NP] and weights [NS]
 
         """
-        pe = []
-        we = []
-        for sample in self :
-            pe += [sample.parameters]
-            we += [sample.logW]
-        return ( numpy.asarray( pe ), numpy.exp( numpy.asarray( we ) ) )
+        return ( self.getParameterEvolution(), self.getWeightEvolution() )
 
 
     def getNumberOfParametersEvolution( self ):
         """ Return the evolution of the number of parameters.  """
-        pe = [sample.model.npchain for sample in self]
+        if self._ndisk > 0 :
+            return self._column( "nparameters" )
+        pe = [model.npchain for model in self._model[self._rows()]]
         return numpy.asarray( pe )
 
     def getScaleEvolution( self ):
         """ Return the evolution of the scale.  """
-        pe = [sample.hypars for sample in self]
-        return numpy.asarray( pe )
+        return self._column( "hyper" )
 
     def getLogLikelihoodEvolution( self ):
         """ Return the evolution of the log( Likelihood ).  """
-        pe = [sample.logL for sample in self]
-        return numpy.asarray( pe )
+        return self._column( "logL" )
 
     def getLogWeightEvolution( self ):
         """
@@ -468,8 +1010,7 @@ class SampleList( list ):
         See #getWeightEvolution( ).
 
         """
-        pe = [sample.logW for sample in self]
-        return numpy.asarray( pe )
+        return self._column( "logW" )
 
     def getWeightEvolution( self ):
         """
@@ -482,70 +1023,194 @@ class SampleList( list ):
 
     def getParentEvolution( self ):
         """ Return the evolution of the parentage.  """
-        pe = []
-        for sample in self :
-            pe += [sample.parent]
-        return numpy.asarray( pe )
+        return self._column( "parent" )
 
     def getStartEvolution( self ):
         """ Return the evolution of the start generation.  """
-        pe = []
-        for sample in self :
-            pe += [sample.start]
-        return numpy.asarray( pe )
+        return self._column( "start" )
 
     def getGeneration( self ):
         """ Return the generation number pertaining to the evolution.  """
-        pe = []
-        for sample in self :
-            pe += [sample.id]
-        return numpy.asarray( pe )
+        return self._column( "id" )
 
     def getLowLogL( self ):
         """
         Return the lowest value of logL in the samplelist, plus its index.
         """
-        low = self[0].logL
-        klo = 0
-        k = 0
-        for sample in self :
-            if sample.logL < low :
-                klo = k
-                low = sample.logL
-            k += 1
-        return ( low, klo )
+        klo = self.getExtremeIndex( "logL", low=True )
+        return ( self[klo].logL, klo )
+
+    def getExtremeIndex( self, name, low=False ) :
+        """
+        Return the (first) index of the maximum (or minimum) of a column.
+
+        Parameters
+        ----------
+        name : str
+            name of the column: logL or logW
+        low : bool
+            find the minimum
+        """
+        find = numpy.argmin if low else numpy.argmax
+        kx = 0
+        vx = None
+        k0 = 0
+        for chunk in self._chunks() :
+            column = chunk[name]
+            if len( column ) > 0 :
+                kc = int( find( column ) )
+                if vx is None or ( column[kc] < vx if low else column[kc] > vx ) :
+                    kx = k0 + kc
+                    vx = column[kc]
+            k0 += len( column )
+        return kx
 
 
     # ===== AVERAGE RESULTS ===================================================
-    def average( self, xdata ):
+    def _modelBlocks( self, chunksize ) :
+        """
+        Generator over blocks of samples that share their model, as
+        ( model, parameters, weights ).
+
+        The blocks contain at most chunksize samples. Static models yield
+        blocks of chunksize; for dynamic or modifiable models a block ends
+        where the model (or its number of parameters) changes.
+
+        Parameters
+        ----------
+        chunksize : int
+            maximum number of samples in a block
+        """
+        kchunk = 0
+        for chunk in self._chunks() :
+            if kchunk < len( self._chunklen ) :
+                models = SampleSink.unpackModels( chunk )
+            else :
+                models = self._model[self._rows()]
+            kchunk += 1
+
+            wgts = numpy.exp( chunk["logW"] )
+            nsmp = len( wgts )
+            if nsmp == 0 :
+                continue
+            if models is None :
+                models = [self.model] * nsmp
+            pars = chunk["parameters"]
+            nps = chunk["nparameters"]
+
+            ends = [k for k in range( 1, nsmp )
+                    if models[k] is not models[k-1] or nps[k] != nps[k-1]]
+            for k0, k1 in zip( [0] + ends, ends + [nsmp] ) :
+                for kb in range( k0, k1, chunksize ) :
+                    ke = min( kb + chunksize, k1 )
+                    yield ( models[kb], pars[kb:ke,:nps[kb]], wgts[kb:ke] )
+
+    def average( self, xdata, quantiles=None, chunksize=None, processes=None ):
         """
         Return the (weighted) average result of the model(s) over the samples.
 
+        The samples are evaluated in blocks: each block of parameter sets is
+        evaluated by the model at once (see Model.resultBatch), and the weighted
+        sums of the results and their squares are accumulated.
+        The blocks are chosen such that they hold at most MAXBATCH results.
+
+        The standard deviations are stored in attribute error.
+        When quantiles are requested, the weighted quantiles of the results
+        are stored in attribute quantiles, an array of shape ( nq, len( xdata ) ).
+        As these need all results at an xdata point, the xdata are processed
+        in blocks too.
+
         Parameters
         ----------
         xdata : array_like
             the input
+        quantiles : None or array_like
+            weighted quantiles to be calculated, e.g. [0.16, 0.5, 0.84]
+        chunksize : None or int
+            number of samples evaluated in one block.
+            None : as many as fit into MAXBATCH results
+        processes : None or int
+            evaluate the blocks in a pool of this many processes.
+            (None or < 2 : no pool)
 
         """
-        result = 0
-        error = 0
-        sumwgt = 0
-        for sample in self :
-            yfit = sample.model.result( xdata, sample.parameters )
-            wgt = math.exp( sample.logW )
-            yw = yfit * wgt
-            result += yw
-            error  += yw * yfit
-            sumwgt += wgt
+        xdata = Tools.toArray( xdata )
+        nx = Tools.length( xdata )
+
+        if quantiles is None :
+            nxb = nx
+        else :
+            nxb = max( 1, min( nx, self.MAXBATCH // max( len( self ), 1 ) ) )
+        if chunksize is None :
+            chunksize = max( 1, self.MAXBATCH // max( nxb, 1 ) )
+
+        pool = None
+        if processes is not None and processes > 1 :
+            pool = ProcessPoolExecutor( max_workers=processes )
+
+        results = []
+        errors = []
+        qvalues = []
+        try :
+            for kx in range( 0, max( nx, 1 ), nxb ) :
+                xblock = xdata if nxb >= nx else xdata[kx:kx+nxb]
+                keep = quantiles is not None
+                tasks = ( ( model, xblock, pars, wgts, keep )
+                            for model, pars, wgts in self._modelBlocks( chunksize ) )
+
+                result = 0
+                error = 0
+                yfits = []
+                wgts = []
+                for res, err, yfit, wgt in self._mapBlocks( tasks, pool, processes ) :
+                    result = result + res
+                    error  = error + err
+                    if keep :
+                        yfits += [yfit]
+                        wgts += [wgt]
+
+                results += [result]
+                errors += [error]
+                if keep :
+                    qvalues += [weightedQuantiles( numpy.concatenate( yfits ),
+                                        numpy.concatenate( wgts ), quantiles )]
+        finally :
+            if pool is not None :
+                pool.shutdown()
+
+        result = numpy.concatenate( results ) if len( results ) > 1 else results[0]
+        error = numpy.concatenate( errors ) if len( errors ) > 1 else errors[0]
 
 #        self.error = numpy.sqrt( ( error - result * result ) / self.ndata )
-        self.error = numpy.sqrt( error - result * result )
+        self.error = numpy.sqrt( numpy.maximum( error - result * result, 0 ) )
         self.result = result
+        if quantiles is not None :
+            self.quantiles = numpy.concatenate( qvalues, axis=1 )
 
         return self.result
 
+    def _mapBlocks( self, tasks, pool, processes ) :
+        """
+        Generator over the evaluated blocks, in order.
+
+        With a pool, the tasks are submitted in batches of 2 per process,
+        so that only a limited number of blocks is kept in memory.
+        """
+        if pool is None :
+            for task in tasks :
+                yield averageBlock( task )
+            return
+
+        batch = []
+        for task in tasks :
+            batch += [task]
+            if len( batch ) >= 2 * processes :
+                yield from pool.map( averageBlock, batch )
+                batch = []
+        yield from pool.map( averageBlock, batch )
+
     # ===== MONTE CARLO ERRORS ===================================================
-    def monteCarloError( self, xdata ):
+    def monteCarloError( self, xdata, chunksize=None, processes=None ):
         """
         Calculates 1-sigma-confidence regions on the model given some inputs.
 
@@ -557,6 +1222,10 @@ class SampleList( list ):
         ----------
         xdata : array_like
            the input vectors.
+        chunksize : None or int
+            number of samples evaluated in one block. See average()
+        processes : None or int
+            evaluate the blocks in a pool of this many processes.
 
         Returns
         -------
@@ -564,7 +1233,56 @@ class SampleList( list ):
             standard deviations at each input point
 
         """
-        if Tools.length( xdata ) != len( self.result ):
-            self.average( xdata )
+        result = getattr( self, "result", None )
+        if result is None or Tools.length( xdata ) != len( result ):
+            self.average( xdata, chunksize=chunksize, processes=processes )
         return self.error
 
+
+def averageBlock( task ) :
+    """
+    Evaluate a block of samples; it can be run in another process.
+
+    Return the weighted sums of the results and of their squares, plus
+    the results and the weights themselves when keep is True (else None).
+
+    Parameters
+    ----------
+    task : tuple
+        ( model, xdata, parameters, weights, keep )
+    """
+    model, xdata, pars, wgts, keep = task
+    yfit = model.resultBatch( xdata, pars )
+    yw = numpy.tensordot( wgts, yfit, axes=1 )
+    yw2 = numpy.tensordot( wgts, yfit * yfit, axes=1 )
+    if keep :
+        return ( yw, yw2, yfit, wgts )
+    return ( yw, yw2, None, None )
+
+def weightedQuantiles( yfit, wgts, quantiles ) :
+    """
+    Return the weighted quantiles of the results, for each xdata point.
+
+    The q-quantile is the first (sorted) result where the cumulative
+    normalized weight reaches q.
+
+    Parameters
+    ----------
+    yfit : array_like of shape ( nsamples, ndata ) ( or ( nsamples, ndata, ndout ) )
+        results of the samples
+    wgts : array_like of shape ( nsamples, )
+        weights of the samples
+    quantiles : array_like
+        the quantiles, between 0 and 1
+    """
+    srt = numpy.argsort( yfit, axis=0, kind="stable" )
+    ysrt = numpy.take_along_axis( yfit, srt, axis=0 )
+    cumwgt = numpy.cumsum( wgts[srt], axis=0 )
+    cumwgt /= cumwgt[-1]
+
+    qvalues = []
+    for q in numpy.atleast_1d( quantiles ) :
+        k = numpy.argmax( cumwgt >= q, axis=0 )
+        qvalues += [numpy.take_along_axis( ysrt, k[numpy.newaxis], axis=0 )[0]]
+    return numpy.asarray( qvalues )
+
@@ -0,0 +1,222 @@
+import numpy as numpy
+import os
+import glob
+import pickle
+
+__author__ = "Do Kester"
+__year__ = 2026
+__license__ = "GPL3"
+__version__ = "3.3.0"
+__url__ = "https://www.bayesicfitting.nl"
+__status__ = "Perpetual Beta"
+
+#  * This file is part of the BayesicFitting package.
+#  *
+#  * BayesicFitting is free software: you can redistribute it and/or modify
+#  * it under the terms of the GNU Lesser General Public License as
+#  * published by the Free Software Foundation, either version 3 of
+#  * the License, or ( at your option ) any later version.
+#  *
+#  * BayesicFitting is distributed in the hope that it will be useful,
+#  * but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  * GNU Lesser General Public License for more details.
+#  *
+#  * The GPL3 license can be found at <http://www.gnu.org/licenses/>.
+#  *
+#  *    2026 Do Kester
+
+
+class SampleSink( object ):
+    """
+    SampleSink writes samples to disk, in chunks.
+
+    The samples are offered as columns, as obtained from SampleList.getColumns().
+    They are collected until a chunk is full; then the chunk is written as
+    a numpy .npz file into the directory of the sink. The models are only
+    written (as pickles) when they are offered in the columns, see packModels().
+
+    Chunks that are already present in the directory are kept; new chunks are
+    numbered after them. The chunks are read one by one; within a chunk a
+    column is only read when it is used.
+
+    A SampleList can stream all its samples into a sink and read them back
+    from it, see SampleList.openSink().
+
+    Examples
+    --------
+    >>> ns = NestedSampler( xdata, model, ydata, maxsize=10000 )
+    >>> ns.samples.sink = SampleSink( "evicted" )
+    >>> evid = ns.sample()          # the weeded samples are in "evicted"
+
+    Attributes
+    ----------
+    path : str
+        directory with the chunk files
+    chunksize : int
+        number of samples in a chunk
+    nchunks : int
+        number of chunks written
+    buffer : list of dict
+        columns not yet written
+
+    Author       Do Kester.
+
+    """
+    def __init__( self, path, chunksize=10000 ):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        path : str
+            directory with the chunk files. It is made when not present.
+        chunksize : int
+            number of samples in a chunk
+        """
+        self.path = path
+        self.chunksize = chunksize
+        self.buffer = []
+        self.nbuffer = 0
+        os.makedirs( path, exist_ok=True )
+        self.nchunks = len( self.chunkFiles() )
+
+    def __str__( self ) :
+        return "SampleSink at %s" % self.path
+
+    def chunkFiles( self ) :
+        """ Return the sorted list of chunk files.  """
+        return sorted( glob.glob( os.path.join( self.path, "chunk*.npz" ) ) )
+
+    def write( self, columns ) :
+        """
+        Add samples to the sink. Full chunks are written.
+
+        Parameters
+        ----------
+        columns : dict
+            the columns of the samples, see SampleList.getColumns()
+        """
+        n = len( columns["logW"] )
+        if n == 0 :
+            return
+        self.buffer.append( columns )
+        self.nbuffer += n
+        if self.nbuffer >= self.chunksize :
+            self.flush()
+
+    def flush( self ) :
+        """
+        Write the collected samples as a chunk.
+        """
+        if self.nbuffer == 0 :
+            return
+
+        chunk = {}
+        for name in self.buffer[0] :
+            items = [cols[name] for cols in self.buffer]
+            if items[0].ndim == 2 :
+                width = max( item.shape[1] for item in items )
+                items = [numpy.pad( item, ( ( 0, 0 ), ( 0, width - item.shape[1] ) ) )
+                         for item in items]
+            chunk[name] = numpy.concatenate( items )
+
+        filename = os.path.join( self.path, "chunk%06d.npz" % self.nchunks )
+        numpy.savez( filename, **chunk )
+        self.nchunks += 1
+        self.buffer = []
+        self.nbuffer = 0
+
+    def __len__( self ) :
+        """ Return the number of samples in the written chunks and in the buffer. """
+        n = self.nbuffer
+        for chunk in self.chunks() :
+            n += len( chunk["logW"] )
+        return n
+
+    def chunks( self ) :
+        """
+        Generator over the written chunks.
+
+        The chunks are (lazily read) dictionaries of columns, which are only
+        valid until the next chunk is requested.
+        """
+        for filename in self.chunkFiles() :
+            with numpy.load( filename ) as chunk :
+                yield chunk
+
+    def shiftLogW( self, shift ) :
+        """
+        Add shift to the logW of all samples. The chunks are rewritten.
+
+        Parameters
+        ----------
+        shift : float
+            value to be added
+        """
+        for columns in self.buffer :
+            columns["logW"] = columns["logW"] + shift
+
+        for filename in self.chunkFiles() :
+            with numpy.load( filename ) as chunk :
+                columns = { name : chunk[name] for name in chunk.files }
+            columns["logW"] += shift
+            ## outside the chunk*.npz pattern, so it is never read as a chunk
+            tmpname = os.path.join( self.path, "tmp_" + os.path.basename( filename ) )
+            numpy.savez( tmpname, **columns )
+            os.replace( tmpname, filename )
+
+    def putValues( self, **values ) :
+        """
+        Store scalar values, like logZ and info, with the samples.
+
+        Parameters
+        ----------
+        values : dict
+            names and values
+        """
+        values = dict( self.getValues(), **values )
+        numpy.savez( os.path.join( self.path, "values.npz" ), **values )
+
+    def getValues( self ) :
+        """
+        Return the stored values as a dictionary.
+        """
+        filename = os.path.join( self.path, "values.npz" )
+        if not os.path.isfile( filename ) :
+            return {}
+        with numpy.load( filename ) as values :
+            return { name : values[name].item() for name in values.files }
+
+    @staticmethod
+    def packModels( models ) :
+        """
+        Return the models as pickles, in columns "model" and "nmodel".
+
+        Parameters
+        ----------
+        models : list of Model
+            the models to be packed
+        """
+        pickles = [pickle.dumps( mdl ) for mdl in models]
+        return {"model" : numpy.frombuffer( b"".join( pickles ), dtype=numpy.uint8 ),
+                "nmodel" : numpy.asarray( [len( p ) for p in pickles], dtype=int )}
+
+    @staticmethod
+    def unpackModels( chunk ) :
+        """
+        Return the list of models from a chunk; None if no models are present.
+
+        Only unpack models from sinks you trust.
+
+        Parameters
+        ----------
+        chunk : dict
+            columns of a chunk
+        """
+        if "model" not in chunk :
+            return None
+        data = chunk["model"].tobytes()
+        ends = numpy.cumsum( chunk["nmodel"] )
+        return [pickle.loads( data[e-n:e] ) for n, e in zip( chunk["nmodel"], ends )]
+
@@ -103,7 +103,9 @@ class ShuffleEngine( OrderEngine ):
             ptry[:ent] = self.rng.permutation( ptry[:ent] )
 
 
-            Ltry = self.errdis.logLikelihood( problem, ptry )
+            ## ptry is rolled by -src wrt param
+            nlegs = numpy.arange( -1, min( ent, np ) )
+            Ltry = self.trialLogL( walker, ptry, nlegs - src, nlegs, lowLhood )
 
             if self.verbose > 4 :
                 print( "Shuffle  ", src, ent, t, fmt( lowLhood ), fmt( Ltry ) )
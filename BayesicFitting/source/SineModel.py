@@ -129,6 +129,7 @@ class SineModel( NonLinearModel ):
         setatt( self, "phase", phase )
         if phase :
             setatt( self, "baseResult", self.phaseResult )
+            setatt( self, "baseResultBatch", self.phaseResultBatch )
             setatt( self, "basePartial", self.phasePartial )
             setatt( self, "baseDerivative", self.phaseDerivative )
             setatt( self, "baseName", self.phaseName )
@@ -155,6 +156,22 @@ class SineModel( NonLinearModel ):
         result = params[1] * numpy.cos( x ) + params[2] * numpy.sin( x )
         return result
 
+    def baseResultBatch( self, xdata, params2d ):
+        """
+        Returns the results of the model function for a batch of parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params2d : 2d array_like
+            values for the parameters, one set per row.
+
+        """
+        x = self.TWOPI * xdata * params2d[:,0:1]
+        result = params2d[:,1:2] * numpy.cos( x ) + params2d[:,2:3] * numpy.sin( x )
+        return result
+
     def basePartial( self, xdata, params, parlist=None ):
         """
         Returns the partials at the input value.
@@ -245,6 +262,22 @@ class SineModel( NonLinearModel ):
         result = params[0] * numpy.sin( x )
         return result
 
+    def phaseResultBatch( self, xdata, params2d ):
+        """
+        Returns the results of the model function for a batch of parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params2d : 2d array_like
+            values for the parameters, one set per row.
+
+        """
+        x = self.TWOPI * xdata * params2d[:,1:2] + params2d[:,2:3]
+        result = params2d[:,0:1] * numpy.sin( x )
+        return result
+
 
     def phasePartial( self, xdata, params, parlist=None ):
         """
@@ -38,6 +38,10 @@ class StartEngine( Engine ):
 
     It is used to initialize the set of trial samples.
 
+    When a trial fails, the next trials are evaluated in batches of growing
+    size (upto MAXBATCH), using the batched logLikelihood of the
+    ErrorDistribution. Dynamic models are tried one at a time.
+
     Attributes from Engine
     ----------------------
     walkers, errdis, maxtrials, nstep, slow, rng, report, phantoms, verbose
@@ -45,6 +49,8 @@ class StartEngine( Engine ):
     Author       Do Kester.
 
     """
+    MAXBATCH = 64
+
     #  *********CONSTRUCTORS***************************************************
     def __init__( self, walkers, errdis, copy=None, **kwargs ):
         """
@@ -104,6 +110,7 @@ class StartEngine( Engine ):
             print( "Start  wlkr ", fmt( walker.id ), model.shortName(), fmt( model.npars ) )
 
         ktry = 0
+        nbatch = 1
         while True :
 
             if model.isDynamic() :
@@ -134,21 +141,28 @@ class StartEngine( Engine ):
                 if nhyp > 0 :
                     ptry = numpy.append( ptry, walker.allpars[-nhyp:] )
 
-            uval = self.rng.rand( len( fitIndex ) )
+            uval = self.rng.rand( nbatch, len( fitIndex ) )
 
-            ptry[fitIndex] = self.unit2Domain( problem, uval, kpar=fitIndex )
+            pbatch = numpy.tile( ptry, ( nbatch, 1 ) )
+            pbatch[:,fitIndex] = self.unit2Domain( problem, uval, kpar=fitIndex )
 
-            logL = self.errdis.logLikelihood( problem, ptry )
+            lbatch = self.errdis.logLikelihoodBatch( problem, pbatch )
 
             if self.verbose > 4 :
-                print( fmt( ptry, max=None ), "  logL   ", fmt( logL ) )
+                for p, L in zip( pbatch, lbatch ) :
+                    print( fmt( p, max=None ), "  logL   ", fmt( L ) )
 
-            if math.isfinite( logL ) :
+            kfin = numpy.where( numpy.isfinite( lbatch ) )[0]
+            if len( kfin ) > 0 :
+                ptry = pbatch[kfin[0]]
+                logL = lbatch[kfin[0]]
                 break
             elif ktry > ( maxtrials + walker.id ) :
                 raise RuntimeError( "Cannot find valid starting solutions at walker %d" % walker.id )
             else :
-                ktry += 1
+                ktry += nbatch
+                if not model.isDynamic() :
+                    nbatch = min( 2 * nbatch, self.MAXBATCH )
 
         self.setWalker( walker.id, problem, ptry, logL, fitIndex=fitIndex )
 
@@ -210,7 +210,7 @@ class StellarOrbitModel( NonLinearModel ):
             from .Formatter import fma
             print( "pars   ", fma( params ) )
 
-        ( rho, v ) = self.keppler.radiusAndTrueAnomaly( xdata, params[:4] )
+        ( rho, v, E, sinE, cosE ) = self.keppler.orbit( xdata, params[:4] )
 
         ## add the longitude (along the orbit) from the ascending node to the periastron
         vp = v + asclon
@@ -261,11 +261,9 @@ class StellarOrbitModel( NonLinearModel ):
         dfdt = numpy.zeros( ( len( xdata ), 2 ), dtype=float )
 
         p = params[:4]
-        r, v = self.keppler.radiusAndTrueAnomaly( xdata, p )
+        r, v, E, sinE, cosE = self.keppler.orbit( xdata, p )
 
-        cosE = self.keppler.cosE
         cosE = numpy.where( cosE == -1, -0.99999, cosE )
-        sinE = self.keppler.sinE
         drdt, dvdt = self.keppler.drvdx( xdata, p, cosE, sinE )
 
         vp = v + asclon
@@ -345,12 +343,9 @@ class StellarOrbitModel( NonLinearModel ):
         asclon = params[6]
 
         p = params[:4]
-        r, v = self.keppler.radiusAndTrueAnomaly( xdata, p )
+        r, v, E, sinE, cosE = self.keppler.orbit( xdata, p )
 
-        cosE = self.keppler.cosE
         cosE = numpy.where( cosE == -1, -0.99999, cosE )
-        sinE = self.keppler.sinE
-        E = self.keppler.eccAnomaly
 
         ## dr.., dv.. derivatives of r and v to each op the parameters
         ##   e : eccentricity, a : semimajor axis, P : period, and p : phase
@@ -104,7 +104,8 @@ class SwitchEngine( OrderEngine ):
 
         ptry[src], ptry[des] = ptry[des], ptry[src]
 
-        Ltry = self.errdis.logLikelihood( problem, ptry )
+        legs = [src - 1, src, des - 1, des]
+        Ltry = self.trialLogL( walker, ptry, legs, legs, lowLhood )
 
         if self.verbose > 4 :
             print( "Switch   ", src, des, fmt( lowLhood ), fmt( Ltry ) )
@@ -180,7 +180,7 @@ class Walker( object ):
         return str( "Walker: %3d" % self.id )
 
 
-    def check( self, errdis ) :
+    def check( self, errdis, priorVector=None ) :
         """
         Perform some sanity checks.
 
@@ -188,6 +188,8 @@ class Walker( object ):
         ----------
         errdis : ErrorDistribution
             to check logL
+        priorVector : None or PriorVector
+            priors of the fitted parameters, to check the limits in one go.
         """
         if self.problem.model is None :
             np = self.problem.npars
@@ -214,7 +216,9 @@ class Walker( object ):
         if nhyp > 0 and self.allpars[-nhyp] < 0 :
             raise ValueError( "Sample has non-positive hyperparameter: %f" % self.allpars[-nhyp] )
 
-        if self.fitIndex is not None :
+        if self.fitIndex is not None and priorVector is not None :
+            priorVector.checkLimit( self.allpars[self.fitIndex] )
+        elif self.fitIndex is not None :
             for ki in self.fitIndex :
                 if ki < 0 :
                     errdis.hyperpar[ki].prior.checkLimit( self.allpars[ki] )
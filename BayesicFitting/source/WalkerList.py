@@ -1,4 +1,5 @@
 import numpy as numpy
+import bisect
 from .Tools import setAttribute as setatt
 from .Formatter import formatter as fmt
 from .Walker import Walker
@@ -38,6 +39,10 @@ class WalkerList( list ):
 
     It is the working ensemble of NestedSampler.
 
+    Alongside the walkers it keeps a list of their logL, such that positions
+    in a list, sorted on logL, are found by bisection. All changes to the list
+    should go through the methods of WalkerList, to keep both in step.
+
 
     Attributes
     ----------
@@ -77,10 +82,12 @@ class WalkerList( list ):
         if walkerlist is not None :
             super( WalkerList, self ).__init__( walkerlist )
             self._count = len( walkerlist )
+            self._logL = [w.logL for w in self]
             return
 
         super( WalkerList, self ).__init__( )
         self._count = 0
+        self._logL = []
 
         if problem is not None :
             walker = Walker( 0, problem, allpars, fitIndex )
@@ -95,6 +102,7 @@ class WalkerList( list ):
                 wlkr.fitIndex = walker.fitIndex.copy()
             wlkr.id = self._count
             self.append( wlkr )
+            self._logL.append( wlkr.logL )
             self._count += 1
 
     # ===========================================================================
@@ -112,10 +120,12 @@ class WalkerList( list ):
 
         if index < len( self ) :
             self[index] = walker
+            self._logL[index] = walker.logL
         else :
             walker.id = self._count
             self._count += 1
             self.append( walker )
+            self._logL.append( walker.logL )
 
     def copy( self, src, des, wlist=None, start=0 ):
         """
@@ -141,6 +151,7 @@ class WalkerList( list ):
         setatt( self[des], "parent", src )
         setatt( self[des], "start", start )
         setatt( self[des], "step", 0 )
+        self._logL[des] = self[des].logL
 
 
     def logPlus( self, x, y ):
@@ -155,43 +166,67 @@ class WalkerList( list ):
                 None if list is empty
                 len  if no item applies 
 
+        Precondition: self is ordered on logL
+
         Parameters
         ----------
         lowL : float
             low Likelihood
         """
-        return next( ( k for k,w in enumerate( self ) if w.logL > lowL ), 
-                    None if len( self ) == 0 else len( self)  )
-
+        if len( self ) == 0 :
+            return None
+        return bisect.bisect_right( self._logL, lowL )
 
     def insertWalker( self, walker ):
         """
         Insert walker to this list keeping it sorted in logL
 
+        Precondition: self is ordered on logL
+
         Parameters
         ----------
         walker : Walker
             the list to take to copy from
         """
-        klow = self.firstIndex( walker.logL )
-        if klow is None :
+        if len( self ) == 0 :
             self.setWalker( walker, 0 )
             return self
 
-        cnt = self._count
+        klow = bisect.bisect_right( self._logL, walker.logL )
+        self.insert( klow, walker )
+        self._logL.insert( klow, walker.logL )
+        self._count += 1
+
+        return self
+
+    def sortOnLogL( self, nlow=None ) :
+        """
+        Sort the list on logL, in place.
 
-        wl = WalkerList( walkerlist=[walker] )
+        When only the first nlow walkers have been changed, the remainder of the
+        list is still sorted. The nlow walkers are inserted in it by bisection.
+        The result is the same as that of a (stable) sort of the whole list.
 
-        if len( self[klow:] ) > 0 :
-            wl = wl + WalkerList( walkerlist=self[klow:] )
+        Parameters
+        ----------
+        nlow : None or int
+            None    sort the whole list
+            int     number of walkers at the start of the list, that are out of order
+        """
+        if nlow is None or nlow >= len( self ) :
+            self.sort( key=self.getLogL )
+            self._logL = [w.logL for w in self]
+            return self
 
-        if len( self[:klow] ) > 0 :
-            self = WalkerList( walkerlist=self[:klow] ) + wl
-        else :
-            self = wl
+        low = self[:nlow]
+        del self[:nlow]
+        del self._logL[:nlow]
 
-        self = WalkerList( walkerlist=self )
-        self._count = cnt + 1
+        ## insert from the back: equal logLs keep their original order
+        for walker in reversed( low ) :
+            k = bisect.bisect_left( self._logL, walker.logL )
+            self.insert( k, walker )
+            self._logL.insert( k, walker.logL )
 
         return self
 
@@ -207,6 +242,8 @@ class WalkerList( list ):
         """
         Return WalkerList with all LogL > lowL
 
+        The low walkers are removed in place.
+
         Precondition: self is ordered on logL
 
         Parameters
@@ -214,9 +251,9 @@ class WalkerList( list ):
         lowL : float
             low Likelihood
         """
-        cnt = self._count
-        self = WalkerList( walkerlist=self[self.firstIndex( lowL ):] )
-        self._count = cnt
+        klow = bisect.bisect_right( self._logL, lowL )
+        del self[:klow]
+        del self._logL[:klow]
         return self
 
 
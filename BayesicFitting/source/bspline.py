@@ -3,50 +3,57 @@
 
 # from __future__ import division
 
-from functools import partial
+from collections import OrderedDict
 import numpy as np
 
-class memoize(object):
+class LRUCache(object):
     """
-       Cache the return value of a method
-
-       This class is meant to be used as a decorator of methods. The return value
-       from a given method invocation will be cached on the instance whose method
-       was invoked. All arguments passed to a method decorated with memoize must
-       be hashable.
-
-       If a memoized method is invoked directly on its class the result will not
-       be cached. Instead the method will be invoked like a static method:
-       class Obj(object):
-           @memoize
-           def add_to(self, arg):
-               return self + arg
-       Obj.add_to(1) # not enough arguments
-       Obj.add_to(1, 2) # returns 3, result is not cached
-
-       Script borrowed from here:
-       MIT Licensed, attributed to Daniel Miller, Wed, 3 Nov 2010
-       http://code.activestate.com/recipes/577452-a-memoize-decorator-for-instance-methods/
+       Cache of limited size in bytes for arrays computed from an array of sites.
+
+       An item is found by the length of the sites and a few of their values.
+       It is only used when the sites are equal to a copy that is kept with
+       the item. So a lookup costs a comparison of the sites, but no copy,
+       no hash of the sites and no evaluation.
+       When the cache exceeds maxbytes, the least recently used items are
+       dropped. Items larger than maxbytes are not cached.
+
+       The cached arrays are made read-only as they are shared by all callers.
     """
-    def __init__(self, func):
-        self.func = func
-    def __get__(self, obj, objtype=None):
-        if obj is None:
-            return self.func
-        return partial(self, obj)
-    def __call__(self, *args, **kw):
-        obj = args[0]
-        try:
-            cache = obj.__cache
-        except AttributeError:
-            cache = obj.__cache = {}
-        key = (self.func, args[1:], frozenset(kw.items()))
-        try:
-            res = cache[key]
-        except KeyError:
-            res = cache[key] = self.func(*args, **kw)
-        return res
+    def __init__(self, maxbytes=2**25):
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self.items = OrderedDict()
+
+    def __len__(self):
+        return len(self.items)
 
+    def get(self, key, tau, func):
+        """
+        Return the item at key for the sites tau; compute it as func() when not present.
+        """
+        key = key + (len(tau), tau[::max(1, len(tau) // 8)].tobytes())
+        item = self.items.get(key)
+        if item is not None and np.array_equal(item[0], tau):
+            self.items.move_to_end(key)
+            return item[1]
+
+        value = func()
+        if item is not None:
+            del self.items[key]
+            self.nbytes -= item[2]
+
+        values = value if isinstance(value, tuple) else (value,)
+        nbytes = tau.nbytes + sum(v.nbytes for v in values)
+        if nbytes > self.maxbytes:
+            return value
+
+        for v in values:
+            v.flags.writeable = False
+        self.items[key] = (tau.copy(), value, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.maxbytes:
+            self.nbytes -= self.items.popitem(last=False)[1][2]
+        return value
 
 
 class Bspline():
@@ -60,89 +67,110 @@ class Bspline():
                   knots, 1 -> piecewise linear between knots, etc.
     last : bool
         if True the xi equal to the value of the last knot are also taken along
+    cachebytes : int
+        maximum size in bytes of the cached bands of basis functions
 
     outputs:
            basis object that is callable to evaluate basis functions at given
            values of knot span
     """
 
-    def __init__(self, knot_vector, order, last=False ):
+    def __init__(self, knot_vector, order, last=False, cachebytes=2**25 ):
         """Initialize attributes"""
-        self.knot_vector = np.array(knot_vector)
-        if last :
-            self.last_knot = np.full_like( knot_vector, knot_vector[0] - 1 )
-            self.last_knot[-order-1] = knot_vector[-order-1]
+        self.knot_vector = np.array(knot_vector, dtype=float)
         self.last = last
         self.p = order
+        self.nbasis = len(self.knot_vector) - order - 1
+        self.cache = LRUCache(cachebytes)
 
-        #Dummy calls to the functions for memory storage
-        self.__call__(0.0)
-        self.d(0.0)
-
+    def __getstate__(self):
+        """Do not pickle the cached arrays."""
+        state = self.__dict__.copy()
+        state["cache"] = LRUCache(self.cache.maxbytes)
+        return state
 
-    def __basis0(self, xi):
-        """Order zero basis"""
-
-        upper =  xi < self.knot_vector[1:]
-        if self.last :
-            upper = np.any( [upper, xi == self.last_knot[1:]], axis=0 )
-
-        b = np.where(np.all([self.knot_vector[:-1] <= xi, upper], axis=0 ), 1.0, 0.0 )
-        return b
-
-    def __basis(self, xi, p, compute_derivatives=False):
+    def __basis(self, tau, span, p):
         """
-        Recursive Cox - de Boor function to compute basis functions and
-           optionally their derivatives
+        Cox - de Boor recursion for the (p + 1) nonzero basis functions of
+           order p in the given knot spans, vectorized over the sites
         """
+        t = self.knot_vector
+        B = np.zeros((tau.shape[0], p + 1), dtype=float)
+        B[:,0] = 1.0
+        left = np.empty((tau.shape[0], p + 1), dtype=float)
+        right = np.empty((tau.shape[0], p + 1), dtype=float)
+        for j in range(1, p + 1):
+            left[:,j] = tau - t[span + 1 - j]
+            right[:,j] = t[span + j] - tau
+            saved = np.zeros_like(tau)
+            for r in range(j):
+                temp = B[:,r] / (right[:,r + 1] + left[:,j - r])
+                B[:,r] = saved + right[:,r + 1] * temp
+                saved = left[:,j - r] * temp
+            B[:,j] = saved
+        return B
+
+    def __band(self, tau, deriv_order):
+        """
+        Compute the nonzero basis functions (or their derivatives) at all sites.
+        """
+        t = self.knot_vector
+        p = self.p
+        n = tau.shape[0]
 
-        if p == 0:
-            return self.__basis0(xi)
-        else:
-            basis_p_minus_1 = self.__basis(xi, p - 1)
-
-        first_term_numerator = xi - self.knot_vector[:-p]
-        first_term_denominator = self.knot_vector[p:] - self.knot_vector[:-p]
-
-        second_term_numerator = self.knot_vector[(p + 1):] - xi
-        second_term_denominator = (self.knot_vector[(p + 1):] -
-                                   self.knot_vector[1:-p])
-
-
-        #Change numerator in last recursion if derivatives are desired
-        if compute_derivatives and p == self.p:
+        # knot span of each site; the last knot belongs to the last nonempty span
+        span = np.searchsorted(t, tau, side='right') - 1
+        span = np.clip(span, p, len(t) - p - 2)
 
-            first_term_numerator = p
-            second_term_numerator = -p
+        q = p - deriv_order
+        if q < 0:
+            B = np.zeros((n, p + 1), dtype=float)
+        else:
+            B = self.__basis(tau, span, q)
 
-        #Disable divide by zero error because we check for it
+        # raise the order by differentiation:
+        #   D N_i,q = q * ( N_i,q-1 / (t_i+q - t_i) - N_i+1,q-1 / (t_i+q+1 - t_i+1) )
         with np.errstate(divide='ignore', invalid='ignore'):
-            first_term = np.where(first_term_denominator != 0.0,
-                                  (first_term_numerator /
-                                   first_term_denominator), 0.0)
-            second_term = np.where(second_term_denominator != 0.0,
-                                   (second_term_numerator /
-                                    second_term_denominator), 0.0)
-
-        return  (first_term[:-1] * basis_p_minus_1[:-1] +
-                 second_term * basis_p_minus_1[1:])
-
+            for q in range(max(q, 0) + 1, p + 1):
+                D = np.zeros((n, q + 1), dtype=float)
+                for j in range(q + 1):
+                    i = span - q + j
+                    if j > 0:
+                        den = t[i + q] - t[i]
+                        D[:,j] += np.where(den != 0.0, q * B[:,j - 1] / den, 0.0)
+                    if j < q:
+                        den = t[i + q + 1] - t[i + 1]
+                        D[:,j] -= np.where(den != 0.0, q * B[:,j] / den, 0.0)
+                B = D
+
+        # outside the knots all basis functions are zero
+        inside = (t[0] <= tau) & (tau < t[-1]) if not self.last else \
+                 (t[0] <= tau) & (tau <= t[-1])
+        B[~inside,:] = 0.0
+
+        return B, span - p
+
+    def __dense(self, tau, deriv_order):
+        """
+        Compute the full collocation matrix from the (cached) band.
+        """
+        B, first = self.band(tau, deriv_order=deriv_order)
+        A = np.zeros((tau.shape[0], self.nbasis), dtype=float)
+        rows = np.arange(tau.shape[0])[:,np.newaxis]
+        A[rows, first[:,np.newaxis] + np.arange(self.p + 1)] = B
+        return A
 
-    @memoize
     def __call__(self, xi):
         """
-        Convenience function to make the object callable.  Also 'memoized'
-           for speed.
+        Convenience function to make the object callable.
         """
-        return self.__basis(xi, self.p, compute_derivatives=False)
+        return self.__dense(np.atleast_1d(np.asarray(xi, dtype=float)), 0)[0]
 
-    @memoize
     def d(self, xi):
         """
         Convenience function to compute derivate of basis functions.
-           'Memoized' for speed.
         """
-        return self.__basis(xi, self.p, compute_derivatives=True)
+        return self.__dense(np.atleast_1d(np.asarray(xi, dtype=float)), 1)[0]
 
     def plot(self):
         """
@@ -191,45 +219,6 @@ class Bspline():
         return plt.show()
         """
 
-    def __diff_internal(self):
-        """
-        Differentiate a B-spline once, and return the resulting coefficients and Bspline objects.
-
-        This preserves the Bspline object nature of the data, enabling recursive implementation
-        of higher-order differentiation (see `diff`).
-
-        The value of the first derivative of `B` at a point `x` can be obtained as::
-
-            def diff1(B, x):
-                terms = B.__diff_internal()
-                return sum( ci*Bi(x) for ci,Bi in terms )
-
-        Returns:
-            tuple of tuples, where each item is (coefficient, Bspline object).
-
-        See:
-            `diff`: differentiation of any order >= 0
-        """
-        assert self.p > 0, "order of Bspline must be > 0"  # we already handle the other case in diff()
-
-        # https://www.cs.mtu.edu/~shene/COURSES/cs3621/NOTES/spline/B-spline/bspline-derv.html
-        #
-        t    = self.knot_vector
-        p    = self.p
-        Bi   = Bspline( t[:-1], p-1 )
-        Bip1 = Bspline( t[1:],  p-1 )
-
-        numer1 = +p
-        numer2 = -p
-        denom1 = t[p:-1]   - t[:-(p+1)]
-        denom2 = t[(p+1):] - t[1:-p]
-
-        with np.errstate(divide='ignore', invalid='ignore'):
-            ci   = np.where(denom1 != 0., (numer1 / denom1), 0.)
-            cip1 = np.where(denom2 != 0., (numer2 / denom2), 0.)
-
-        return ( (ci,Bi), (cip1,Bip1) )
-
 
     def diff(self, order=1):
         """
@@ -248,27 +237,35 @@ class Bspline():
         if order == 0:
             return self.__call__
 
-        if order > self.p:   # identically zero, but force the same output format as in the general case
-            dummy = self.__call__(0.)  # get number of basis functions and output dtype
-            nbasis = dummy.shape[0]
-            return lambda x: np.zeros( (nbasis,), dtype=dummy.dtype )  # accept but ignore input x
+        return lambda x: self.__dense(np.atleast_1d(np.asarray(x, dtype=float)), order)[0]
 
-        # At each differentiation, each term maps into two new terms.
-        # The number of terms in the result will be 2**order.
-        #
-        # This will cause an exponential explosion in the number of terms for high derivative orders,
-        # but for the first few orders (practical usage; >3 is rarely needed) the approach works.
-        #
-        terms = [ (1.,self) ]
-        for k in range(order):
-            tmp = []
-            for Ci,Bi in terms:
-                tmp.extend( (Ci*cn, Bn) for cn,Bn in Bi.__diff_internal() )  # NOTE: also propagate Ci
-            terms = tmp
+    def band(self, tau, deriv_order=0):
+        """
+        Compute the nonzero basis functions at all sites at once.
 
-        # perform final summation at call time
-        return lambda x: sum( ci*Bi(x) for ci,Bi in terms )
+        At each site only the (order + 1) basis functions of the knot span
+        containing the site are nonzero. They are computed with the
+        Cox - de Boor recursion, vectorized over the sites.
+        The results are cached for the last few arrays of sites; they are
+        read-only.
 
+        Parameters:
+        tau:
+            Python list or rank-1 array, collocation sites
+        deriv_order:
+            int, >=0, order of derivative of the basis functions.
+
+        Returns:
+        B:
+            rank-2 array of shape (len(tau), order + 1) such that
+                B[i,k] = D**deriv_order B_(first[i]+k)(tau[i])
+        first:
+            rank-1 int array, index of the basis function in B[:,0]
+
+        """
+        tau = np.atleast_1d(np.asarray(tau, dtype=float))
+        return self.cache.get(("band", deriv_order), tau,
+                              lambda: self.__band(tau, deriv_order))
 
     def collmat(self, tau, deriv_order=0):
         """
@@ -298,18 +295,11 @@ class Bspline():
 
         Similarly for derivatives (if the supplied `deriv_order`> 0).
 
-        """
-        # get number of basis functions and output dtype
-        dummy = self.__call__(0.)
-        nbasis = dummy.shape[0]
+        The matrix is made from the (cached) band of nonzero basis functions.
 
-        tau = np.atleast_1d(tau)
+        """
+        tau = np.atleast_1d(np.asarray(tau, dtype=float))
         if tau.ndim > 1:
             raise ValueError("tau must be a list or a rank-1 array")
 
-        A = np.empty( (tau.shape[0], nbasis), dtype=dummy.dtype )
-        f = self.diff(order=deriv_order)
-        for i,taui in enumerate(tau):
-            A[i,:] = f(taui)
-
-        return np.squeeze(A)
+        return np.squeeze(self.__dense(tau, deriv_order))
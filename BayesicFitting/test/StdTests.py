@@ -130,6 +130,13 @@ def stdModeltest( model, par, x=None, plot=None, silent=True, warn=[] ):
             assertAAE( r1, r2 )
         tc.assertTrue( mc.testPartial( x, par, silent=silent ) == 0 )
 
+        pb = numpy.asarray( par, dtype=float )
+        pbatch = numpy.asarray( [pb, 1.1 * pb, 0.9 * pb] )
+        rbatch = model.resultBatch( x, pbatch )
+        print( "resultBatch ", rbatch.shape )
+        for p, rb in zip( pbatch, rbatch ) :
+            assertAAE( rb, model.result( x, p.copy() ) )
+
         if plot :
             plotModel( model, par, xx=x )
 
@@ -538,6 +538,75 @@ class Test( unittest.TestCase ):
         print( "   Test DynamicModel      " )
         mdl = BasicSplinesModel( knots=[-2.0, 0.0, 2.0] )
 
+    def test11( self ) :
+        print( "==== test ========= banded partials ==========="  )
+
+        numpy.random.seed( 2345 )
+        x = numpy.linspace( 0, 10, 201, dtype=float )
+        y = numpy.sin( x ) + 0.1 * numpy.random.randn( 201 )
+        knots = [0.0, 1.0, 2.5, 3.0, 5.0, 7.0, 7.5, 10.0]
+        for order in range( 5 ) :
+            for mdl in [BasicSplinesModel( knots=knots, order=order ),
+                        BSplinesModel( knots=knots, order=order )] :
+                par = numpy.random.randn( mdl.npchain )
+                band, first = mdl.bandedPartial( x, par )
+                self.assertTrue( band.shape == ( 201, order + 1 ) )
+
+                part = numpy.zeros( ( 201, mdl.npchain ), dtype=float )
+                for k in range( order + 1 ) :
+                    part[numpy.arange( 201 ),first+k] = band[:,k]
+                assertAAE( part, mdl.partial( x, par ), 12 )
+
+                ## banded fits are equal to the dense ones
+                pls = numpy.linalg.lstsq( part, y, rcond=None )[0]
+                ftr = Fitter( x, mdl )
+                par = ftr.fit( y )
+                self.assertTrue( ftr.bandedHessian is not None )
+                assertAAE( par, pls, 8 )
+                assertAAE( ftr.hessian, numpy.inner( part.T, part.T ), 10 )
+                self.assertAlmostEqual( ftr.logDetHessian(),
+                                        numpy.linalg.slogdet( ftr.hessian )[1], 6 )
+                assertAAE( ftr.getInverseHessian(), numpy.linalg.inv( ftr.hessian ), 6 )
+                assertAAE( QRFitter( x, mdl ).fit( y ), pls, 8 )
+
+        mdl = BasicSplinesModel( knots=knots, border=1 )
+        self.assertTrue( mdl.bandedPartial( x, mdl.parameters ) is None )
+        mdl = BasicSplinesModel( knots=knots, fixed={0:0.0} )
+        self.assertTrue( mdl.bandedPartial( x, mdl.parameters ) is None )
+
+    def test12( self ) :
+        print( "==== test ========= vectorized evaluation ==========="  )
+
+        numpy.random.seed( 3456 )
+        x = numpy.append( numpy.random.rand( 500 ) * 12 - 1, [0.0, 2.5, 3.0, 10.0] )
+        knots = numpy.asarray( [0.0, 1.0, 2.5, 3.0, 5.0, 7.0, 7.5, 10.0] )
+        for order in range( 5 ) :
+            mdl = BasicSplinesModel( knots=knots, order=order )
+
+            x2k = mdl.makeKnotIndices( x )
+            ix = numpy.zeros( len( x ), dtype=int )
+            for kn in knots[1:-1] :
+                ix = numpy.where( x >= kn, ix + 1, ix )
+            assertAE( x2k, ix )
+
+            ## same as evaluating the polynomial per knot segment
+            par = numpy.random.randn( mdl.npchain )
+            pa = numpy.inner( mdl.basis, par )
+            res = numpy.zeros_like( x )
+            for k, kn in enumerate( knots[:-1] ) :
+                q = numpy.where( x2k == k )
+                res[q] = mdl.poly.result( x[q] - kn, pa[k,:] )
+            assertAE( mdl.result( x, par ), res )
+
+            if order == 0 : continue
+            dfdx = numpy.zeros_like( x )
+            polym1 = PolynomialModel( order - 1 )
+            fp = numpy.arange( order + 1 )
+            for k, kn in enumerate( knots[:-1] ) :
+                q = numpy.where( x2k == k )
+                dfdx[q] = polym1.result( x[q] - kn, ( pa[k,:] * fp )[1:] )
+            assertAAE( mdl.derivative( x, par ), dfdx, 10 )
+
 
     def plot1( self ):
         x = numpy.linspace( 0, 10, 101, dtype=float )
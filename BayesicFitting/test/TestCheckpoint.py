@@ -0,0 +1,112 @@
+# run with : python3 -m unittest TestCheckpoint
+
+import unittest
+import os
+import tempfile
+import numpy as numpy
+
+from BayesicFitting import *
+
+__author__ = "Do Kester"
+__year__ = 2026
+__license__ = "GPL3"
+__version__ = "3.3.0"
+__maintainer__ = "Do"
+__status__ = "Development"
+
+#  *
+#  * This file is part of the BayesicFitting package.
+#  *
+#  * BayesicFitting is free software: you can redistribute it and/or modify
+#  * it under the terms of the GNU Lesser General Public License as
+#  * published by the Free Software Foundation, either version 3 of
+#  * the License, or ( at your option ) any later version.
+#  *
+#  * BayesicFitting is distributed in the hope that it will be useful,
+#  * but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  * GNU Lesser General Public License for more details.
+#  *
+#  * The GPL3 license can be found at <http://www.gnu.org/licenses/>.
+#  *
+#  *  2026 Do Kester
+
+class Test( unittest.TestCase ):
+    """
+    Test harness for Checkpoint.
+
+    Author       Do Kester
+
+    """
+    x = numpy.linspace( -2, 2, 21 )
+    noise = numpy.asarray( [ -0.000996, -0.046035,  0.013656,  0.418449,  0.0295155,  0.273705,
+    -0.204794,  0.275843, -0.415945, -0.373516, -0.158084, 0.1, -0.2, 0.05, 0.3, -0.1,
+    0.02, -0.3, 0.15, -0.05, 0.2], dtype=float )
+
+    def makeSampler( self, dynamic=False ) :
+        y = 1 + 0.5 * self.x + 0.3 * self.x * self.x + self.noise
+        mdl = PolynomialDynamicModel( 1 ) if dynamic else PolynomialModel( 2 )
+        mdl.setPrior( 0, UniformPrior( limits=[-5,5] ) )
+        ns = NestedSampler( self.x, mdl, y, seed=1234, verbose=0, ensemble=20,
+                            distribution="laplace", limits=[0.01,1] )
+        ns.maxIterations = 200
+        return ns
+
+    def stdResumeTest( self, dynamic=False ) :
+        path = os.path.join( tempfile.mkdtemp(), "ckpt.npz" )
+
+        ns1 = self.makeSampler( dynamic=dynamic )
+        evi1 = ns1.sample( checkpoint=Checkpoint( path, iterations=150 ) )
+        self.assertTrue( os.path.isfile( path ) )
+
+        ns2 = self.makeSampler( dynamic=dynamic )
+        evi2 = ns2.sample( resume=path )
+        print( evi1, evi2, len( ns1.samples ), len( ns2.samples ) )
+
+        self.assertEqual( evi1, evi2 )
+        self.assertEqual( ns1.info, ns2.info )
+        self.assertEqual( ns1.iteration, ns2.iteration )
+        self.assertEqual( ns1.distribution.ncalls, ns2.distribution.ncalls )
+        self.assertEqual( len( ns1.samples ), len( ns2.samples ) )
+        for s1, s2 in zip( ns1.samples, ns2.samples ) :
+            self.assertEqual( s1.logW, s2.logW )
+            self.assertTrue( numpy.array_equal( s1.allpars, s2.allpars ) )
+            self.assertEqual( s1.model.npars, s2.model.npars )
+
+        os.remove( path )
+
+    def testResume( self ) :
+        print( "========= testResume ======================" )
+        self.stdResumeTest()
+
+    def testResumeDynamic( self ) :
+        print( "========= testResumeDynamic ===============" )
+        self.stdResumeTest( dynamic=True )
+
+    def testCheckpoint( self ) :
+        print( "========= testCheckpoint ==================" )
+        path = os.path.join( tempfile.mkdtemp(), "ckpt.npz" )
+        ckp = Checkpoint( path, iterations=100, seconds=None )
+        print( ckp )
+        self.assertFalse( ckp.wantRestore() )
+        self.assertTrue( ckp.wantSave( 200 ) )
+        self.assertFalse( ckp.wantSave( 201 ) )
+
+        ckp = Checkpoint( path, iterations=None, seconds=0 )
+        self.assertTrue( ckp.wantSave( 201 ) )
+
+        ns = self.makeSampler()
+        self.assertRaises( FileNotFoundError, ns.sample, resume=path )
+
+        ns.maxIterations = 120
+        ns.sample( checkpoint=Checkpoint( path, iterations=100 ) )
+        self.assertTrue( ckp.wantRestore() )
+
+        ## different number of engines
+        ns = self.makeSampler()
+        ns.setEngines( ["galilean"] )
+        self.assertRaises( ValueError, ns.sample, resume=path )
+
+
+if __name__ == '__main__':
+    unittest.main( )
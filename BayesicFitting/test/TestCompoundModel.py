@@ -485,6 +485,32 @@ class Test( unittest.TestCase ):
 
         numpy.testing.assert_array_equal( m.result( x ), mc.result( x ) )
 
+    def testChainPlan( self ):
+        print( "  Test chain plan" )
+        m = GaussModel( )
+        m.addModel( PolynomialModel( 2 ) )
+        self.assertTrue( len( m.chainPlan() ) == 2 )
+
+        m.multiplyModel( ExpModel( ) )
+        m.subtractModel( SineModel( ) )
+        m.divideModel( PolynomialModel( 1 ) )
+        m.addModel( ArctanModel( fixed={0:1.0} ) )
+        self.assertTrue( len( m.chainPlan() ) == 6 )
+
+        x = numpy.linspace( -1, 2, 31 )
+        p = numpy.linspace( 0.5, 1.5, m.npars )
+
+        numpy.testing.assert_array_equal( m.result( x, p ),
+                    m._recursiveResult( x, p, None ) )
+        numpy.testing.assert_array_equal( m.partial( x, p ),
+                    m._recursivePartial( x, p, 0, None, None ) )
+        numpy.testing.assert_array_equal( m.derivative( x, p ),
+                    m._recursiveDerivative( x, p, None, 0 ) )
+        self.assertTrue( m.testPartial( x[3], p ) == 0 )
+
+        m.pipeModel( ExpModel( ) )
+        self.assertTrue( m.chainPlan() is None )
+
     def testModelName( self ):
         print( "  Test model names" )
 
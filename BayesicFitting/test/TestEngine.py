@@ -4,6 +4,7 @@ import unittest
 import numpy as numpy
 import math
 
+from numpy.testing import assert_array_almost_equal as assertAAE
 from BayesicFitting import *
 
 __author__ = "Do Kester"
@@ -95,6 +96,53 @@ class TestEngine( unittest.TestCase ):
         self.enginetest( copeng )
 
 
+    def testPriorVector( self ):
+        print( "\n   Engine PriorVector cache\n" )
+        m, xdata, data = self.initEngine()
+
+        errdis = GaussErrorDistribution( )
+        errdis.setLimits( [0.1, 10.0] )
+        problem = ClassicProblem( m, xdata, data )
+        wl = WalkerList( problem, 10, numpy.append( m.parameters, 1.0 ), [0,1,2,-1] )
+        engine = Engine( wl, errdis, phancol=PhantomCollection() )
+        copeng = engine.copy()
+
+        kpar = [0,1,2,-1]
+        pv0 = engine.getPriorVector( problem, kpar )
+        self.assertTrue( engine.getPriorVector( problem, kpar ) is pv0 )
+        self.assertTrue( copeng.getPriorVector( problem, kpar ) is pv0 )
+        self.assertTrue( pv0.highLimit[1] == 10 )
+
+        ## new limits in a new prior: setLimits
+        m.setLimits( lowLimits=[None,-5], highLimits=[None,5] )
+        pv1 = copeng.getPriorVector( problem, kpar )
+        self.assertFalse( pv1 is pv0 )
+        self.assertTrue( pv1.highLimit[1] == 5 )
+        self.assertTrue( engine.getPriorVector( problem, kpar ) is pv1 )
+        assertAAE( pv1.unit2Domain( [0.5, 1.0, 0.5, 0.5] )[1], 5.0 )
+
+        ## new limits in the same prior
+        m.getPrior( 1 ).setLimits( [-2, 2] )
+        pv2 = engine.getPriorVector( problem, kpar )
+        self.assertFalse( pv2 is pv1 )
+        self.assertTrue( pv2.lowLimit[1] == -2 )
+
+        ## a new prior
+        m.setPrior( 0, prior=ExponentialPrior( scale=3.0 ) )
+        pv3 = copeng.getPriorVector( problem, kpar )
+        self.assertFalse( pv3 is pv2 )
+        self.assertTrue( pv3.priors[0] is m.getPrior( 0 ) )
+
+        ## a new prior for the scale
+        errdis.hyperpar[0].prior = JeffreysPrior( limits=[0.2, 5.0] )
+        pv4 = engine.getPriorVector( problem, numpy.asarray( kpar ) )
+        self.assertFalse( pv4 is pv3 )
+        self.assertTrue( pv4.highLimit[-1] == 5 )
+
+        ## no changes: the same PriorVector
+        self.assertTrue( copeng.getPriorVector( problem, numpy.asarray( kpar ) ) is pv4 )
+        self.assertEqual( len( engine.priorVectors ), 2 )
+
     def enginetest( self, engine ) :
         walkers = engine.walkers
         fi = [0,1,2,-1]
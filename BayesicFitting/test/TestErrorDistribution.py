@@ -327,6 +327,105 @@ class Test( unittest.TestCase ):
         print( "numpart = ", nL )
         assertAAE( dL, nL, 5 )
 
+    def testLogLikelihoodBatch( self ):
+        print( "\n=====   Test logLikelihoodBatch ============================" )
+        gm = GaussModel( )
+        gm.addModel( PolynomialModel(1) )
+        param = numpy.asarray( [5, 1, 0.3, 1, 1, 1], dtype=float )
+        pbatch = numpy.asarray( [param, param * 1.1, param * 0.8, param * 1.2] )
+
+        problem = ClassicProblem( model=gm, xdata=self.x, ydata=self.data )
+
+        for errdis in [GaussErrorDistribution(), LaplaceErrorDistribution(),
+                       CauchyErrorDistribution()] :
+            for wgt in [None, self.wgt] :
+                problem.weights = wgt
+                nc = errdis.ncalls
+                lbatch = errdis.logLikelihoodBatch( problem, pbatch )
+                print( errdis, fmt( lbatch ) )
+                self.assertTrue( errdis.ncalls == nc + 4 )
+                self.assertTrue( lbatch.shape == ( 4, ) )
+                for p, lb in zip( pbatch, lbatch ) :
+                    assertAAE( lb, errdis.logLikelihood( problem, p ) )
+
+        problem.weights = None
+        problem.setAccuracy( 0.5 * self.wgt )
+        ged = GaussErrorDistribution()
+        lbatch = ged.logLikelihoodBatch( problem, pbatch )
+        for p, lb in zip( pbatch, lbatch ) :
+            assertAAE( lb, ged.logLikelihood( problem, p ) )
+
+    def testMarginalLikelihood( self ):
+        print( "\n=====   Test marginal likelihood ===========================" )
+        gm = GaussModel( )
+        gm.setMixedModel( [0] )
+        gm.addModel( PolynomialModel( 1 ) )
+        gm.setLimits( [-100, -10, 0.01, -100, -100], [100, 10, 10, 100, 100] )
+        param = numpy.asarray( [5, 0.1, 0.3, 1, 10, 1.2], dtype=float )
+
+        problem = ClassicProblem( model=gm, xdata=self.x, ydata=self.data, weights=self.wgt )
+        lindex = gm.getLinearIndex()
+        assertAAE( lindex, [0,3,4] )
+
+        ged = GaussErrorDistribution( )
+        logL = ged.logLikelihood( problem, param )
+
+        ## only the amplitude: integrate numerically over it
+        ged.linear = [0]
+        mpar = param.copy()
+        logM = ged.logLikelihood( problem, mpar )
+        self.assertTrue( numpy.all( mpar == param ) )
+        mpar[0] = ged.solveLinear( problem, mpar )[0][0]
+        print( "logL  %8.3f  marginal  %8.3f at amp = %8.3f" % ( logL, logM, mpar[0] ) )
+
+        ged.linear = None
+        amp = numpy.linspace( mpar[0] - 20, mpar[0] + 20, 4001 )
+        logLa = [ged.logLikelihood( problem, numpy.append( a, mpar[1:] ) ) for a in amp]
+        self.assertTrue( max( logLa ) <= ged.logLikelihood( problem, mpar ) )
+        numint = numpy.sum( numpy.exp( logLa ) ) * ( amp[1] - amp[0] ) / 200
+        print( "numeric integral  %8.3f" % math.log( numint ) )
+        assertAAE( logM, math.log( numint ), 5 )
+
+        ## the prior limits truncate the amplitude at its solution
+        gm.setLimits( [mpar[0], -10, 0.01, -100, -100], [100, 10, 10, 100, 100] )
+        ged.linear = [0]
+        logT = ged.logLikelihood( problem, param )
+        print( "marginal truncated  %8.3f" % logT )
+        ged.linear = None
+        da = 0.005
+        amp = mpar[0] + da * ( numpy.arange( 4000 ) + 0.5 )
+        logLa = [ged.logLikelihood( problem, numpy.append( a, mpar[1:] ) ) for a in amp]
+        numint = numpy.sum( numpy.exp( logLa ) ) * da / ( 100 - mpar[0] )
+        print( "numeric integral  %8.3f" % math.log( numint ) )
+        assertAAE( logT, math.log( numint ), 5 )
+        gm.setLimits( [-100, -10, 0.01, -100, -100], [100, 10, 10, 100, 100] )
+
+        ## all linear parameters; they are at the maximum of logL
+        ged.linear = lindex
+        mpar = param.copy()
+        logM = ged.logLikelihood( problem, mpar )
+        mpar[lindex] = ged.solveLinear( problem, mpar )[0]
+        print( "marginal  %8.3f at " % logM, fmt( mpar, max=None ) )
+        self.assertTrue( ged.logLikelihoodBatch( problem, [param] )[0] == logM )
+        ged.linear = None
+        assertAAE( ged.partialLogL( problem, mpar, lindex ), [0,0,0], 6 )
+
+        ## conditional draws are around the maximum with covariance inverse hessian
+        ged.linear = lindex
+        rng = numpy.random.RandomState( 1234 )
+        draws = numpy.asarray( [ged.drawLinear( problem, mpar, rng ) for k in range( 4000 )] )
+        assertAAE( draws[:,[1,2,5]] - mpar[[1,2,5]], 0 )
+        ged.linear = None
+        design = gm.partial( self.x, mpar[:-1] )[:,lindex]
+        cov = numpy.linalg.inv( numpy.inner( design.transpose() * self.wgt / mpar[-1]**2, 
+                                             design.transpose() ) )
+        print( "mean ", fmt( numpy.mean( draws[:,lindex], axis=0 ) ), fmt( mpar[lindex] ) )
+        print( "stdv ", fmt( numpy.std( draws[:,lindex], axis=0 ) ), 
+                        fmt( numpy.sqrt( numpy.diag( cov ) ) ) )
+        assertAAE( numpy.mean( draws[:,lindex], axis=0 ) / numpy.sqrt( numpy.diag( cov ) ),
+                   mpar[lindex] / numpy.sqrt( numpy.diag( cov ) ), 1 )
+        assertAAE( numpy.cov( draws[:,lindex].transpose() ) / cov, 1, 1 )
+
     def testExponentialErrorDistribution1( self ):
 
         print( "=======   Test Exponential Error Distribution 1 ==================" )
@@ -648,6 +747,55 @@ class Test( unittest.TestCase ):
             print( "" )
 
 
+    def testDataCache( self ):
+        print( "====== Test Data Cache ======================================" )
+        poly = PolynomialModel( 1 )
+        param = numpy.asarray( [12, 10], dtype=float )
+        data = numpy.asarray( self.data + 13, dtype=int )
+        problem = ClassicProblem( model=poly, xdata=self.x, ydata=data )
+
+        ped = PoissonErrorDistribution( )
+        logL = ped.logLikelihood( problem, param )
+        self.assertTrue( "logFactorial" in problem.datacache )
+        assertAAE( problem.datacache["logFactorial"][1], logFactorial( data ) )
+        cpy = problem.copy()
+        self.assertTrue( cpy.datacache is problem.datacache )
+
+        problem.ydata = data + 1
+        self.assertFalse( "logFactorial" in problem.datacache )
+        self.assertTrue( "logFactorial" in cpy.datacache )
+        logL1 = ped.logLikelihood( problem, param )
+        assertAAE( logL1, numpy.sum( ( data + 1 ) * numpy.log( problem.result( param ) ) -
+                            problem.result( param ) - logFactorial( data + 1 ) ) )
+        assertAAE( ped.logLikelihood( cpy, param ), logL )
+
+        acc = numpy.linspace( 0.5, 1.5, 11 )
+        problem = ClassicProblem( model=poly, xdata=self.x, ydata=self.data, accuracy=acc )
+        ged = GaussErrorDistribution( scale=0.5 )
+        allpars = numpy.append( param, 0.5 )
+        logL = ged.logLikelihood( problem, allpars )
+        self.assertTrue( problem.datacache["gaussNormSum"][0] == 0.5 )
+        assertAAE( logL, ged.logLikelihood_alt( problem, allpars ) )
+        assertAAE( logL, numpy.sum( ged.logLdata( problem, allpars ) ) )
+
+        problem.weights = self.wgt
+        self.assertFalse( "gaussNormSum" in problem.datacache )
+        s2 = 0.25 + acc * acc
+        res = problem.residuals( param )
+        lL = -0.5 * numpy.sum( self.wgt * ( res * res / s2 + math.log( 2 * math.pi ) +
+                                             numpy.log( s2 ) ) )
+        assertAAE( ged.logLikelihood( problem, allpars ), lL )
+        assertAAE( ged.logLikelihood_alt( problem, allpars ), lL )
+
+        ## free scale: in scratch space
+        ged = GaussErrorDistribution( scale=0.5, limits=[0.1, 10] )
+        self.assertFalse( ged.hyperpar[0].isFixed )
+        problem.datacache.clear()
+        assertAAE( ged.logLikelihood( problem, allpars ), lL )
+        self.assertFalse( "gaussNormSum" in problem.datacache )
+        problem.weights = None
+        assertAAE( ged.logLikelihood( problem, allpars ), numpy.sum( ged.logLdata( problem, allpars ) ) )
+
     def testBernoulliErrorDistribution( self ):
         print( "====== Test Bernoulli Error Distribution ======================" )
         poly = LogisticModel( fixed={0:1} )
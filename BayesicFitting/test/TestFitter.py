@@ -485,6 +485,50 @@ class Test( unittest.TestCase ):
 #            print( fmt( par ), fmt( pm ), fmt( stdev ), fmt( wd_gpr ), fmt( lz_gpr ),
 #                    fmt( lf_gpr ), fmt( oc_gpr ) )
 
+    def test8( self ):
+        print( "====  test8: factorisation cache =========" )
+        numpy.random.seed( 2345 )
+        N = 201
+        x = numpy.linspace( -1, 1, N )
+        w = numpy.random.rand( N ) + 0.5
+
+        for mdl in [PolynomialModel( 3 ), PolynomialModel( 3, fixed={0:0.8} ),
+                    BasicSplinesModel( nrknots=7, min=-1, max=1 )] :
+            print( mdl )
+            ftr = Fitter( x, mdl )
+            qrf = QRFitter( x, mdl.copy() )
+            factors = None
+            for k, ( wgt, keep ) in enumerate( [( None, None ), ( None, None ), ( w, None ),
+                                                ( w, None ), ( w, {1:0.5} ), ( None, None )] ) :
+                y = numpy.cos( 2 * x ) + 0.1 * numpy.random.randn( N )
+                par = ftr.fit( y, weights=wgt, keep=keep )
+                std = ftr.stdevs
+                lz = ftr.getLogZ( limits=[-10,10] )
+                if k in [1, 3] :
+                    self.assertTrue( ftr.factors is factors )
+                else :
+                    self.assertFalse( ftr.factors is factors )
+                factors = ftr.factors
+
+                ## compare with a fresh fitter
+                fresh = Fitter( x, mdl.copy() )
+                fresh.cacheFactors = False
+                par0 = fresh.fit( y, weights=wgt, keep=keep )
+                print( k, fmt( par ), fmt( lz ) )
+                assertAAE( par, par0, 10 )
+                assertAAE( std, fresh.stdevs, 10 )
+                assertAE( lz, fresh.getLogZ( limits=[-10,10] ), 8 )
+                self.assertIsNone( fresh.factors )
+
+                if wgt is None :
+                    assertAAE( qrf.fit( y, keep=keep ), par, 10 )
+
+        self.assertRaises( ValueError, ftr.hessian.__setitem__, ( 0, 0 ), 1.0 )
+
+        ## no cache for non-linear models
+        ftr = Fitter( x, GaussModel() )
+        ftr.getHessian( weights=1.0 )
+        self.assertIsNone( ftr.factors )
 
 
     def xxx():
@@ -4,7 +4,9 @@ import unittest
 import os
 import numpy as numpy
 import math
+import copy
 import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
 from numpy.testing import assert_array_almost_equal as assertAAE
 
 
@@ -158,7 +160,7 @@ class Test( unittest.TestCase ):
             if self.doplot :
                 plt.plot( xx, yy )
 
-            print( fmt( p[0] ), fmt( e ), fmt( a ), fmt( b ), fmt( KL.iter ) )
+            print( fmt( p[0] ), fmt( e ), fmt( a ), fmt( b ) )
             assertAAE( p[0], e )
 
             p[0] += 0.1
@@ -285,6 +287,74 @@ class Test( unittest.TestCase ):
 
 
 
+    def test5( self ):
+        x  = numpy.linspace( -10, 1000, 10001, dtype=float )
+        print( "******KEPPLERS LAW test 5***************" )
+        KL = Kepplers2ndLaw( warmstart=False )
+
+        for e in [0.0, 0.3, 0.9, 0.999999] :
+            p = [e, 1.0, 7.3, 0.4]
+            m = KL.meanAnomaly( x, p )
+            E, sinE, cosE, niter = KL.solveKepler( x, p )
+            print( fmt( e ), fmt( niter ) )
+            self.assertTrue( niter <= 3 )
+            assertAAE( E - e * sinE, m, 10 )
+            assertAAE( sinE, numpy.sin( E ), 12 )
+            assertAAE( cosE, numpy.cos( E ), 12 )
+
+            ## all methods find the same solution
+            assertAAE( KL.eccentricAnomaly1( x, p ), E, 10 )
+            if e < 0.5 :
+                assertAAE( KL.eccentricAnomaly0( x, p ), E, 7 )
+
+            ## the starter is better than 1e-3
+            self.assertTrue( numpy.all( numpy.abs( KL.markley( m, e ) - E ) < 1e-3 ) )
+
+        ## warm start from a previous solution
+        KW = Kepplers2ndLaw()
+        p = [0.6, 1.0, 7.3, 0.4]
+        r0, v0, E0, s0, c0 = KW.orbit( x, p )
+        self.assertFalse( hasattr( KW, "sinE" ) )
+        self.assertFalse( hasattr( KW, "iter" ) )
+        p = [0.6000001, 1.0, 7.3000001, 0.4000001]
+        self.assertTrue( KW.solveKepler( x, p )[3] == 1 )
+        r1, v1, E1, s1, c1 = KW.orbit( x, p )
+        r2, v2, E2, s2, c2 = KL.orbit( x, p )
+        assertAAE( E1, E2, 10 )
+        assertAAE( v1, v2, 10 )
+        assertAAE( r1, r2, 10 )
+
+        ## Estart is honoured
+        E3 = KL.eccentricAnomaly( x, p, Estart=E2 )
+        self.assertTrue( KL.iter == 1 )
+        assertAAE( E3, E2, 10 )
+
+        ## a far away previous solution is not used
+        p = [0.95, 1.0, 3.1, 2.0]
+        E4, s4, c4, niter = KW.solveKepler( x, p )
+        assertAAE( E4, KL.solveKepler( x, p )[0], 10 )
+        self.assertTrue( niter <= 3 )
+
+        ## each thread warm starts from its own previous solution
+        def work( e ) :
+            iters = []
+            for k in range( 50 ) :
+                p = [e, 1.0, 7.3 + 1e-7 * k, 0.4]
+                E, sinE, cosE, niter = KW.solveKepler( x, p )
+                assertAAE( E, KL.solveKepler( x, p )[0], 10 )
+                iters += [niter]
+            return iters
+
+        with ThreadPoolExecutor( max_workers=3 ) as pool :
+            futures = [pool.submit( work, e ) for e in [0.2, 0.5, 0.8]]
+            for future in futures :
+                self.assertTrue( all( niter == 1 for niter in future.result()[1:] ) )
+
+        ## the previous solution is not copied
+        KC = copy.deepcopy( KW )
+        self.assertTrue( KC.solveKepler( x, p )[3] > 1 )
+
+
     @classmethod
     def suite( cls ):
         return unittest.TestCase.suite( TestKepplers2ndLaw.__class__ )
@@ -350,6 +350,59 @@ class Test( unittest.TestCase ):
 
 
 
+    def test7( self ) :
+
+        print( "++++++++++++++++++++++++++++++++++++++++++++++++++" )
+        print( "Testing LevenbergMarquardtFitter with variable projection" )
+        print( "++++++++++++++++++++++++++++++++++++++++++++++++++" )
+
+        x = numpy.linspace( 0, 10, 401 )
+        mdl = None
+        for k in range( 3 ) :
+            sm = SineModel( )
+            sm.setMixedModel( [1,2] )
+            mdl = sm if mdl is None else mdl + sm
+        mdl += PolynomialModel( 0 )
+
+        print( mdl )
+        print( "linear ", mdl.getLinearIndex() )
+        self.assertTrue( mdl.isMixed() )
+        assertAAE( mdl.getLinearIndex(), [1,2,4,5,7,8,9] )
+        mm = mdl * PolynomialModel( 0 )
+        assertAAE( mm.getLinearIndex(), [10] )
+        self.assertFalse( GaussModel().isMixed() )
+        self.assertFalse( PolynomialModel( 1 ).isMixed() )
+
+        p = numpy.asarray( [0.3, 1.0, -0.5, 0.7, 0.4, 0.8, 1.1, -0.6, 0.2, 0.5] )
+        numpy.random.seed( 23456 )
+        y = mdl.result( x, p ) + 0.1 * numpy.random.randn( len( x ) )
+
+        par0 = p.copy()
+        par0[[0,3,6]] *= 1.01
+        par0[[1,2,4,5,7,8,9]] = 0.1
+
+        ftr = LMFitter( x, mdl.copy() )
+        par = ftr.fit( y, par0=par0 )
+        print( "param  ", fmt( par, max=None ), ftr.iter )
+
+        vpf = LMFitter( x, mdl.copy(), varpro=True )
+        vpar = vpf.fit( y, par0=par0 )
+        print( "varpro ", fmt( vpar, max=None ), vpf.iter )
+
+        assertAAE( vpar, par, 3 )
+        self.assertTrue( vpf.iter <= ftr.iter )
+
+        ## the linear parameters are the least squares solution at the non-linear ones
+        lin = mdl.getLinearIndex()
+        assertAAE( vpf.solveLinear( vpar, lin, y, 1.0 ), vpar, 10 )
+
+        ## keep one of the linear parameters fixed
+        par0[9] = 0.5
+        vpar = vpf.fit( y, par0=par0, keep={9:0.5} )
+        print( "keep   ", fmt( vpar, max=None ), vpf.iter )
+        self.assertTrue( vpar[9] == 0.5 )
+        assertAAE( vpar, par, 2 )
+
     def test4( self ) :
 
         self.normalizetest( Fitter )
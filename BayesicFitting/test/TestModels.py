@@ -487,6 +487,28 @@ class Test( unittest.TestCase ):
         print( m1.npchain, p )
         stdModeltest( m1, p, plot=self.doplot )
 
+        ## the band of basis functions is cached on the contents of xdata
+        part = m1._bspline.collmat( x )
+        band, first = m1._bspline.band( x )
+        self.assertTrue( m1._bspline.band( x.copy() )[0] is band )
+        self.assertFalse( band.flags.writeable )
+        xc = x.copy()
+        xc[3] += 0.01
+        bc = m1._bspline.band( xc )[0]
+        self.assertFalse( bc is band )
+        xc[3] -= 0.01
+        self.assertFalse( m1._bspline.band( xc )[0] is bc )
+        self.assertTrue( numpy.array_equal( m1._bspline.band( xc )[0], band ) )
+
+        cache = m1._bspline.cache
+        cache.maxbytes = 20 * x.nbytes
+        for k in range( 20 ) :
+            m1.partial( x * 0.99 ** k, p )
+        self.assertTrue( 0 < cache.nbytes <= cache.maxbytes )
+        self.assertTrue( cache.nbytes == sum( item[2] for item in cache.items.values() ) )
+        self.assertTrue( numpy.allclose( m1.partial( x, p ), part ) )
+        self.assertTrue( numpy.allclose( m1.result( x, p ), numpy.inner( part, p ) ) )
+
     def testBasicSplinesModel( self ):
         x  = numpy.asarray( [-1.0, -0.8, -0.6, -0.4, -0.2, 0.0, 0.2, 0.4, 0.6, 0.8, 1.0] )
         print( "******BASICSPLINES*************************" )
@@ -142,6 +142,18 @@ class Test( unittest.TestCase ):
 
         self.dofit( ns, pp )
 
+        ## reports of the thread engines are merged at the end
+        for eng in ns.engines :
+            self.assertTrue( eng.report[Engine.NCALLS] > 0 )
+
+        ## and after each explore, before close
+        ncalls = [eng.report[Engine.NCALLS] for eng in ns.engines]
+        explorer = Explorer( ns, threads=True )
+        explorer.explore( [1, 2], ns.walkers[0].logL, ns.iteration + 1 )
+        for eng, nc in zip( ns.engines, ncalls ) :
+            self.assertTrue( eng.report[Engine.NCALLS] > nc )
+        explorer.close()
+
         sl = ns.samples
 
         printclass( sl[-1] )
@@ -155,7 +167,25 @@ class Test( unittest.TestCase ):
 #        endt = time.time()
 
 #        print( "Elapsed ", endt - start )
- 
+
+    def test1p( self ):
+        print( "=========== Nested Sampler test 1 processes ============" )
+
+        pp, y0, x, y, w = self.makeData( n=1 )
+
+        gm = GaussModel( )
+        lolim = numpy.asarray( [-10,-10,  0], dtype=float )
+        hilim = numpy.asarray( [ 10, 10, 10], dtype=float )
+        gm.setLimits( lolim, hilim )
+
+        ns = NestedSampler( x, gm, y, w, discard=4, processes=2 )
+
+        self.dofit( ns, pp )
+
+        self.assertTrue( ns.distribution.ncalls > 0 )
+        for eng in ns.engines :
+            self.assertTrue( eng.report[Engine.NCALLS] > 0 )
+
     def test2a( self ):
         print( "=========== Nested Sampler test 2a ======================" )
 
@@ -332,6 +362,36 @@ class Test( unittest.TestCase ):
 #        print( "truth  ", pp )
 #        self.dofit( ns, pp, plot=plot )
 
+    def test5( self ):
+        print( "=========== Nested Sampler test 5 marginalize ==========" )
+
+        pp, y0, x, y, w = self.makeData( n=2 )
+
+        gm = GaussModel( )
+        gm.setMixedModel( [0] )
+        gm += PolynomialModel( 1 )
+        lolim = numpy.asarray( [-100,-10,  0, -100, -100], dtype=float )
+        hilim = numpy.asarray( [ 100, 10, 10,  100,  100], dtype=float )
+        gm.setLimits( lolim, hilim )
+
+        ns = NestedSampler( x, gm, y, w, marginalize=True )
+
+        self.dofit( ns, pp )
+
+        ## only the non-linear parameters are explored
+        self.assertTrue( list( ns.walkers[0].fitIndex ) == [1,2] )
+        self.assertTrue( ns.stdevs[0] > 0 )
+
+        ## the distribution is not marginalised outside sample()
+        self.assertIsNone( ns.distribution.linear )
+        allpars = numpy.append( ns.parameters, ns.scale )
+        problem = ClassicProblem( gm, xdata=x, ydata=y, weights=w )
+        logL = ns.distribution.logLikelihood( problem, allpars )
+        self.assertAlmostEqual( logL, ns.distribution.logLikelihoodBatch( problem, [allpars] )[0], 8 )
+
+        ns = NestedSampler( x, GaussModel( ), y, w, marginalize=True )
+        self.assertRaises( AttributeError, ns.sample )
+
     def test4( self ):
         print( "=========== Nested Sampler test 4 ======================" )
 
@@ -379,30 +439,36 @@ class Test( unittest.TestCase ):
 
         pp, y0, x, y, w = self.makeData( 3 )
 
+        ## the amplitudes are marginalised; the frequency is multimodal
+        sm = SineModel( )
+        sm.setMixedModel( [1,2] )
         gm = GaussModel( )
+        gm.setMixedModel( [0] )
         gm.addModel( PolynomialModel(1) )
-        gm.addModel( SineModel() )
+        gm.addModel( sm )
 
         print( gm.shortName( ) )
         print( gm._next.shortName( ) )
         print( gm._next._next.shortName( ) )
         print( gm._next._next._next )
 
-        lolim = numpy.asarray( [-10,-10,  0,-10,-10, 0.5,-10,-10], dtype=float )
-        hilim = numpy.asarray( [ 10, 10, 10, 10, 10, 2.5, 10, 10], dtype=float )
+        ## the frequency range still contains the sidelobes at 1.12 and 1.48
+        lolim = numpy.asarray( [-10,-10,  0,-10,-10, 1.0,-10,-10], dtype=float )
+        hilim = numpy.asarray( [ 10, 10, 10, 10, 10, 1.6, 10, 10], dtype=float )
 
         gm.setLimits( lolim, hilim )
+        self.assertTrue( list( gm.getLinearIndex() ) == [0,3,4,6,7] )
 
-        ns = NestedSampler( x, gm, y, w, seed=2345 )
+        ns = NestedSampler( x, gm, y, w, marginalize=True )
         ns.distribution.setLimits( [0.01, 10] )
-        ns.copymode = 1
 #        ns.bestBoost = True
 
-        self.dofit( ns, pp, plot=plot )
+        ## the linear parameters of the ML sample are drawn; compare the others
+        self.dofit( ns, pp, plot=plot, mlindex=[1,2,5] )
 
 #        plotSampleList( ns.samples, x, y, show=plot )
 
-    def dofit( self, ns, pp, plot=False ) :
+    def dofit( self, ns, pp, plot=False, mlindex=slice( None ) ) :
         logE = ns.sample( plot=plot )
 
         par = ns.parameters
@@ -418,7 +484,7 @@ class Test( unittest.TestCase ):
 #        ns.report( )
 
 
-        self.assertTrue( all( numpy.abs( par - mlp ) < 2 * std ) )
+        self.assertTrue( all( ( numpy.abs( par - mlp ) < 2 * std )[mlindex] ) )
         self.assertTrue( all( numpy.abs( par - pp ) < 2 * std ) )
 #        assertAAE( par, pp, 2 )
 
@@ -89,6 +89,28 @@ class Test( unittest.TestCase ):
         print( "\n   SalesmanProblem Test NearEngine\n" )
         self.stdenginetest( NearEngine, np=5, plot=self.doplot, random=True )
 
+    def test7( self ):
+        print( "\n   SalesmanProblem Test logL from the changed legs\n" )
+        problem = self.initProblem( np=6, random=True )
+        errdis = DistanceCostFunction( )
+
+        n2 = 36
+        pars = numpy.random.permutation( n2 )
+        sl = WalkerList( problem, 3, pars, numpy.arange( n2, dtype=int ) )
+        for wlkr in sl :
+            wlkr.logL = errdis.logLikelihood( problem, wlkr.allpars )
+
+        phc = PhantomCollection( dynamic=False )
+        for myengine in [MoveEngine, ReverseEngine, ShuffleEngine, SwitchEngine,
+                         LoopEngine, NearEngine] :
+            myeng = myengine( sl, errdis, phancol=phc )
+            for k in range( 200 ) :
+                myeng.execute( 1, -math.inf )
+                wlkr = sl[1]
+                logL = errdis.logLikelihood( problem, wlkr.allpars )
+                self.assertAlmostEqual( wlkr.logL, logL, 8 )
+            print( myeng, fmt( wlkr.logL ), fmt( logL ) )
+
     def teststart1( self ) :
         print( "\n   SalesmanProblem Test StartOrderEngine\n" )
         self.stdstarttest( StartOrderEngine, np=4, nwalker=10 )
@@ -45,7 +45,33 @@ class Test( unittest.TestCase ):
             self.ptest( days, flux, period=par[1], plot=False, verbose=False )
             print( "truth  :", fma( par ) )
 
-        
+    def test2( self ):
+        print( "==== test 2 ========" )
+
+        rng = numpy.random.default_rng( seed=2345 )
+        nd = 300
+        days = numpy.sort( rng.uniform( 0, 100, nd ) )
+        flux = numpy.sin( 2 * math.pi * days / 7.3 ) + rng.normal( scale=0.1, size=nd )
+
+        ps = PeriodicScout( )
+        pers = numpy.geomspace( 2, 20, 30 )
+        scl = ps.scanPeriods( days, flux, pers )
+
+        for per, sc in zip( pers, scl ) :
+            bsm = BasicSplinesModel( knots=numpy.linspace( 0, 1, ps.NRKNOTS ), border=1 )
+            ftr = Fitter( ( days % per ) / per, bsm )
+            ftr.fit( flux )
+            assertAC( sc, ftr.scale, 1e-10 )
+
+        ## the scales come from the residuals: an offset in the flux changes nothing
+        assertAC( ps.scanPeriods( days, flux + 1e4, pers ), scl, 1e-8 )
+
+        per0, sc0 = ps.findPeriod( days, flux, pmin=2, pmax=20 )
+        per1, sc1 = ps.findPeriod( days, flux, pmin=2, pmax=20, coarse=8 )
+        print( "Period   ", fma( [per0, per1] ), fma( [sc0, sc1] ) )
+        assertAC( per0, per1, 1e-6 )
+        assertAC( per0 / 7.3, round( per0 / 7.3 ), 0.01 )
+
     def ptest( self, days, flux, period=None, plot=0, verbose=False ) :
 
         ps = PeriodicScout( )
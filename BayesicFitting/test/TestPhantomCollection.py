@@ -2,6 +2,8 @@
 
 import unittest
 import os
+import numpy as numpy
+from concurrent.futures import ThreadPoolExecutor
 
 
 from BayesicFitting import *
@@ -112,6 +114,90 @@ class Test( unittest.TestCase  ) :
         for k, ph in enumerate( phc.phantoms ) :
             print( fmt( k ), fmt( ph.id ), fmt( ph.logL ), fmt( ph.allpars ) )
 
+    def test3( self ) :
+        print( "====test 3 Incremental Minmax=========" )
+
+        numpy.random.seed( 3456 )
+        m = PolynomialModel( 2 )
+        problem = ClassicProblem( model=m )
+
+        phc = PhantomCollection()
+        lowL = -10.0
+        for k in range( 500 ) :
+            pars = numpy.random.randn( 3 )
+            logL = lowL + numpy.random.rand()
+            phc.storeItems( Walker( k, problem, pars, None, logL=logL ) )
+
+            if k % 10 == 9 :
+                nph = phc.length()
+                lowL = phc.logL[nph // 4]
+                pmin, pmax = phc.getParamMinmax( lowL )
+
+                allpars = numpy.asarray( [ph.allpars for ph in phc.phantoms] )
+                self.assertTrue( numpy.all( phc.logL > lowL ) )
+                self.assertTrue( numpy.array_equal( pmin, numpy.min( allpars, axis=0 ) ) )
+                self.assertTrue( numpy.array_equal( pmax, numpy.max( allpars, axis=0 ) ) )
+
+        print( phc.length(), phc.count, fmt( pmin ), fmt( pmax ) )
+        self.assertEqual( phc.count, 500 )
+        self.assertEqual( phc.ncalls, 500 )
+        self.assertEqual( phc.phantoms._count, 500 )
+        self.assertEqual( phc.phantoms[-1].logL, phc.logL[-1] )
+
+    def test4( self ) :
+        print( "====test 4 Merge======================" )
+
+        numpy.random.seed( 4567 )
+        problems = [ClassicProblem( model=PolynomialDynamicModel( k ) ) for k in range( 3 )]
+
+        phc = PhantomCollection( dynamic=True )
+        logLs = []
+        for k in range( 300 ) :
+            ## many equal logL, in and across the pending blocks
+            logL = -float( numpy.random.randint( 20 ) )
+            problem = problems[k % 3]
+            pars = numpy.random.randn( problem.model.npars )
+            phc.storeItems( Walker( k, problem, pars, None, logL=logL ) )
+            logLs += [logL]
+
+            if k % 25 == 24 :
+                phc.merge()
+                srt = numpy.argsort( logLs, kind="stable" )
+                self.assertTrue( numpy.array_equal( phc.idents[:,0], srt ) )
+                self.assertTrue( numpy.array_equal( phc.logL, numpy.asarray( logLs )[srt] ) )
+                for k1, ph in zip( srt, phc.phantoms ) :
+                    self.assertTrue( ph.problem is problems[k1 % 3] )
+                    self.assertTrue( ph.nap == problems[k1 % 3].model.npars )
+
+    def test5( self ) :
+        print( "====test 5 Threads====================" )
+
+        problem = ClassicProblem( model=PolynomialModel( 2 ) )
+        phc = PhantomCollection()
+        nthreads = 6
+        nstore = 2000
+
+        def work( kt ) :
+            rng = numpy.random.RandomState( kt )
+            for k in range( nstore ) :
+                wid = kt * nstore + k
+                lowL = -1.0 + k / nstore
+                phc.storeItems( Walker( wid, problem, rng.randn( 3 ), None,
+                                        logL=lowL + rng.rand() ) )
+                if k % 5 == 4 :
+                    phc.getParamMinmax( lowL )
+
+        with ThreadPoolExecutor( max_workers=nthreads ) as pool :
+            for future in [pool.submit( work, kt ) for kt in range( nthreads )] :
+                future.result()
+
+        self.assertEqual( phc.count, nthreads * nstore )
+        phc.merge()
+        self.assertTrue( numpy.all( numpy.diff( phc.logL ) >= 0 ) )
+        ids = phc.idents[:,0]
+        self.assertEqual( len( ids ), len( numpy.unique( ids ) ) )
+        self.assertTrue( len( ids ) == len( phc.pars ) == len( phc.nap ) == len( phc.counted ) )
+
 
 if __name__ == '__main__':
     unittest.main( )
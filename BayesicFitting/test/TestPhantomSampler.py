@@ -221,6 +221,30 @@ class TestPhantomSampler( unittest.TestCase ):
             print( "NS evid ", fmt( evi ), " +- ", fmt( ns.precision ) )
 
 
+    def test5( self ):
+        print( "=========== Phantom Sampler test 5 ======================" )
+
+        numpy.random.seed( 13456 )
+        N = 41
+        x = numpy.linspace( -1.0, 1.0, N, dtype=float )
+        y = 0.3 + 0.5 * x + 0.2 * numpy.random.randn( N )
+
+        result = []
+        for sampler in [PhantomSampler, OldPhantomSampler] :
+            pm = PolynomialModel( 1 )
+            pm.setLimits( [-10], [10] )
+            ns = sampler( x, pm, y, ensemble=20, seed=3456, verbose=0 )
+            ns.distribution.setLimits( [0.01, 100] )
+            evi = ns.sample()
+            print( sampler.__name__, fmt( evi ), fmt( ns.info ), len( ns.samples ) )
+            result += [[ns.logZ, ns.info, len( ns.samples ), ns.samples.getLogWeightEvolution()]]
+
+        self.assertTrue( result[0][2] == result[1][2] )
+        self.assertAlmostEqual( result[0][0], result[1][0], 8 )
+        self.assertAlmostEqual( result[0][1], result[1][1], 8 )
+        self.assertTrue( numpy.allclose( result[0][3], result[1][3], rtol=0, atol=1e-8 ) )
+
+
     ### Does not always fit properly 
     def XXXtest3( self ):
         print( "=========== Phantom Sampler test 3 ======================" )
@@ -277,3 +301,29 @@ class TestPhantomSampler( unittest.TestCase ):
         return unittest.TestCase.suite( PhantomSampler1Test.__class__ )
 
 
+class OldPhantomSampler( PhantomSampler ):
+    """
+    PhantomSampler with the one-by-one update of the evidence, for comparison.
+    """
+    def updateEvidence( self, worst ) :
+        kw = 0
+        for lowph in self.phancol.nextLowPhantom( self.lowLhood ) :
+            lpc = self.livepointcount
+            logWidth = self.logUnitDom - math.log( lpc )
+            logWeight = logWidth + lowph.logL + lowph.logPrior
+
+            logZnew = numpy.logaddexp( self.logZ, logWeight )
+            self.info = ( math.exp( logWeight - logZnew ) * self.lowLhood +
+                    math.exp( self.logZ - logZnew ) * ( self.info + self.logZ ) - logZnew )
+            if math.isnan( self.info ) :
+                self.info = 0.0
+            self.logZ = logZnew
+
+            self.samples.add( lowph.toSample( logWeight ) )
+            self.sumWidth += math.exp( logWidth )
+            self.logUnitDom = logWidth + math.log( lpc - 1 )
+            kw += 1
+
+        if kw > 0 :
+            self.logdZ = logWeight - self.logZ
+
@@ -637,6 +637,41 @@ class Test( unittest.TestCase ) :
         self.stdTestPrior( prior, utest=False )
         self.domainTest( prior )
 
+    def testPriorVector( self ):
+        print( "===== Prior Vector  ======================================\n" )
+
+        priors = [UniformPrior( limits=[-2,3] ), GaussPrior( center=1, scale=2 ),
+                  GaussPrior( center=1, scale=2, limits=[0,4] ),
+                  JeffreysPrior( limits=[0.1,10] ), LaplacePrior( center=1, scale=2 ),
+                  ExponentialPrior( scale=3 ), CauchyPrior( center=1, scale=2, limits=[-5,5] ),
+                  UniformPrior( circular=math.pi ), GaussPrior( circular=math.pi, center=1 ),
+                  UniformRatioPrior( limits=[0.5,2] )]
+        pv = PriorVector( priors )
+        print( len( pv ), [g.kind for g in pv.groups], pv.others )
+        self.assertTrue( len( pv ) == 10 )
+        self.assertTrue( pv.others == [9] )
+
+        np = len( priors )
+        uval = numpy.linspace( 0.05, 0.95, 6 )
+        ubatch = numpy.asarray( [uval[k] + numpy.zeros( np ) for k in range( 6 )] )
+
+        dbatch = pv.unit2Domain( ubatch )
+        self.assertTrue( dbatch.shape == ( 6, np ) )
+        for u, d in zip( ubatch, dbatch ) :
+            dv = [p.unit2Domain( x ) for p, x in zip( priors, u )]
+            assertAAE( d, dv )
+            assertAAE( pv.unit2Domain( u ), dv )
+            assertAAE( pv.domain2Unit( d ), [p.domain2Unit( x ) for p, x in zip( priors, d )] )
+            assertAAE( pv.logResult( d ), [p.logResult( x ) for p, x in zip( priors, d )] )
+            assertAAE( pv.partialLog( d ), [p.partialLog( x ) for p, x in zip( priors, d )] )
+            pv.checkLimit( d )
+
+        d = dbatch[0].copy()
+        d[3] = 20.0
+        self.assertTrue( pv.isOutOfLimits( d )[3] )
+        self.assertTrue( numpy.isinf( pv.logResult( d )[3] ) )
+        self.assertRaises( ValueError, pv.checkLimit, d )
+
     @classmethod
     def suite( cls ):
         return ConfiguredTestCase.suite( PriorTest.__class__ )
@@ -197,6 +197,69 @@ class Test( unittest.TestCase ):
         self.assertAlmostEqual( sdis,  990/3, 6 )
 
 
+    def test5( self ):
+        print( "\n   SalesmanProblem Test costChange\n" )
+        np = 6
+        n2 = np * np
+        rng = numpy.random.RandomState( 2345 )
+
+        for dist in ["euclid", "manhattan", self.square] :
+            for weights in [False, True] :
+                problem = self.initProblem( np=np, random=True, weights=weights, distance=dist )
+                self.assertTrue( problem.symmetric == ( not weights and dist != self.square ) )
+                for oneway in [False, True] :
+                    problem.oneway = oneway
+                    pars = rng.permutation( n2 )
+                    cost = numpy.sum( problem.result( pars ) )
+
+                    ## switch 2 nodes
+                    ptry = pars.copy()
+                    ptry[[3,17]] = ptry[[17,3]]
+                    legs = [2, 3, 16, 17]
+                    dc = numpy.sum( problem.result( ptry ) ) - cost
+                    self.assertAlmostEqual( problem.costChange( pars, ptry, legs, legs ), dc, 10 )
+
+                    ## move 4 nodes from 30 to 10, starting the loop at 34
+                    ptry = numpy.concatenate( ( pars[34:], pars[:10], pars[30:34], pars[10:30] ) )
+                    dc = numpy.sum( problem.result( ptry ) ) - cost
+                    L1 = n2 - 34 + 10
+                    self.assertAlmostEqual( problem.costChange( pars, ptry, [29, 33, 9],
+                                            [L1 - 1, L1 + 3, -1] ), dc, 10 )
+
+                    ## reverse 5 nodes starting at 20
+                    ptry = pars.copy()
+                    ptry[20:25] = ptry[24:19:-1]
+                    legs = [19, 24] if problem.symmetric else numpy.arange( 19, 25 )
+                    dc = numpy.sum( problem.result( ptry ) ) - cost
+                    self.assertAlmostEqual( problem.costChange( pars, ptry, legs, legs ), dc, 10 )
+
+    def test6( self ):
+        print( "\n   SalesmanProblem Test nearest neighbours\n" )
+        np = 6
+        n2 = np * np
+        rng = numpy.random.RandomState( 3456 )
+        table = rng.rand( n2, n2 )
+
+        for dist in ["euclid", "manhattan", "spherical", "table", self.square] :
+            if dist == "table" :
+                problem = SalesmanProblem( problem.xdata, distance=dist, table=table )
+            else :
+                problem = self.initProblem( np=np, random=True, distance=dist )
+            print( problem )
+            nnb = problem.NNEIGHBOURS
+            self.assertTrue( problem.neighbours.shape == ( n2, nnb ) )
+
+            nodes = numpy.arange( n2, dtype=int )
+            for node in range( n2 ) :
+                dis = problem.nodeDistance( nodes * 0 + node, nodes )
+                dis[node] = math.inf
+                nearest = problem.nearestNodes( node )
+                self.assertFalse( node in nearest )
+                assertAAE( dis[nearest], numpy.sort( dis )[:nnb] )
+
+        cp = problem.copy()
+        self.assertTrue( cp.neighbours is problem.neighbours )
+
     def suite( cls ):
         return unittest.TestCase.suite( TestSalesmanProblem.__class__ )
 
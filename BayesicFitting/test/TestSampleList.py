@@ -3,6 +3,8 @@
 import unittest
 import numpy as numpy
 import sys
+import os
+import tempfile
 from numpy.testing import assert_array_almost_equal as assertAAE
 import math
 
@@ -233,6 +235,273 @@ class TestSampleList( unittest.TestCase ):
         zz = numpy.arange( 20, dtype=float ) * 0.2
         assertAAE( sl.monteCarloError( zz ), numpy.zeros( 20, dtype=float ), 2 )
 
+    def testColumns( self ):
+        print( "====testColumns=======================" )
+        numpy.random.seed( 1234 )
+        sl = SampleList( PolynomialDynamicModel( 1 ), 0 )
+        for k in range( 200 ) :
+            mdl = PolynomialDynamicModel( k % 4 )
+            smpl = Sample( k, -1, k, mdl, parameters=numpy.random.randn( mdl.npars ) )
+            smpl.hyper = 0.5
+            smpl.logL = -k
+            smpl.logW = numpy.random.randn()
+            sl.add( smpl )
+
+        self.assertTrue( len( sl ) == 200 )
+        param = sl.getParameterEvolution()
+        self.assertTrue( param.shape == ( 200, 4 ) )
+        self.assertFalse( param.flags.writeable )
+        nrp = sl.getNumberOfParametersEvolution()
+        for k, s in enumerate( sl ) :
+            self.assertTrue( s.parent == k and s.id == k )
+            self.assertTrue( len( s.parameters ) == nrp[k] == k % 4 + 1 )
+            self.assertTrue( numpy.all( param[k,nrp[k]:] == 0 ) )
+            self.assertTrue( s.hyper[0] == 0.5 )
+            self.assertFalse( hasattr( s, "nuisance" ) )
+
+        ## a Sample from the list is a view
+        s = sl[-1]
+        s.logL = 3.0
+        s.parameters = [1.0, 2.0]
+        self.assertTrue( sl.getLogLikelihoodEvolution()[-1] == 3.0 )
+        assertAAE( sl[199].parameters, [1.0, 2.0] )
+        self.assertTrue( isinstance( sl[:3], list ) and len( sl[:3] ) == 3 )
+        self.assertRaises( IndexError, sl.__getitem__, 200 )
+
+        lw = sl.getLogWeightEvolution().copy()
+        maxsize = 150
+        klo = 0
+        khi = len( lw )
+        while khi - klo > maxsize :
+            if lw[klo] < lw[khi-1] :
+                klo += 1
+            else :
+                khi -= 1
+        sl.weed( maxsize=maxsize )
+        self.assertTrue( len( sl ) == maxsize )
+        self.assertTrue( numpy.array_equal( sl.getLogWeightEvolution(), lw[klo:khi] ) )
+        self.assertTrue( sl[0].id == klo )
+
+        sl.normalize()
+        assertAAE( numpy.sum( sl.getWeightEvolution() ), 1.0 )
+
+        del sl[:10]
+        self.assertTrue( len( sl ) == maxsize - 10 )
+        self.assertTrue( sl[0].id == klo + 10 )
+
+    def testWeed( self ):
+        print( "====testWeed==========================" )
+        numpy.random.seed( 2345 )
+        sl = SampleList( PolynomialModel( 1 ), 0 )
+        sl.sink = SampleSink( tempfile.mkdtemp(), chunksize=100 )
+
+        maxsize = 50
+        logw = []
+        for k in range( 1000 ) :
+            smpl = Sample( k, -1, k, sl[0].model if k > 0 else PolynomialModel( 1 ),
+                           parameters=numpy.asarray( [k, -k], dtype=float ) )
+            smpl.logW = numpy.random.randn()
+            smpl.logL = k
+            sl.add( smpl )
+            logw += [smpl.logW]
+
+            ## the original weed: remove the lowest of either end
+            while len( logw ) > maxsize :
+                if logw[0] < logw[-1] :
+                    del logw[0]
+                else :
+                    del logw[-1]
+            sl.weed( maxsize=maxsize )
+
+            self.assertTrue( len( sl ) == len( logw ) )
+            self.assertTrue( numpy.array_equal( sl.getLogWeightEvolution(), logw ) )
+
+        par = sl.getParameterEvolution()
+        self.assertTrue( numpy.array_equal( par[:,0], -par[:,1] ) )
+        self.assertTrue( numpy.array_equal( par[:,0], sl.getLogLikelihoodEvolution() ) )
+
+        sl.sink.flush()
+        self.assertTrue( len( sl.sink ) == 1000 - maxsize )
+        ids = numpy.concatenate( [chunk["id"] for chunk in sl.sink.chunks()] )
+        ids = numpy.sort( numpy.append( ids, sl.getGeneration() ) )
+        self.assertTrue( numpy.array_equal( ids, numpy.arange( 1000 ) ) )
+
+    def testWeedDynamic( self ):
+        print( "====testWeedDynamic===================" )
+        sl = SampleList( PolynomialDynamicModel( 2 ), 0 )
+        sl.sink = SampleSink( tempfile.mkdtemp(), chunksize=10 )
+        self.makeSamples( sl, 100, dynamic=True )
+        sl.weed( maxsize=20 )
+        sl.sink.flush()
+        self.assertTrue( len( sl ) == 20 and len( sl.sink ) == 80 )
+
+        ## the weeded samples keep their models
+        for chunk in sl.sink.chunks() :
+            models = SampleSink.unpackModels( chunk )
+            self.assertTrue( models is not None )
+            for mdl, npar, wid in zip( models, chunk["nparameters"], chunk["id"] ) :
+                self.assertTrue( mdl.npars == npar == ( wid % 3 ) + 1 )
+
+    def makeSamples( self, sl, nsamples, dynamic=False ) :
+        numpy.random.seed( 3456 )
+        for k in range( nsamples ) :
+            mdl = PolynomialDynamicModel( k % 3 ) if dynamic else sl.model
+            smpl = Sample( k, -1, k, mdl, parameters=numpy.random.randn( mdl.npars ) )
+            smpl.hyper = 0.5 + 0.1 * numpy.random.rand()
+            smpl.logL = numpy.random.randn()
+            smpl.logW = numpy.random.randn() - 5
+            sl.add( smpl )
+
+    def testSink( self ):
+        print( "====testSink==========================" )
+        path = tempfile.mkdtemp()
+        sl0 = SampleList( PolynomialModel( 2 ), 0 )
+        sl1 = SampleList( PolynomialModel( 2 ), 0, sink=path )
+        sl1.sink.chunksize = 40
+        self.makeSamples( sl0, 250 )
+        self.makeSamples( sl1, 250 )
+        print( sl1.sink, len( sl1.sink ), len( sl1 ) )
+
+        self.assertTrue( sl1.streaming )
+        self.assertTrue( len( sl1 ) == 250 )
+        self.assertTrue( len( sl1.sink ) == 240 )
+        self.assertTrue( sl1[3].id == sl0[3].id == 3 )
+        self.assertTrue( sl1[-1].id == 249 )
+        self.assertRaises( ValueError, sl1.__setitem__, 3, sl0[4] )
+
+        chunks = sl1.sink.chunkFiles()
+        sl0.normalize()
+        sl1.normalize()
+        self.assertTrue( sl1.sink.chunkFiles() == chunks )
+        self.assertFalse( any( f.startswith( "tmp_" ) for f in os.listdir( path ) ) )
+        sl1.flush()
+        self.assertTrue( len( sl1.sink ) == 250 )
+        sl1.sink.putValues( logZ=1.5, normalized=True )
+
+        sl2 = SampleList( PolynomialModel( 2 ), 0, sink=path )
+        self.assertTrue( sl2.logZ == 1.5 and sl2.normalized )
+        for sl in [sl1, sl2] :
+            self.assertTrue( len( sl ) == 250 )
+            assertAAE( sl.getLogWeightEvolution(), sl0.getLogWeightEvolution() )
+            assertAAE( numpy.sum( sl.getWeightEvolution() ), 1.0 )
+            self.assertTrue( numpy.array_equal( sl.getParameterEvolution(),
+                                                sl0.getParameterEvolution() ) )
+            self.assertTrue( numpy.array_equal( sl.getScaleEvolution(), sl0.getScaleEvolution() ) )
+            assertAAE( sl.parameters, sl0.parameters )
+            assertAAE( sl.stdevs, sl0.stdevs )
+            assertAAE( sl.hypars, sl0.hypars )
+            self.assertTrue( sl.medianIndex == sl0.medianIndex )
+            self.assertTrue( sl.modusIndex == sl0.modusIndex )
+            self.assertTrue( sl.getLowLogL() == sl0.getLowLogL() )
+            xx = numpy.linspace( -1, 1, 5 )
+            assertAAE( sl.average( xx ), sl0.average( xx ) )
+            for s0, s1 in zip( sl0, sl ) :
+                self.assertTrue( s0.id == s1.id and s0.parent == s1.parent )
+                self.assertTrue( numpy.array_equal( s0.parameters, s1.parameters ) )
+
+    def testSinkDynamic( self ):
+        print( "====testSinkDynamic===================" )
+        sl0 = SampleList( PolynomialDynamicModel( 2 ), 0 )
+        sl1 = SampleList( PolynomialDynamicModel( 2 ), 0, sink=tempfile.mkdtemp() )
+        sl1.sink.chunksize = 40
+        self.makeSamples( sl0, 100, dynamic=True )
+        self.makeSamples( sl1, 100, dynamic=True )
+
+        self.assertTrue( numpy.array_equal( sl1.getNumberOfParametersEvolution(),
+                                            sl0.getNumberOfParametersEvolution() ) )
+        self.assertTrue( numpy.array_equal( sl1.getParameterEvolution(),
+                                            sl0.getParameterEvolution() ) )
+        for s0, s1 in zip( sl0, sl1 ) :
+            self.assertTrue( s0.model.npars == s1.model.npars )
+        self.assertRaises( ValueError, sl1.getParameters )
+
+    def testAddWalkers( self ):
+        print( "====testAddWalkers====================" )
+        numpy.random.seed( 2345 )
+        for mdl in [PolynomialModel( 2 ), PolynomialDynamicModel( 2 )] :
+            problem = ClassicProblem( model=mdl, xdata=self.x, ydata=self.noise )
+            walkers = []
+            for k in range( 5 ) :
+                pars = numpy.random.randn( mdl.npars + 1 )
+                walker = Walker( k, problem, pars, None, logL=-k, start=2 )
+                walker.logPrior = -0.5
+                walkers += [walker]
+            logW = numpy.arange( 5.0 ) - 5
+
+            sl0 = SampleList( mdl, 0 )
+            sl1 = SampleList( mdl, 0 )
+            for w, lw in zip( walkers, logW ) :
+                sl0.add( w.toSample( lw ) )
+            sl1.addWalkers( walkers, logW )
+
+            self.assertTrue( len( sl1 ) == 5 )
+            for s0, s1 in zip( sl0, sl1 ) :
+                self.assertTrue( s0.id == s1.id and s0.parent == s1.parent and s0.start == s1.start )
+                self.assertTrue( s0.logL == s1.logL and s0.logW == s1.logW )
+                self.assertTrue( numpy.array_equal( s0.parameters, s1.parameters ) )
+                self.assertTrue( numpy.array_equal( s0.hyper, s1.hyper ) )
+                self.assertTrue( s0.model is s1.model )
+
+    def testAverage( self ):
+        print( "====testAverage=======================" )
+        xx = numpy.linspace( -1, 1, 7 )
+        for dynamic in [False, True] :
+            mdl = PolynomialDynamicModel( 2 ) if dynamic else PolynomialModel( 2 )
+            sl = SampleList( mdl, 0 )
+            self.makeSamples( sl, 120, dynamic=dynamic )
+            sl.normalize()
+
+            yfit = numpy.asarray( [s.model.result( xx, s.parameters ) for s in sl] )
+            wgts = sl.getWeightEvolution()
+            result = numpy.dot( wgts, yfit )
+            error = numpy.sqrt( numpy.dot( wgts, yfit * yfit ) - result * result )
+
+            for chunksize in [None, 7] :
+                assertAAE( sl.average( xx, chunksize=chunksize ), result )
+                assertAAE( sl.error, error )
+            assertAAE( sl.average( xx, chunksize=13, processes=2 ), result )
+            assertAAE( sl.monteCarloError( xx ), error )
+
+            q = [0.0, 0.25, 0.5, 1.0]
+            sl.MAXBATCH = 240
+            sl.average( xx, quantiles=q )
+            assertAAE( sl.result, result )
+            print( fmt( sl.quantiles, max=None ) )
+            self.assertTrue( sl.quantiles.shape == ( 4, 7 ) )
+            assertAAE( sl.quantiles[0], numpy.min( yfit, axis=0 ) )
+            assertAAE( sl.quantiles[3], numpy.max( yfit, axis=0 ) )
+            for k in range( 7 ) :
+                srt = numpy.argsort( yfit[:,k] )
+                cw = numpy.cumsum( wgts[srt] ) / numpy.sum( wgts )
+                kq = numpy.searchsorted( cw, 0.25 )
+                self.assertAlmostEqual( sl.quantiles[1,k], yfit[srt[kq],k] )
+
+    def testStreaming( self ):
+        print( "====testStreaming=====================" )
+        x = numpy.linspace( -1, 1, 11 )
+        y = 1 + 0.5 * x + self.noise
+        evid = []
+        for sink in [None, tempfile.mkdtemp()] :
+            mdl = PolynomialModel( 1 )
+            mdl.setPrior( 0, UniformPrior( limits=[-5,5] ) )
+            ns = NestedSampler( x, mdl, y, seed=4321, verbose=0, limits=[0.01,1] )
+            ns.maxIterations = 300
+            evid += [ns.sample( sink=sink )]
+            print( evid[-1], len( ns.samples ), ns.samples.streaming )
+            if sink is None :
+                sl0 = ns.samples
+            else :
+                sl1 = ns.samples
+
+        self.assertEqual( evid[0], evid[1] )
+        self.assertTrue( len( sl1 ) == len( sl1.sink ) == len( sl0 ) )
+        assertAAE( sl1.parameters, sl0.parameters )
+        assertAAE( sl1.getLogWeightEvolution(), sl0.getLogWeightEvolution() )
+
+        sl2 = SampleList( PolynomialModel( 1 ), 0, sink=sl1.sink.path )
+        self.assertTrue( sl2.logZ == ns.logZ )
+        assertAAE( sl2.parameters, sl0.parameters )
+
     @classmethod
     def suite( cls ):
         return unittest.TestCase.suite( TestSampleList.__class__ )
@@ -119,6 +119,41 @@ class Test( unittest.TestCase ):
 
 
 
+    #  **************************************************************
+    def testSortOnLogL( self ) :
+        print( "========= testSortOnLogL ==================" )
+
+        numpy.random.seed( 12345 )
+        lgl = numpy.round( numpy.random.rand( 20 ) * 10 )      ## with equal values
+        wlist = WalkerList()
+        for k, l in enumerate( lgl ) :
+            w = Walker( k, ClassicProblem(), self.par, self.fi )
+            w.logL = l
+            wlist.setWalker( w, k )
+
+        wsort = sorted( wlist, key=lambda w : w.logL )
+        wlist.sortOnLogL()
+        self.assertTrue( [w.id for w in wlist] == [w.id for w in wsort] )
+        self.assertTrue( wlist._logL == [w.logL for w in wsort] )
+        self.assertTrue( wlist.firstIndex( 5.0 ) == sum( lgl <= 5.0 ) )
+
+        ## replace the lowest 3 and compare with a full (stable) sort
+        for k, l in enumerate( [7.0, 2.0, 7.0] ) :
+            w = Walker( 100 + k, ClassicProblem(), self.par, self.fi )
+            w.logL = l
+            wlist.setWalker( w, k )
+
+        wsort = sorted( wlist, key=lambda w : w.logL )
+        wlist.sortOnLogL( 3 )
+        print( [w.id for w in wlist] )
+        self.assertTrue( [w.id for w in wlist] == [w.id for w in wsort] )
+        self.assertTrue( wlist._logL == [w.logL for w in wsort] )
+
+        wlist = wlist.cropOnLow( 4.0 )
+        self.assertTrue( len( wlist ) == sum( [w.logL > 4.0 for w in wsort] ) )
+        self.assertTrue( wlist[0].logL > 4.0 )
+        self.assertTrue( len( wlist._logL ) == len( wlist ) )
+
     #  **************************************************************
     def testWalkerList( self ):
         print( "=========  WalkerListTest  =======================" )